@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 from typing import Any, Dict, List, Union
 
@@ -7,10 +8,20 @@ from object_utils import initialize_template, filter_chain_data, process_valid_c
 from template_functions import add_base, add_video, add_clip
 from logging_config import setup_logging, get_logger
 
+# 비디오 메타데이터 인덱스 (pre_processing/video_probe.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'pre_processing'))
+from video_probe import DEFAULT_INDEX_PATH, VideoProbeIndex, template_fields
+from frame_manifest import FrameManifestIndex
+
+# 프리셋 출력 폴더 (이미지별 프레임 매니페스트 위치)
+FRAME_MANIFEST_ROOT = os.getenv("FRAME_MANIFEST_ROOT", r"C:\guide\preset_data")
+# 처리할 데이터의 카테고리 (preset_module.py -c 값, 다른 카테고리의 같은 이름 비디오와 구분)
+FRAME_MANIFEST_CATEGORY = os.getenv("FRAME_MANIFEST_CATEGORY") or None
+
 # 로깅 설정
 logger = get_logger()
 
-def add_object_annotation(template: Dict[str, Any], data):
+def add_object_annotation(template: Dict[str, Any], data, frame_index=None):
     # 객체 데이터 추출
     object_annotations = []
     frame_counter = 1  # frame 번호를 위한 카운터
@@ -42,7 +53,7 @@ def add_object_annotation(template: Dict[str, Any], data):
                 
                 # 4. 5개 이하면 추가 작업 불가 객체만 제외하고 나머지 처리
                 new_annotations, frame_counter = process_valid_chain_items(
-                    valid_chain_items, source_image, frame_counter
+                    valid_chain_items, source_image, frame_counter, frame_index, FRAME_MANIFEST_CATEGORY
                 )
                 object_annotations.extend(new_annotations)
                 logger.info(f"이 SourceValue에서 {len(new_annotations)}개의 annotation 생성됨")
@@ -54,7 +65,17 @@ def add_object_annotation(template: Dict[str, Any], data):
     template['object_annotation'] = object_annotations
     return template
 
-def post_processing(data: Dict[str, Any]):
+def lookup_video_info(video_index, data):
+    """인덱스에서 클립의 width/height/fps/length/ratio 조회 (없으면 None)"""
+    if video_index is None:
+        return None
+    info = video_index.lookup_by_name(data.get('importData_video_file', ''))
+    if info is None:
+        logger.warning(f"비디오 인덱스에 없음: {data.get('importData_video_file')}")
+        return None
+    return template_fields(info)
+
+def post_processing(data: Dict[str, Any], video_index=None, frame_index=None):
     # 원본 데이터 구조
     base_format_data = json.load(open('../../data/format/객체 데이터 포맷.txt', 'r', encoding='utf-8'))
 
@@ -64,14 +85,17 @@ def post_processing(data: Dict[str, Any]):
     # (공통)기본 데이터 추가 : dataID(int), dataset_name(str), version(str), year(str), category(arr), subject(arr) 
     first_template = add_base(null_template, data)
 
+    # 비디오 메타데이터 조회 (영상을 다시 열지 않고 인덱스에서)
+    video_info = lookup_video_info(video_index, data)
+
     # (공통)영상데이터 추가 : video(arr + dict)
-    second_template = add_video(first_template, data)
+    second_template = add_video(first_template, data, video_info)
 
     # (공통)클립데이터 추가 : clip(dict)
-    third_template = add_clip(second_template, data)
+    third_template = add_clip(second_template, data, video_info)
 
     # VQA_annotation 추가 : VQA_annotation(arr + dict) 
-    final_template = add_object_annotation(third_template, data)
+    final_template = add_object_annotation(third_template, data, frame_index)
 
     # 파일로 저장
     return final_template
@@ -80,6 +104,16 @@ if __name__ == "__main__":
     # 로깅 설정
     setup_logging()
     
+    # 비디오 메타데이터 인덱스 (python video_probe.py scan 으로 생성, 없으면 빈 값 유지)
+    video_index = VideoProbeIndex(DEFAULT_INDEX_PATH) if os.path.exists(DEFAULT_INDEX_PATH) else None
+    if video_index is None:
+        logger.warning(f"비디오 인덱스 없음: {DEFAULT_INDEX_PATH}")
+
+    # 프레임 매니페스트 (preset_module.py 실행 시 생성, 없으면 image_frame 빈 값 유지)
+    frame_index = FrameManifestIndex(FRAME_MANIFEST_ROOT) if os.path.isdir(FRAME_MANIFEST_ROOT) else None
+    if frame_index is None:
+        logger.warning(f"프레임 매니페스트 폴더 없음: {FRAME_MANIFEST_ROOT}")
+
     # 정보 데이터 추출
     logger.info("파일 읽기 시작")
     results = []
@@ -118,7 +152,7 @@ if __name__ == "__main__":
                         logger.warning("object 키가 없음")
                     
                     logger.info("post_processing 시작")
-                    result = post_processing(data)
+                    result = post_processing(data, video_index, frame_index)
                     results.append(result)
                     logger.info("post_processing 완료")
                     
@@ -118,14 +118,16 @@ def filter_chain_data(chain_data):
     
     return valid_chain_items, additional_work_impossible_count
 
-def process_valid_chain_items(valid_chain_items, source_image, frame_counter):
+def process_valid_chain_items(valid_chain_items, source_image, frame_counter, frame_index=None, category=None):
     """
     유효한 chain_items를 처리하여 object_annotations 생성
+    frame_index(FrameManifestIndex)가 있으면 image_frame 을 category 의 프레임 매니페스트에서 채움
     """
     object_annotations = []
     current_frame_counter = frame_counter
     processed_count = 0
     skipped_count = 0
+    image_frame = frame_index.image_frame(source_image, category) if frame_index else ""
     
     logger.info(f"유효한 chain_items 처리 시작 (총 {len(valid_chain_items)}개)")
     
@@ -160,7 +162,7 @@ def process_valid_chain_items(valid_chain_items, source_image, frame_counter):
         object_annotation = {
             "image_id": source_image,  # 실제 이미지 파일명
             "object_id": chain_item["objectID"],
-            "image_frame": "",
+            "image_frame": image_frame,
             "object_name_kr": object_name,  # 한글 이름
             "object_name_en": "",  # 영어 이름 (현재 데이터에 없음)
             "bbox": bbox
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 def add_base(template: Dict[str, Any], data):
     """기본 데이터 추가"""
@@ -11,8 +11,8 @@ def add_base(template: Dict[str, Any], data):
     
     return template
 
-def add_video(template: Dict[str, Any], data):
-    """영상 데이터 추가"""
+def add_video(template: Dict[str, Any], data, video_info: Optional[Dict[str, Any]] = None):
+    """영상 데이터 추가 (video_info: 비디오 메타데이터 인덱스의 템플릿 필드)"""
     clip_name = data.get('importData_video_file', 'unknown_video.mp4')
     
     # 확장자 제거 후 마지막 _숫자 부분 제거
@@ -27,27 +27,28 @@ def add_video(template: Dict[str, Any], data):
     template['video'] = [
         {
             "id": "video_001",
-            "width": "",
-            "height": "",
+            "width": video_info["width"] if video_info else "",
+            "height": video_info["height"] if video_info else "",
             "file_name": f"{clip_name}.mp4"
         }
     ]
     
     return template
 
-def add_clip(template: Dict[str, Any], data):
-    """클립 데이터 추가"""
+def add_clip(template: Dict[str, Any], data, video_info: Optional[Dict[str, Any]] = None):
+    """클립 데이터 추가 (video_info: 비디오 메타데이터 인덱스의 템플릿 필드)"""
     clip_name = data.get('importData_video_file', 'unknown_video.mp4')
+    video_info = video_info or {}
 
     template['clip'] = {
         "id": f"clip_{clip_name.split('_')[-1].split('.')[0]}",
         "file_name": clip_name,
-        "length": "",  # 전체 영상 길이
-        "width": None,
-        "height": None,
+        "length": video_info.get("length", ""),  # 전체 영상 길이
+        "width": video_info.get("width"),
+        "height": video_info.get("height"),
         "format": "mp4",
-        "ratio": None,
-        "fps": ""
+        "ratio": video_info.get("ratio"),
+        "fps": video_info.get("fps", "")
     }
     
     return template
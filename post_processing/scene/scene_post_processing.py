@@ -1,8 +1,13 @@
 import json
 import os
+import sys
 
 import json
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
+
+# 비디오 메타데이터 인덱스 (pre_processing/video_probe.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'pre_processing'))
+from video_probe import DEFAULT_INDEX_PATH, VideoProbeIndex, template_fields
 
 # 초기화 함수
 def initialize_template(data: Dict[str, Any]):
@@ -32,7 +37,8 @@ def add_base(template: Dict[str, Any], data):
     
     return template
 
-def add_video(template: Dict[str, Any], data):
+def add_video(template: Dict[str, Any], data, video_info: Optional[Dict[str, Any]] = None):
+    # video_info: 비디오 메타데이터 인덱스의 템플릿 필드 (없으면 빈 값 유지)
     clip_name = data.get('importData_video_file', 'unknown_video.mp4')
     
     # 확장자 제거 후 마지막 _숫자 부분 제거
@@ -47,26 +53,27 @@ def add_video(template: Dict[str, Any], data):
     template['video'] = [
         {
             "id": "video_001",
-            "width": "",
-            "height": "",
+            "width": video_info["width"] if video_info else "",
+            "height": video_info["height"] if video_info else "",
             "file_name": f"{clip_name}.mp4"
         }
     ]
     
     return template
 
-def add_clip(template: Dict[str, Any], data):
+def add_clip(template: Dict[str, Any], data, video_info: Optional[Dict[str, Any]] = None):
     clip_name = data.get('importData_video_file', 'unknown_video.mp4')
+    video_info = video_info or {}
 
     template['clip'] = {
         "id": f"clip_{clip_name.split('_')[-1].split('.')[0]}",
         "file_name": clip_name,
-        "length": "",  # 전체 영상 길이
-        "width": None,
-        "height": None,
+        "length": video_info.get("length", ""),  # 전체 영상 길이
+        "width": video_info.get("width"),
+        "height": video_info.get("height"),
         "format": "mp4",
-        "ratio": None,
-        "fps": ""
+        "ratio": video_info.get("ratio"),
+        "fps": video_info.get("fps", "")
     }
     
     return template
@@ -107,7 +114,18 @@ def add_scene_annotation(template, data):
     return template
 
 
-def post_processing(data: Dict[str, Any]):
+def lookup_video_info(video_index, data):
+    """인덱스에서 클립의 width/height/fps/length/ratio 조회 (없으면 None)"""
+    if video_index is None:
+        return None
+    info = video_index.lookup_by_name(data.get('importData_video_file', ''))
+    if info is None:
+        print(f"비디오 인덱스에 없음: {data.get('importData_video_file')}")
+        return None
+    return template_fields(info)
+
+
+def post_processing(data: Dict[str, Any], video_index=None):
     # 원본 데이터 구조
     base_format_data = json.load(open('../data/format/VQA 데이터 포맷.txt', 'r', encoding='utf-8'))
 
@@ -117,11 +135,14 @@ def post_processing(data: Dict[str, Any]):
     # (공통)기본 데이터 추가 : dataID(int), dataset_name(str), version(str), year(str), category(arr), subject(arr) 
     first_template = add_base(template, data)
 
+    # 비디오 메타데이터 조회 (영상을 다시 열지 않고 인덱스에서)
+    video_info = lookup_video_info(video_index, data)
+
     # (공통)영상데이터 추가 : video(arr + dict)
-    second_template = add_video(first_template, data)
+    second_template = add_video(first_template, data, video_info)
 
     # (공통)클립데이터 추가 : clip(dict)
-    third_template = add_clip(second_template, data)
+    third_template = add_clip(second_template, data, video_info)
 
     # scene_annotation 추가 : scene_annotation(arr + dict) 
     final_template = add_scene_annotation(third_template, data)
@@ -148,7 +169,9 @@ if __name__ == "__main__":
             print(data)
         
         # 전체 데이터 후처리 실행 (기본 정보 + 비디오 + 클립 + Scene)
-        result = post_processing(data)
+        # 비디오 메타데이터 인덱스가 있으면 video/clip 의 크기·길이·fps 채움 (python video_probe.py scan 으로 생성)
+        video_index = VideoProbeIndex(DEFAULT_INDEX_PATH) if os.path.exists(DEFAULT_INDEX_PATH) else None
+        result = post_processing(data, video_index)
         
         # 결과 저장
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
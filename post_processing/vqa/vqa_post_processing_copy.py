@@ -1,8 +1,19 @@
 import json
 import os
+import sys
 
 import json
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
+
+# 이미지별 프레임 매니페스트 / 비디오 메타데이터 인덱스 (pre_processing/frame_manifest.py, video_probe.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'pre_processing'))
+from frame_manifest import FrameManifestIndex
+from video_probe import DEFAULT_INDEX_PATH, VideoProbeIndex, template_fields
+
+# 프리셋 출력 폴더 (매니페스트 위치)
+FRAME_MANIFEST_ROOT = os.getenv("FRAME_MANIFEST_ROOT", r"C:\guide\preset_data")
+# 처리할 데이터의 카테고리 (preset_module.py -c 값, 다른 카테고리의 같은 이름 비디오와 구분)
+FRAME_MANIFEST_CATEGORY = os.getenv("FRAME_MANIFEST_CATEGORY") or None
 
 # 초기화 함수
 def initialize_template(data: Dict[str, Any]):
@@ -32,7 +43,8 @@ def add_base(template: Dict[str, Any], data):
     
     return template
 
-def add_video(template: Dict[str, Any], data):
+def add_video(template: Dict[str, Any], data, video_info: Optional[Dict[str, Any]] = None):
+    # video_info: 비디오 메타데이터 인덱스의 템플릿 필드 (없으면 빈 값 유지)
     clip_name = data.get('importData_video_file', 'unknown_video.mp4')
     
     # 확장자 제거 후 마지막 _숫자 부분 제거
@@ -47,31 +59,51 @@ def add_video(template: Dict[str, Any], data):
     template['video'] = [
         {
             "id": "video_001",
-            "width": "",
-            "height": "",
+            "width": video_info["width"] if video_info else "",
+            "height": video_info["height"] if video_info else "",
             "file_name": f"{clip_name}.mp4"
         }
     ]
     
     return template
 
-def add_clip(template: Dict[str, Any], data):
+def add_clip(template: Dict[str, Any], data, video_info: Optional[Dict[str, Any]] = None):
     clip_name = data.get('importData_video_file', 'unknown_video.mp4')
+    video_info = video_info or {}
 
     template['clip'] = {
         "id": f"clip_{clip_name.split('_')[-1].split('.')[0]}",
         "file_name": clip_name,
-        "length": "",  # 전체 영상 길이
-        "width": None,
-        "height": None,
+        "length": video_info.get("length", ""),  # 전체 영상 길이
+        "width": video_info.get("width"),
+        "height": video_info.get("height"),
         "format": "mp4",
-        "ratio": None,
-        "fps": ""
+        "ratio": video_info.get("ratio"),
+        "fps": video_info.get("fps", "")
     }
     
     return template
     
-def add_VQA_annotation(template, data):
+def vqa_image_frame(frame_index, data, image_data):
+    """
+    VQA 문항에 선택된 이미지들의 프레임 시간 (여러 장이면 ", " 로 연결)
+
+    선택 값(image_VQA_05 등)을 importData_image_VQA_05 의 파일명으로 바꿔 매니페스트에서 조회
+    """
+    if frame_index is None:
+        return ""
+    selected = image_data.get("value", [])
+    if not isinstance(selected, list):
+        return ""
+    times = []
+    for item in selected:
+        image_name = data.get(f"importData_{item.get('value', '')}", "")
+        image_frame = frame_index.image_frame(image_name, FRAME_MANIFEST_CATEGORY) if image_name else ""
+        if image_frame:
+            times.append(image_frame)
+    return ", ".join(times)
+
+def add_VQA_annotation(template, data, frame_index=None):
     """VQA 데이터를 추출하여 템플릿에 추가"""
     
     # VQA 관련 필드들 (01~03)
@@ -85,8 +117,10 @@ def add_VQA_annotation(template, data):
         if image_key in data and "data" in data[image_key]:
             image_data = data[image_key]["data"][0]
             image_id = image_data.get("objectID", f"image_VQA_{vqa_num}")
+            image_frame = vqa_image_frame(frame_index, data, image_data)
         else:
             image_id = f"image_VQA_{vqa_num}"
+            image_frame = ""
         
         # VQA_question_XX에서 objectID 추출하여 question_id에 사용
         question_key = f"VQA_question_{vqa_num}"
@@ -136,7 +170,7 @@ def add_VQA_annotation(template, data):
         # VQA 항목 생성
         vqa_item = {
             "image_id": image_id,
-            "image_frame": "",  # 간단한 시간 프레임
+            "image_frame": image_frame,  # 선택 이미지의 원본 영상 시간
             "question_id": question_id,
             "question_kr": question_kr,
             "question_en": "",
@@ -149,7 +183,18 @@ def add_VQA_annotation(template, data):
     return template
 
 
-def post_processing(data: Dict[str, Any]):
+def lookup_video_info(video_index, data):
+    """인덱스에서 클립의 width/height/fps/length/ratio 조회 (없으면 None)"""
+    if video_index is None:
+        return None
+    info = video_index.lookup_by_name(data.get('importData_video_file', ''))
+    if info is None:
+        print(f"비디오 인덱스에 없음: {data.get('importData_video_file')}")
+        return None
+    return template_fields(info)
+
+
+def post_processing(data: Dict[str, Any], frame_index=None, video_index=None):
     # 원본 데이터 구조
     base_format_data = json.load(open('C:/code/data/format/VQA 데이터 포맷.txt', 'r', encoding='utf-8'))
 
@@ -159,23 +204,26 @@ def post_processing(data: Dict[str, Any]):
     # (공통)기본 데이터 추가 : dataID(int), dataset_name(str), version(str), year(str), category(arr), subject(arr) 
     first_template = add_base(template, data)
 
+    # 비디오 메타데이터 조회 (영상을 다시 열지 않고 인덱스에서)
+    video_info = lookup_video_info(video_index, data)
+
     # (공통)영상데이터 추가 : video(arr + dict)
-    second_template = add_video(first_template, data)
+    second_template = add_video(first_template, data, video_info)
 
     # (공통)클립데이터 추가 : clip(dict)
-    third_template = add_clip(second_template, data)
+    third_template = add_clip(second_template, data, video_info)
 
     # VQA_annotation 추가 : VQA_annotation(arr + dict) 
-    final_template = add_VQA_annotation(third_template, data)
+    final_template = add_VQA_annotation(third_template, data, frame_index)
 
     # 파일로 저장
     return final_template
 
 
-def post_processing_vqa_only(data):
+def post_processing_vqa_only(data, frame_index=None):
     """VQA 데이터만 후처리하는 함수"""
     template = {"VQA_annotation": []}
-    template = add_VQA_annotation(template, data)
+    template = add_VQA_annotation(template, data, frame_index)
     return template
 
 if __name__ == "__main__":
@@ -190,7 +238,11 @@ if __name__ == "__main__":
             print(data)
         
         # 전체 데이터 후처리 실행 (기본 정보 + 비디오 + 클립 + VQA)
-        result = post_processing(data)
+        # 프레임 매니페스트가 있으면 image_frame 채움
+        frame_index = FrameManifestIndex(FRAME_MANIFEST_ROOT) if os.path.isdir(FRAME_MANIFEST_ROOT) else None
+        # 비디오 메타데이터 인덱스가 있으면 video/clip 의 크기·길이·fps 채움 (python video_probe.py scan 으로 생성)
+        video_index = VideoProbeIndex(DEFAULT_INDEX_PATH) if os.path.exists(DEFAULT_INDEX_PATH) else None
+        result = post_processing(data, frame_index, video_index)
         
         # 결과 저장
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -0,0 +1,366 @@
+import os
+import io
+import importlib
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import contextlib
+import multiprocessing
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# 합성 테스트 영상 (해상도, 길이, 코덱, GOP 조합)
+# gop: 키프레임 간격 (프레임), 1 이면 모든 프레임이 키프레임
+VIDEO_SPECS = [
+    {"name": "sd_60s_mp4v_gop30", "width": 640, "height": 360, "fps": 30, "duration": 60, "codec": "mp4v", "gop": 30},
+    {"name": "hd_60s_mp4v_gop250", "width": 1280, "height": 720, "fps": 30, "duration": 60, "codec": "mp4v", "gop": 250},
+    {"name": "fhd_20s_mjpg", "width": 1920, "height": 1080, "fps": 30, "duration": 20, "codec": "MJPG", "gop": 1},
+    {"name": "sd_280s_mp4v_gop60", "width": 640, "height": 360, "fps": 30, "duration": 280, "codec": "mp4v", "gop": 60},
+]
+
+# --quick 실행 시 사용할 영상
+QUICK_SPECS = [
+    {"name": "sd_20s_mp4v_gop30", "width": 640, "height": 360, "fps": 30, "duration": 20, "codec": "mp4v", "gop": 30},
+]
+
+# 측정할 추출 방식
+# - preset_*: preset_module.py 의 추출 함수 / 프레임 계획
+# - video_*  : video.py 의 extract_frames
+STRATEGIES = (
+    "preset_interval",
+    "preset_uniform",
+    "preset_plan_interval",
+    "preset_plan_shots",
+    "video_2s",
+    "video_2s_segments",
+)
+
+# 합성 영상 저장 위치 (같은 사양이면 재사용)
+DEFAULT_VIDEO_DIR = os.getenv(
+    "BENCHMARK_VIDEO_DIR", str(Path(tempfile.gettempdir()) / "cw_modules_benchmark_videos")
+)
+
+# 기준 대비 이 비율 이상 느려지거나 커지면 회귀로 판단
+DEFAULT_THRESHOLD = 0.15
+
+# 시간 차이가 이보다 작으면 측정 오차로 보고 회귀로 판단하지 않음 (초)
+MIN_REGRESSION_SEC = 0.05
+
+# 방식별로 측정 전에 미리 import 할 모듈 (import 시간은 측정에서 제외)
+_STRATEGY_MODULES = {
+    "preset_interval": "preset_module",
+    "preset_uniform": "preset_module",
+    "preset_plan_interval": "frame_plan",
+    "preset_plan_shots": "frame_plan",
+    "video_2s": "video",
+    "video_2s_segments": "video",
+}
+
+# 장면 전환 간격(초) - 샷 검출/중복 제거가 의미 있도록 주기적으로 장면을 바꿈
+_SCENE_SEC = 5
+
+
+def video_path_for(spec, video_dir=DEFAULT_VIDEO_DIR):
+    """사양별 합성 영상 경로"""
+    ext = ".avi" if spec["codec"] == "MJPG" else ".mp4"
+    return Path(video_dir) / f"{spec['name']}{ext}"
+
+
+def generate_video(spec, video_dir=DEFAULT_VIDEO_DIR):
+    """
+    cv2.VideoWriter 로 합성 테스트 영상 생성 (이미 있으면 재사용)
+
+    장면마다 다른 배경색/그라디언트 위에 움직이는 사각형과 프레임 번호를 그려
+    프레임마다 내용이 다르고, _SCENE_SEC 초마다 장면이 바뀌도록 한다.
+
+    Returns:
+        Path: 영상 경로
+    """
+    path = video_path_for(spec, video_dir)
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    width, height, fps = spec["width"], spec["height"], spec["fps"]
+    params = []
+    if spec.get("gop") and hasattr(cv2, "VIDEOWRITER_PROP_KEY_INTERVAL"):
+        params = [cv2.VIDEOWRITER_PROP_KEY_INTERVAL, spec["gop"]]
+    # 임시 파일에 쓴 뒤 이름 변경 (중단되어도 깨진 영상이 재사용되지 않도록)
+    tmp_path = path.with_name(f".{path.stem}.tmp{path.suffix}")
+    writer = cv2.VideoWriter(str(tmp_path), cv2.VideoWriter_fourcc(*spec["codec"]), fps, (width, height), params)
+    if not writer.isOpened():
+        raise IOError(f"❌ 영상 생성 실패 (코덱 {spec['codec']} 미지원): {path}")
+
+    rng = np.random.default_rng(0)
+    ramp = np.linspace(0, 1, width, dtype=np.float32)[None, :, None]
+    frame_count = int(spec["duration"] * fps)
+    scene_frames = _SCENE_SEC * fps
+    for i in range(frame_count):
+        if i % scene_frames == 0:
+            # 새 장면: 배경 그라디언트 색 변경
+            color_a, color_b = rng.integers(0, 256, size=(2, 3)).astype(np.float32)
+            background = (color_a * (1 - ramp) + color_b * ramp).repeat(height, axis=0).astype(np.uint8)
+        frame = background.copy()
+        x = int((i % scene_frames) / scene_frames * (width - width // 5))
+        cv2.rectangle(frame, (x, height // 3), (x + width // 5, height // 3 * 2), (255, 255, 255), -1)
+        cv2.putText(frame, str(i), (20, height - 20), cv2.FONT_HERSHEY_SIMPLEX, height / 240, (0, 0, 0), 2)
+        writer.write(frame)
+    writer.release()
+    os.replace(tmp_path, path)
+    return path
+
+
+def _peak_rss_mb():
+    """현재 프로세스(+자식 프로세스) 최대 메모리 사용량 (MB, 측정 불가 시 None)"""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        )
+        # Linux 는 KB, macOS 는 바이트 단위
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+
+
+def _output_stats(out_dir):
+    """출력 폴더의 이미지 수와 실제 디스크 사용 바이트 (하드링크는 한 번만)"""
+    frames = 0
+    total_bytes = 0
+    seen = set()
+    for path in Path(out_dir).rglob("*.jpg"):
+        frames += 1
+        stat = path.stat()
+        if (stat.st_dev, stat.st_ino) not in seen:
+            seen.add((stat.st_dev, stat.st_ino))
+            total_bytes += stat.st_size
+    return frames, total_bytes
+
+
+def _run_strategy(strategy, video_path, out_dir, decoder):
+    """추출 방식 1개 실행 (측정용 하위 프로세스에서 호출)"""
+    out_dir = Path(out_dir)
+    if strategy == "preset_interval":
+        from preset_module import extract_frames_from_video
+        extract_frames_from_video(str(video_path), out_dir, decoder=decoder)
+    elif strategy == "preset_uniform":
+        from preset_module import extract_45_frames_from_video
+        extract_45_frames_from_video(str(video_path), out_dir, decoder=decoder)
+    elif strategy in ("preset_plan_interval", "preset_plan_shots"):
+        from frame_plan import build_frame_plan, execute_frame_plan
+        sampling = "shots" if strategy == "preset_plan_shots" else "interval"
+        plan = build_frame_plan(
+            str(video_path), out_dir / "extracted_frames", out_dir, sampling=sampling, keep_extracted=True,
+            decoder=decoder,
+        )
+        execute_frame_plan(plan, decoder=decoder)
+    elif strategy == "video_2s":
+        from video import extract_frames
+        extract_frames(str(video_path), str(out_dir), 2.0, decoder=decoder)
+    elif strategy == "video_2s_segments":
+        from video import extract_frames
+        extract_frames(str(video_path), str(out_dir), 2.0, segments=os.cpu_count() or 1, decoder=decoder)
+    else:
+        raise ValueError(f"지원하지 않는 추출 방식입니다: {strategy}")
+
+
+def _measure_child(strategy, video_path, out_dir, decoder, results):
+    """하위 프로세스 진입점: 출력은 버리고 시간/메모리만 측정"""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    sink = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+            importlib.import_module(_STRATEGY_MODULES[strategy])
+            start = time.perf_counter()
+            _run_strategy(strategy, video_path, out_dir, decoder)
+            wall = time.perf_counter() - start
+        results.put({"wall_sec": wall, "peak_rss_mb": _peak_rss_mb()})
+    except Exception as e:
+        results.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def measure(strategy, spec, video_path, decoder="opencv", repeat=1):
+    """
+    추출 방식 1개를 새 프로세스에서 repeat 번 실행하여 측정 (가장 빠른 실행 기준)
+    프로세스를 새로 띄우므로 최대 메모리가 앞선 실행의 영향을 받지 않는다.
+
+    Returns:
+        dict: video, strategy, decoder, wall_sec, frames, frames_per_sec,
+              source_frames_per_sec, peak_rss_mb, bytes_written (실패 시 error)
+    """
+    ctx = multiprocessing.get_context("spawn")
+    best = None
+    for _ in range(repeat):
+        out_dir = Path(tempfile.mkdtemp(prefix="cw_bench_"))
+        try:
+            queue = ctx.Queue()
+            process = ctx.Process(target=_measure_child, args=(strategy, str(video_path), str(out_dir), decoder, queue))
+            process.start()
+            process.join()
+            run = queue.get() if not queue.empty() else {"error": f"프로세스 비정상 종료 (exit {process.exitcode})"}
+            if "error" not in run:
+                run["frames"], run["bytes_written"] = _output_stats(out_dir)
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        if "error" in run:
+            best = run
+            break
+        if best is None or run["wall_sec"] < best["wall_sec"]:
+            best = run
+
+    source_frames = spec["duration"] * spec["fps"]
+    result = {"video": spec["name"], "strategy": strategy, "decoder": decoder}
+    if "error" in best:
+        result["error"] = best["error"]
+        return result
+    result.update({
+        "wall_sec": round(best["wall_sec"], 4),
+        "frames": best["frames"],
+        "frames_per_sec": round(best["frames"] / best["wall_sec"], 2),
+        "source_frames_per_sec": round(source_frames / best["wall_sec"], 2),
+        "peak_rss_mb": round(best["peak_rss_mb"], 1) if best["peak_rss_mb"] is not None else None,
+        "bytes_written": best["bytes_written"],
+    })
+    return result
+
+
+def run_benchmark(specs, strategies=STRATEGIES, decoders=("opencv",), repeat=1, video_dir=DEFAULT_VIDEO_DIR):
+    """
+    전체 벤치마크 실행
+
+    Returns:
+        dict: meta (환경 정보), results (측정 결과 리스트)
+    """
+    results = []
+    for spec in specs:
+        print(f"🎬 합성 영상 준비: {spec['name']}")
+        video_path = generate_video(spec, video_dir)
+        for decoder in decoders:
+            for strategy in strategies:
+                result = measure(strategy, spec, video_path, decoder, repeat)
+                results.append(result)
+                if "error" in result:
+                    print(f"  ❌ {strategy:22s} [{decoder}] {result['error']}")
+                else:
+                    print(f"  ✅ {strategy:22s} [{decoder}] {result['wall_sec']:7.2f}초  "
+                          f"{result['frames_per_sec']:8.1f} 장/초  원본 {result['source_frames_per_sec']:8.1f} 프레임/초  "
+                          f"RSS {result['peak_rss_mb']}MB  {result['bytes_written'] / 1024:.0f}KB")
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "specs": specs,
+        },
+        "results": results,
+    }
+
+
+def compare_with_baseline(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    기준 결과와 비교하여 회귀 항목 찾기
+    (같은 영상/방식/디코더끼리 비교, 시간·메모리는 threshold 이상 증가, 출력 크기·장수는 변경 시 회귀)
+
+    Returns:
+        list: 회귀 설명 문자열 리스트
+    """
+    def key(result):
+        return result["video"], result["strategy"], result["decoder"]
+
+    base_results = {key(r): r for r in baseline.get("results", []) if "error" not in r}
+    regressions = []
+    print(f"\n=== 기준 대비 비교 (허용 {threshold:.0%}) ===")
+    for result in current["results"]:
+        base = base_results.get(key(result))
+        name = "/".join(key(result))
+        if base is None:
+            print(f"  - {name}: 기준 없음")
+            continue
+        if "error" in result:
+            regressions.append(f"{name}: 실행 실패 ({result['error']})")
+            continue
+
+        ratio = result["wall_sec"] / base["wall_sec"] if base["wall_sec"] else 1.0
+        line = f"  - {name}: 시간 {base['wall_sec']:.2f}→{result['wall_sec']:.2f}초 ({ratio - 1:+.0%})"
+        if ratio > 1 + threshold and result["wall_sec"] - base["wall_sec"] > MIN_REGRESSION_SEC:
+            regressions.append(f"{name}: 시간 {ratio - 1:+.0%}")
+        if result["peak_rss_mb"] and base.get("peak_rss_mb"):
+            rss_ratio = result["peak_rss_mb"] / base["peak_rss_mb"]
+            line += f", RSS {rss_ratio - 1:+.0%}"
+            if rss_ratio > 1 + threshold:
+                regressions.append(f"{name}: 메모리 {rss_ratio - 1:+.0%}")
+        if result["frames"] != base["frames"]:
+            regressions.append(f"{name}: 출력 장수 {base['frames']}→{result['frames']}")
+        if base["bytes_written"] and abs(result["bytes_written"] / base["bytes_written"] - 1) > threshold:
+            regressions.append(f"{name}: 출력 크기 {base['bytes_written']}→{result['bytes_written']}")
+        print(line)
+
+    if regressions:
+        print("\n❌ 회귀 발견:")
+        for regression in regressions:
+            print(f"  - {regression}")
+    else:
+        print("\n✅ 회귀 없음")
+    return regressions
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python benchmark_extraction.py -o bench.json
+    #             python benchmark_extraction.py --quick --baseline bench_baseline.json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="프레임 추출 벤치마크 (합성 영상)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="결과 JSON 경로")
+    parser.add_argument("--quick", action="store_true", help="짧은 영상 1개로만 실행")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="측정할 방식 (쉼표 구분)")
+    parser.add_argument("--decoders", default="opencv", help="측정할 디코더 (쉼표 구분, 예: opencv,pyav)")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="방식별 반복 횟수 (가장 빠른 실행 기준)")
+    parser.add_argument("--video-dir", default=DEFAULT_VIDEO_DIR, help="합성 영상 저장 폴더")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀 판단 비율 (기본 0.15)")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 --baseline 경로에 저장")
+    args = parser.parse_args()
+
+    strategies = [s for s in args.strategies.split(",") if s]
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            parser.error(f"지원하지 않는 추출 방식입니다: {strategy}")
+
+    report = run_benchmark(
+        QUICK_SPECS if args.quick else VIDEO_SPECS,
+        strategies,
+        [d for d in args.decoders.split(",") if d],
+        args.repeat,
+        args.video_dir,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {args.output}")
+
+    if args.baseline:
+        if args.update_baseline:
+            shutil.copyfile(args.output, args.baseline)
+            print(f"✅ 기준 결과 갱신: {args.baseline}")
+        elif os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+            sys.exit(1 if compare_with_baseline(report, baseline, args.threshold) else 0)
+        else:
+            print(f"⚠️ 기준 결과 없음: {args.baseline} (--update-baseline 으로 생성)")
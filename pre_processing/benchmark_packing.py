@@ -0,0 +1,191 @@
+import json
+import time
+import random
+import base64
+import contextlib
+import io
+
+import cv2
+import numpy as np
+
+from image_grid import GRID_COLUMNS, GRID_ROWS, pack_contact_sheets
+from llm_backend import BACKEND_NAMES
+from video_llm_RnD import (
+    IMAGE_PACKING_MODES,
+    create_analysis_prompt,
+    create_grid_analysis_prompt,
+    encode_image_bytes,
+    estimate_request_tokens,
+    generate_with_images,
+    get_images_from_folder,
+    parse_numbered_sentences,
+    setup_llm_backend,
+    split_sentences,
+)
+
+# 가짜 응답 지연 모델: 기본 지연 + 입력 토큰 1000개당 지연 (초)
+DEFAULT_FAKE_LATENCY = 1.0
+DEFAULT_FAKE_SEC_PER_1K_TOKENS = 0.3
+
+# 폴더를 지정하지 않았을 때 사용할 합성 이미지 (개수, 가로, 세로)
+SYNTHETIC_IMAGES = (9, 1280, 720)
+
+
+def synthetic_images(count, width, height, seed=0):
+    """장면마다 배경색과 사각형 위치가 다른 합성 JPEG 이미지"""
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(0, 1, width, dtype=np.float32)[None, :, None]
+    images = []
+    for i in range(count):
+        color_a, color_b = rng.integers(0, 256, size=(2, 3)).astype(np.float32)
+        frame = (color_a * (1 - ramp) + color_b * ramp).repeat(height, axis=0).astype(np.uint8)
+        x = int(rng.integers(0, width - width // 4))
+        cv2.rectangle(frame, (x, height // 3), (x + width // 4, height // 3 * 2), (255, 255, 255), -1)
+        cv2.putText(frame, f"scene {i + 1}", (20, height - 20), cv2.FONT_HERSHEY_SIMPLEX, height / 240, (0, 0, 0), 2)
+        success, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        images.append(buffer.tobytes())
+    return images
+
+
+def build_request(jpeg_images, packing, columns=GRID_COLUMNS, rows=GRID_ROWS):
+    """
+    전송 방식별 요청 구성 (프롬프트, Base64 이미지 리스트)
+    analyze_images_with_gemini / analyze_images_grid 와 같은 프롬프트와 이미지
+    """
+    image_count = len(jpeg_images)
+    if packing == "grid":
+        sheets = pack_contact_sheets(jpeg_images, columns, rows)
+        return create_grid_analysis_prompt(image_count, columns, rows), [encode_image_bytes(s) for s in sheets]
+    return create_analysis_prompt(image_count), [encode_image_bytes(data) for data in jpeg_images]
+
+
+def recover_sentences(text, image_count, packing):
+    """
+    응답에서 이미지별 문장 복원
+
+    Returns:
+        list: grid 는 이미지 번호 순서의 문장 리스트 (빠진 번호는 None),
+            separate 는 번호가 없어 응답의 문장 순서 그대로 (개수가 다르면 대응 불가)
+    """
+    if packing == "grid":
+        return parse_numbered_sentences(text, image_count)
+    return split_sentences(text)
+
+
+def fake_call_fn(latency=DEFAULT_FAKE_LATENCY, sec_per_1k_tokens=DEFAULT_FAKE_SEC_PER_1K_TOKENS, drop_rate=0.0):
+    """
+    Gemini 대신 사용할 가짜 호출 (입력 토큰 수에 비례해 지연 후 요청 형식의 응답 반환)
+    drop_rate 확률로 문장을 하나씩 빠뜨려 문장 수 검사가 동작하는지 확인할 수 있다.
+    """
+    def call(prompt, encoded_images, image_count, packing):
+        tokens = estimate_request_tokens(encoded_images, prompt)
+        time.sleep(random.uniform(0.8, 1.2) * latency + tokens / 1000 * sec_per_1k_tokens)
+        numbers = [i + 1 for i in range(image_count) if random.random() >= drop_rate]
+        if packing == "grid":
+            return "\n".join(f"[{n}] {n}번 칸 장면이다." for n in numbers)
+        return " ".join(f"{n}번 장면이다." for n in numbers)
+    return call
+
+
+def backend_call_fn(backend=None):
+    """LLM 백엔드 호출 (실제 Gemini 또는 가짜 서버, 응답 출력은 생략)"""
+    backend = setup_llm_backend(backend)
+
+    def call(prompt, encoded_images, image_count, packing):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return generate_with_images(prompt, encoded_images, backend=backend)
+    return call
+
+
+def measure(jpeg_images, packing, call_fn, repeat=1):
+    """
+    전송 방식 1개 측정
+
+    Returns:
+        dict: 이미지/요청 수, 전송 바이트, 예상 입력 토큰, 격자 생성 시간, 응답 지연, 문장 수 준수율
+    """
+    image_count = len(jpeg_images)
+    start = time.perf_counter()
+    prompt, encoded_images = build_request(jpeg_images, packing)
+    pack_sec = time.perf_counter() - start
+
+    latencies = []
+    compliant = 0
+    recovered = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = call_fn(prompt, encoded_images, image_count, packing)
+        latencies.append(time.perf_counter() - start)
+        sentences = recover_sentences(text, image_count, packing)
+        found = sum(1 for s in sentences if s)
+        # 이미지 수와 문장 수가 정확히 같아야 준수
+        # (separate 는 문장 수가 다르면 어느 이미지 문장이 빠졌는지 알 수 없어 복원 0)
+        if found == image_count and len(sentences) == image_count:
+            compliant += 1
+            recovered += image_count
+        elif packing == "grid":
+            recovered += found
+
+    return {
+        "packing": packing,
+        "images": image_count,
+        "parts": len(encoded_images),
+        "payload_bytes": sum(len(base64.b64decode(img)) for img in encoded_images),
+        "input_tokens": estimate_request_tokens(encoded_images, prompt),
+        "pack_sec": round(pack_sec, 4),
+        "latency_sec": round(sum(latencies) / len(latencies), 3),
+        "compliance": round(compliant / repeat, 3),
+        "recovered_ratio": round(recovered / (repeat * image_count), 3) if image_count else 1.0,
+    }
+
+
+def print_results(results):
+    """전송 방식별 결과 표 출력 (separate 대비 비율 포함)"""
+    print(f"\n{'방식':10} {'요청 이미지':>10} {'전송 KB':>9} {'입력 토큰':>9} {'격자 생성':>9} "
+          f"{'응답 지연':>9} {'문장 수 준수':>11} {'문장 복원':>9}")
+    base = next((r for r in results if r["packing"] == "separate"), None)
+    for r in results:
+        ratio = f" ({r['input_tokens'] / base['input_tokens']:.0%})" if base and base["input_tokens"] else ""
+        print(f"{r['packing']:10} {r['parts']:>10} {r['payload_bytes'] / 1024:>9.0f} "
+              f"{r['input_tokens']:>9}{ratio} {r['pack_sec']:>8.3f}s {r['latency_sec']:>8.2f}s "
+              f"{r['compliance']:>11.0%} {r['recovered_ratio']:>9.0%}")
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python benchmark_packing.py --fake 1.0            (합성 이미지 9장, API 호출 없음)
+    #             python benchmark_packing.py C:\guide\preset_data\cat\a.mp4 -r 3   (실제 Gemini 호출)
+    #             python benchmark_packing.py --llm-backend fake -r 5   (fake_llm_server.py 로 HTTP 전송 포함 측정)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="이미지 전송 방식(separate/grid) 토큰·지연·문장 수 비교")
+    parser.add_argument("folder", nargs="?", default=None, help="_V_ 이미지가 있는 폴더 (없으면 합성 이미지)")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="방식별 반복 횟수")
+    parser.add_argument(
+        "--fake", type=float, default=None, metavar="LATENCY",
+        help="Gemini 대신 기본 지연 LATENCY 초 + 입력 토큰 비례 지연 후 고정 문장 반환",
+    )
+    parser.add_argument(
+        "--fake-sec-per-1k", type=float, default=DEFAULT_FAKE_SEC_PER_1K_TOKENS,
+        help="가짜 응답의 입력 토큰 1000개당 추가 지연 (초)",
+    )
+    parser.add_argument("--fake-drop", type=float, default=0.0, help="가짜 응답에서 문장을 빠뜨릴 확률")
+    parser.add_argument("--llm-backend", choices=BACKEND_NAMES, default=None, help="--fake 가 없을 때 사용할 백엔드 (기본 LLM_BACKEND)")
+    parser.add_argument("-o", "--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    if args.folder:
+        jpeg_images = [open(path, "rb").read() for path in get_images_from_folder(args.folder)]
+    else:
+        jpeg_images = synthetic_images(*SYNTHETIC_IMAGES)
+
+    if args.fake is not None:
+        call_fn = fake_call_fn(args.fake, args.fake_sec_per_1k, args.fake_drop)
+    else:
+        call_fn = backend_call_fn(args.llm_backend)
+
+    results = [measure(jpeg_images, packing, call_fn, args.repeat) for packing in IMAGE_PACKING_MODES]
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.output}")
@@ -0,0 +1,418 @@
+import json
+import shutil
+import subprocess
+from fractions import Fraction
+
+import cv2
+import numpy as np
+
+from frame_sampler import iter_frames
+
+# 디코더 백엔드
+# - opencv : cv2.VideoCapture (기본값, 항상 사용 가능)
+# - ffmpeg : ffmpeg 서브프로세스 + select 필터 + rawvideo 파이프 (드문 샘플링에서 빠름)
+# - pyav   : PyAV (libav 바인딩, 멀티스레드 디코딩)
+# - auto   : 설치된 백엔드 중 AUTO_ORDER 순서로 선택
+AUTO_ORDER = ("ffmpeg", "pyav", "opencv")
+
+# 요청한 백엔드가 없을 때 사용하는 백엔드
+FALLBACK_DECODER = "opencv"
+
+
+class BaseDecoder:
+    """
+    디코더 백엔드 공통 인터페이스
+
+    생성 시 영상을 열고 fps, frame_count, width, height 를 채운다.
+    """
+
+    name = ""
+
+    @staticmethod
+    def available():
+        """백엔드 설치 여부"""
+        raise NotImplementedError
+
+    def read_frames(self, frame_indices):
+        """
+        지정된 프레임 번호들을 순서대로 디코딩
+
+        Args:
+            frame_indices (Sequence[int]): 읽을 프레임 번호 (오름차순)
+
+        Yields:
+            tuple: (frame_idx, success, frame) - frame 은 BGR uint8 배열
+        """
+        raise NotImplementedError
+
+    def read_every(self, step):
+        """
+        step 프레임마다 1장씩 디코더가 영상 끝을 알릴 때까지 디코딩
+        (컨테이너의 프레임 수가 실제와 달라도 마지막 프레임까지 읽음)
+
+        Args:
+            step (int): 프레임 간격
+
+        Yields:
+            tuple: (frame_idx, success, frame) - frame 은 BGR uint8 배열
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OpenCVDecoder(BaseDecoder):
+    """cv2.VideoCapture 디코더"""
+
+    name = "opencv"
+
+    @staticmethod
+    def available():
+        return True
+
+    def __init__(self, video_path, read_mode="auto"):
+        self.video_path = str(video_path)
+        self.read_mode = read_mode
+        self.cap = cv2.VideoCapture(self.video_path)
+        if not self.cap.isOpened():
+            raise IOError(f"❌ 영상 열기 실패: {video_path}")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    def read_frames(self, frame_indices):
+        yield from iter_frames(self.cap, frame_indices, self.read_mode)
+
+    def read_every(self, step):
+        # 건너뛸 프레임은 grab() 만 수행
+        frame_idx = 0
+        while self.cap.grab():
+            if frame_idx % step == 0:
+                success, frame = self.cap.retrieve()
+                yield frame_idx, success, frame
+            frame_idx += 1
+
+    def close(self):
+        self.cap.release()
+
+
+class FFmpegDecoder(BaseDecoder):
+    """ffmpeg 서브프로세스 디코더 (select 필터로 필요한 프레임만 rawvideo 로 출력)"""
+
+    name = "ffmpeg"
+
+    @staticmethod
+    def available():
+        return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+    def __init__(self, video_path, read_mode="auto"):
+        self.video_path = str(video_path)
+        self.proc = None
+        probe = subprocess.run(
+            [
+                "ffprobe", "-v", "error", "-select_streams", "v:0",
+                "-show_entries",
+                "stream=width,height,avg_frame_rate,r_frame_rate,nb_frames,duration"
+                ":stream_side_data=rotation:stream_tags=rotate",
+                "-of", "json", self.video_path,
+            ],
+            capture_output=True, text=True,
+        )
+        streams = json.loads(probe.stdout or "{}").get("streams") if probe.returncode == 0 else None
+        if not streams:
+            raise IOError(f"❌ 영상 열기 실패: {video_path}")
+
+        stream = streams[0]
+        rate = stream.get("avg_frame_rate", "0/0")
+        if rate in ("0/0", "0"):
+            rate = stream.get("r_frame_rate", "0/0")
+        self.fps = float(Fraction(rate)) if rate not in ("0/0", "0") else 0.0
+        self.width = int(stream["width"])
+        self.height = int(stream["height"])
+        if self.rotation(stream) % 180 == 90:
+            # ffmpeg 은 회전 정보대로 돌려서 출력하므로 (OpenCV 와 동일) 가로/세로를 바꿔서 읽음
+            self.width, self.height = self.height, self.width
+        if str(stream.get("nb_frames", "")).isdigit():
+            self.frame_count = int(stream["nb_frames"])
+        else:
+            # MKV 등 프레임 수가 없는 컨테이너는 길이로 계산
+            self.frame_count = int(round(float(stream.get("duration", 0)) * self.fps))
+
+    @staticmethod
+    def rotation(stream):
+        """ffprobe 스트림 정보의 회전 각도 (display matrix 또는 예전 rotate 태그, 0~359)"""
+        for side_data in stream.get("side_data_list", []):
+            if "rotation" in side_data:
+                return int(round(float(side_data["rotation"]))) % 360
+        return int(stream.get("tags", {}).get("rotate", 0)) % 360
+
+    @staticmethod
+    def select_expression(frame_indices):
+        """프레임 번호 목록을 ffmpeg select 필터 식으로 변환"""
+        first, last = frame_indices[0], frame_indices[-1]
+        if len(frame_indices) > 1:
+            step = frame_indices[1] - frame_indices[0]
+            if step > 0 and list(frame_indices) == list(range(first, last + 1, step)):
+                # 등간격이면 짧은 식으로 표현
+                return f"gte(n\\,{first})*lte(n\\,{last})*not(mod(n-{first}\\,{step}))"
+        return "+".join(f"eq(n\\,{idx})" for idx in frame_indices)
+
+    def _pipe(self, select, max_frames=None):
+        """select 필터를 통과한 프레임을 rawvideo 로 읽는 제너레이터 (파이프가 끝나면 종료)"""
+        frame_bytes = self.width * self.height * 3
+        limit = ["-frames:v", str(max_frames)] if max_frames else []
+        self.proc = subprocess.Popen(
+            [
+                "ffmpeg", "-v", "error", "-nostdin", "-i", self.video_path,
+                "-vf", f"select='{select}'", "-vsync", "0", *limit,
+                "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1",
+            ],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        try:
+            while True:
+                data = self.proc.stdout.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    return
+                yield np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3).copy()
+        finally:
+            self.close()
+
+    def read_frames(self, frame_indices):
+        frame_indices = list(frame_indices)
+        if not frame_indices:
+            return
+
+        frames = self._pipe(self.select_expression(frame_indices), len(frame_indices))
+        try:
+            for frame_idx in frame_indices:
+                frame = next(frames, None)
+                if frame is None:
+                    # 영상 끝 (메타데이터보다 실제 프레임이 적은 경우)
+                    yield frame_idx, False, None
+                    continue
+                yield frame_idx, True, frame
+        finally:
+            frames.close()
+
+    def read_every(self, step):
+        for saved_idx, frame in enumerate(self._pipe(f"not(mod(n\\,{step}))")):
+            yield saved_idx * step, True, frame
+
+    def close(self):
+        if self.proc is not None:
+            self.proc.stdout.close()
+            if self.proc.poll() is None:
+                self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+
+
+class PyAVDecoder(BaseDecoder):
+    """PyAV 디코더 (순차 디코딩, 필요한 프레임만 BGR 변환)"""
+
+    name = "pyav"
+
+    @staticmethod
+    def available():
+        try:
+            import av  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def __init__(self, video_path, read_mode="auto"):
+        import av
+
+        self.video_path = str(video_path)
+        try:
+            self.container = av.open(self.video_path)
+        except Exception as e:
+            raise IOError(f"❌ 영상 열기 실패: {video_path} ({e})")
+        if not self.container.streams.video:
+            self.container.close()
+            raise IOError(f"❌ 비디오 스트림 없음: {video_path}")
+
+        self.stream = self.container.streams.video[0]
+        # 회전 정보는 프레임에만 있으므로 첫 프레임으로 확인 후 처음부터 다시 열기
+        try:
+            first = next(self.container.decode(self.stream), None)
+        except Exception as e:
+            self.container.close()
+            raise IOError(f"❌ 영상 디코딩 실패: {video_path} ({e})")
+        self.rotation = int(getattr(first, "rotation", 0) or 0)
+        self.container.close()
+        self.container = av.open(self.video_path)
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = "AUTO"
+        rate = self.stream.average_rate or self.stream.guessed_rate
+        self.fps = float(rate) if rate else 0.0
+        self.width = self.stream.codec_context.width
+        self.height = self.stream.codec_context.height
+        if self.rotation % 180:
+            self.width, self.height = self.height, self.width
+        if self.stream.frames:
+            self.frame_count = self.stream.frames
+        elif self.stream.duration is not None:
+            self.frame_count = int(round(float(self.stream.duration * self.stream.time_base) * self.fps))
+        else:
+            self.frame_count = 0
+
+    def read_frames(self, frame_indices):
+        frame_indices = list(frame_indices)
+        pending = iter(frame_indices)
+        target = next(pending, None)
+
+        for n, frame in enumerate(self.container.decode(self.stream)):
+            if target is None:
+                break
+            if n == target:
+                yield n, True, self._to_bgr(frame)
+                target = next(pending, None)
+
+        # 영상 끝까지 도달하지 못한 프레임
+        while target is not None:
+            yield target, False, None
+            target = next(pending, None)
+
+    def read_every(self, step):
+        for n, frame in enumerate(self.container.decode(self.stream)):
+            if n % step == 0:
+                yield n, True, self._to_bgr(frame)
+
+    def _to_bgr(self, frame):
+        """BGR 배열로 변환 후 회전 정보대로 돌림 (OpenCV / ffmpeg 와 같은 방향)"""
+        image = frame.to_ndarray(format="bgr24")
+        if self.rotation:
+            # rotation 은 반시계 방향 각도 (-90 이면 시계 방향으로 90도)
+            image = np.ascontiguousarray(np.rot90(image, k=round(self.rotation / 90)))
+        return image
+
+    def close(self):
+        self.container.close()
+
+
+DECODERS = {
+    "opencv": OpenCVDecoder,
+    "ffmpeg": FFmpegDecoder,
+    "pyav": PyAVDecoder,
+}
+DECODER_NAMES = ("auto",) + tuple(DECODERS)
+
+
+def resolve_decoder(name="opencv"):
+    """
+    사용할 디코더 이름 결정 (설치되지 않았으면 대체 백엔드)
+
+    Args:
+        name (str): "auto", "opencv", "ffmpeg", "pyav" 중 하나
+
+    Returns:
+        str: 실제로 사용할 디코더 이름
+    """
+    if name not in DECODER_NAMES:
+        raise ValueError(f"지원하지 않는 디코더입니다: {name}")
+    if name == "auto":
+        return next(n for n in AUTO_ORDER if DECODERS[n].available())
+    if not DECODERS[name].available():
+        print(f"⚠️ 디코더 '{name}' 사용 불가, '{FALLBACK_DECODER}' 사용")
+        return FALLBACK_DECODER
+    return name
+
+
+def get_decoder(name, video_path, read_mode="auto"):
+    """
+    디코더 생성
+
+    Args:
+        name (str): "auto", "opencv", "ffmpeg", "pyav" 중 하나
+        video_path (str): 비디오 파일 경로
+        read_mode (str): opencv 디코더의 읽기 모드 ("auto", "seek", "sequential")
+
+    Returns:
+        BaseDecoder: fps, frame_count, width, height, read_frames(), close()
+    """
+    return DECODERS[resolve_decoder(name)](video_path, read_mode)
+
+
+def check_decoders(video_path, samples=30, tolerance=3.0):
+    """
+    설치된 모든 백엔드가 같은 프레임 번호에서 같은 프레임/시간을 반환하는지 확인
+    (기준: OpenCV seek 모드)
+
+    Args:
+        video_path (str): 비디오 파일 경로
+        samples (int): 확인할 프레임 수 (영상 전체에 고르게)
+        tolerance (float): 기준 프레임과의 허용 평균 픽셀 차이
+
+    Returns:
+        bool: 모든 백엔드 통과 여부
+    """
+    with OpenCVDecoder(video_path, "seek") as reference:
+        fps = reference.fps
+        step = max(1, reference.frame_count // samples)
+        frame_indices = list(range(0, reference.frame_count, step))[:samples]
+        expected = {idx: frame for idx, success, frame in reference.read_frames(frame_indices) if success}
+
+    print(f"기준 (opencv/seek): {len(expected)}/{len(frame_indices)}개 프레임, {fps:.3f} FPS")
+    all_passed = True
+    for name, decoder_cls in DECODERS.items():
+        if not decoder_cls.available():
+            print(f"- {name:7s}: 설치되지 않음, 건너뜀")
+            continue
+
+        errors = []
+        with decoder_cls(video_path) as decoder:
+            if abs(decoder.fps - fps) > 0.01:
+                errors.append(f"FPS 불일치 {decoder.fps:.3f}")
+            returned = 0
+            worst = 0.0
+            for idx, success, frame in decoder.read_frames(frame_indices):
+                if not success:
+                    if idx in expected:
+                        errors.append(f"프레임 {idx} 읽기 실패")
+                    continue
+                returned += 1
+                if idx not in expected:
+                    continue
+                if frame.shape != expected[idx].shape:
+                    errors.append(f"프레임 {idx} 크기 불일치 {frame.shape}")
+                    continue
+                diff = float(np.abs(frame.astype(np.int16) - expected[idx].astype(np.int16)).mean())
+                worst = max(worst, diff)
+                if diff > tolerance:
+                    # 같은 시간의 프레임이 아님 (다른 프레임을 반환)
+                    errors.append(f"프레임 {idx} ({idx / fps:.3f}초) 내용 불일치 (차이 {diff:.1f})")
+
+        passed = not errors
+        all_passed &= passed
+        status = "통과" if passed else "실패"
+        print(f"- {name:7s}: {status} ({returned}개 프레임, 최대 평균 픽셀 차이 {worst:.2f})")
+        for error in errors[:5]:
+            print(f"    {error}")
+    return all_passed
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python decoders.py input.mp4 --check
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="디코더 백엔드 확인")
+    parser.add_argument("video", help="영상 파일 경로")
+    parser.add_argument("--check", action="store_true", help="백엔드별 샘플 프레임/시간 일치 여부 확인")
+    parser.add_argument("-n", "--samples", type=int, default=30, help="확인할 프레임 수")
+    args = parser.parse_args()
+
+    print("사용 가능한 디코더: " + ", ".join(n for n, cls in DECODERS.items() if cls.available()))
+    print(f"auto 선택 결과: {resolve_decoder('auto')}")
+    if args.check:
+        sys.exit(0 if check_decoders(args.video, args.samples) else 1)
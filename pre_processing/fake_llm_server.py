@@ -0,0 +1,299 @@
+import re
+import json
+import time
+import uuid
+import base64
+import random
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from frame_profiles import estimate_image_tokens, jpeg_size
+
+# 응답 특성 프로파일
+# - latency          : 기본 응답 지연 (초, ±20% 무작위)
+# - sec_per_1k_tokens: 입력 토큰 1000개당 추가 지연 (초)
+# - chunk_delay      : 스트리밍 조각 사이 지연 (초)
+# - error_rate       : 500/503 오류를 돌려줄 확률
+# - rpm              : 분당 요청 한도 (넘으면 429 + Retry-After, 0 이면 무제한)
+FAKE_PROFILES = {
+    "fast": {"latency": 0.05, "sec_per_1k_tokens": 0.0, "chunk_delay": 0.01, "error_rate": 0.0, "rpm": 0},
+    "realistic": {"latency": 2.0, "sec_per_1k_tokens": 0.3, "chunk_delay": 0.05, "error_rate": 0.02, "rpm": 60},
+    "flaky": {"latency": 0.5, "sec_per_1k_tokens": 0.1, "chunk_delay": 0.02, "error_rate": 0.3, "rpm": 0},
+    "throttled": {"latency": 0.2, "sec_per_1k_tokens": 0.05, "chunk_delay": 0.02, "error_rate": 0.0, "rpm": 10},
+}
+DEFAULT_FAKE_PROFILE = "fast"
+DEFAULT_FAKE_PORT = 8765
+
+# 스트리밍 조각 1개의 글자 수
+FAKE_CHUNK_CHARS = 16
+
+# 토큰 수 추정 기준 (video_llm_RnD.PROMPT_CHARS_PER_TOKEN 과 같음)
+CHARS_PER_TOKEN = 2
+
+# 프롬프트에 적힌 이미지 수 ("총 9장" / 격자 "원본 이미지 9장")
+IMAGE_COUNT_PATTERN = re.compile(r"총 (\d+)장|원본 이미지 (\d+)장")
+
+
+def fake_response_text(prompt, image_count, json_mode=False):
+    """
+    요청 형식에 맞는 가짜 응답
+    프롬프트에 이미지 수가 적혀 있으면 그 수만큼 (격자는 원본 이미지 수), 없으면 image_count 만큼 문장을 만든다.
+
+    Args:
+        prompt (str): 요청 프롬프트
+        image_count (int): 요청 이미지 수
+        json_mode (bool): JSON 응답 (통합 분석, {"summary", "objects"})
+
+    Returns:
+        str: 응답 텍스트 (격자 프롬프트 - "[1]" 포함 - 는 "[번호] 문장." 한 줄씩)
+    """
+    match = IMAGE_COUNT_PATTERN.search(prompt)
+    if match:
+        image_count = int(match.group(1) or match.group(2))
+    if json_mode:
+        return json.dumps({
+            "summary": [f"{i + 1}번 장면에서 사람이 걷고 있다." for i in range(image_count)],
+            "objects": [["사람", "길"] for _ in range(image_count)],
+        }, ensure_ascii=False)
+    if "[1]" in prompt:
+        return "\n".join(f"[{i + 1}] {i + 1}번 칸에서 사람이 걷고 있다." for i in range(image_count))
+    return " ".join(f"{i + 1}번 장면에서 사람이 걷고 있다." for i in range(image_count))
+
+
+def estimate_tokens(prompt, encoded_images):
+    """입력 토큰 수 추정 (프롬프트 글자 수 + 이미지 크기)"""
+    tokens = len(prompt) // CHARS_PER_TOKEN
+    for img in encoded_images:
+        size = jpeg_size(base64.b64decode(img[:4096])) if img else None
+        tokens += estimate_image_tokens(*size) if size else estimate_image_tokens(768, 768)
+    return tokens
+
+
+class FakeLLMState:
+    """
+    가짜 서버 공유 상태 (프로파일, 분당 요청 기록, 등록된 컨텍스트, 누적 처리 현황)
+
+    Args:
+        profile (dict): 응답 특성 (FAKE_PROFILES 항목 형식)
+        seed (int): 오류 발생 난수 시드 (None 이면 무작위)
+    """
+
+    def __init__(self, profile, seed=None):
+        self.profile = dict(profile)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_times = deque()
+        self.contexts = {}
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "prompt_tokens": 0, "candidate_tokens": 0}
+
+    def admit(self):
+        """
+        요청 접수 (분당 한도 / 오류 확률 판정)
+
+        Returns:
+            tuple: (HTTP 상태 코드, Retry-After 초) - 정상이면 (200, None)
+        """
+        now = time.monotonic()
+        with self.lock:
+            self.stats["requests"] += 1
+            rpm = self.profile["rpm"]
+            while self.request_times and now - self.request_times[0] >= 60:
+                self.request_times.popleft()
+            if rpm and len(self.request_times) >= rpm:
+                self.stats["rate_limited"] += 1
+                return 429, max(1, round(60 - (now - self.request_times[0])))
+            self.request_times.append(now)
+            if self.random.random() < self.profile["error_rate"]:
+                self.stats["errors"] += 1
+                return self.random.choice((500, 503)), None
+        return 200, None
+
+    def delay(self, tokens):
+        """입력 토큰 수에 비례한 응답 지연 (초)"""
+        return self.random.uniform(0.8, 1.2) * self.profile["latency"] + tokens / 1000 * self.profile["sec_per_1k_tokens"]
+
+    def record(self, usage):
+        with self.lock:
+            self.stats["ok"] += 1
+            self.stats["prompt_tokens"] += usage["prompt_tokens"]
+            self.stats["candidate_tokens"] += usage["candidate_tokens"]
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """
+    가짜 LLM API (llm_backend.FakeHTTPBackend 와 같은 형식)
+
+    - POST   /v1/generate       : {"prompt", "images", "generation_config", "context", "stream"}
+                                  → {"text", "usage"} (stream 이면 한 줄에 JSON 하나씩)
+    - POST   /v1/contexts       : {"instruction", "ttl_sec"} → {"name", "expire_at"}
+    - GET    /v1/contexts/<name>: 유효하면 200, 없거나 만료면 404
+    - DELETE /v1/contexts/<name>
+    - GET    /v1/stats          : 누적 처리 현황
+    """
+
+    protocol_version = "HTTP/1.0"
+    verbose = False
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _context(self, name):
+        with self.state.lock:
+            context = self.state.contexts.get(name)
+            if context and context["expire_at"] <= time.time():
+                del self.state.contexts[name]
+                context = None
+        return context
+
+    def do_GET(self):
+        if self.path == "/v1/stats":
+            with self.state.lock:
+                body = dict(self.state.stats, contexts=len(self.state.contexts), profile=self.state.profile)
+            self._send_json(200, body)
+        elif self.path.startswith("/v1/contexts/"):
+            name = self.path[len("/v1/contexts/"):]
+            if self._context(name):
+                self._send_json(200, {"name": name})
+            else:
+                self._send_json(404, {"error": f"컨텍스트 없음: {name}"})
+        else:
+            self._send_json(404, {"error": f"알 수 없는 경로: {self.path}"})
+
+    def do_DELETE(self):
+        name = self.path[len("/v1/contexts/"):]
+        with self.state.lock:
+            self.state.contexts.pop(name, None)
+        self._send_json(200, {"name": name})
+
+    def do_POST(self):
+        body = self._read_json()
+        if self.path == "/v1/contexts":
+            name = f"cachedContents/fake-{uuid.uuid4().hex[:12]}"
+            context = {"instruction": body["instruction"], "expire_at": time.time() + body.get("ttl_sec", 3600)}
+            with self.state.lock:
+                self.state.contexts[name] = context
+            self._send_json(200, {"name": name, "expire_at": context["expire_at"]})
+        elif self.path == "/v1/generate":
+            self._generate(body)
+        else:
+            self._send_json(404, {"error": f"알 수 없는 경로: {self.path}"})
+
+    def _generate(self, body):
+        status, retry_after = self.state.admit()
+        if status == 429:
+            self._send_json(429, {"error": "분당 요청 한도 초과"}, {"Retry-After": retry_after})
+            return
+        if status != 200:
+            self._send_json(status, {"error": "가짜 서버 오류"})
+            return
+
+        prompt = body.get("prompt", "")
+        images = body.get("images", [])
+        cached_tokens = 0
+        if body.get("context"):
+            context = self._context(body["context"])
+            if context is None:
+                self._send_json(404, {"error": f"컨텍스트 없음: {body['context']}"})
+                return
+            cached_tokens = len(context["instruction"]) // CHARS_PER_TOKEN
+            prompt = context["instruction"] + "\n\n" + prompt
+
+        json_mode = (body.get("generation_config") or {}).get("response_mime_type") == "application/json"
+        text = fake_response_text(prompt, len(images), json_mode)
+        prompt_tokens = estimate_tokens(prompt, images)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "candidate_tokens": len(text) // CHARS_PER_TOKEN,
+            "cached_tokens": cached_tokens,
+        }
+        time.sleep(self.state.delay(prompt_tokens))
+
+        if not body.get("stream"):
+            self.state.record(usage)
+            self._send_json(200, {"text": text, "usage": usage})
+            return
+
+        # 스트리밍: Content-Length 없이 보내고 연결 종료로 끝을 알림 (HTTP/1.0)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for start in range(0, len(text), FAKE_CHUNK_CHARS):
+            if start:
+                time.sleep(self.state.profile["chunk_delay"])
+            line = json.dumps({"text": text[start:start + FAKE_CHUNK_CHARS]}, ensure_ascii=False) + "\n"
+            self.wfile.write(line.encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write((json.dumps({"done": True, "usage": usage}) + "\n").encode("utf-8"))
+        self.state.record(usage)
+
+
+def create_server(port=DEFAULT_FAKE_PORT, profile=DEFAULT_FAKE_PROFILE, host="127.0.0.1", seed=None, **overrides):
+    """
+    가짜 서버 생성 (serve_forever 는 호출하는 쪽에서, 테스트에서는 스레드로 실행)
+
+    Args:
+        port (int): 포트 (0 이면 빈 포트)
+        profile (str): FAKE_PROFILES 이름
+        host (str): 바인드 주소
+        seed (int): 오류 발생 난수 시드
+        **overrides: 프로파일 항목 덮어쓰기 (latency, error_rate, rpm 등, None 은 무시)
+
+    Returns:
+        ThreadingHTTPServer: 서버 (server.state 로 처리 현황 확인)
+    """
+    if profile not in FAKE_PROFILES:
+        raise ValueError(f"지원하지 않는 프로파일입니다: {profile} (가능: {', '.join(FAKE_PROFILES)})")
+    settings = dict(FAKE_PROFILES[profile])
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    server = ThreadingHTTPServer((host, port), FakeLLMHandler)
+    server.daemon_threads = True
+    server.state = FakeLLMState(settings, seed)
+    return server
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python fake_llm_server.py --profile throttled
+    #   (다른 터미널에서) LLM_BACKEND=fake python preset_module.py C:\guide\preset_data\cat\a.mp4 --scene-summary disk
+    import argparse
+
+    parser = argparse.ArgumentParser(description="부하 테스트/CI 용 가짜 LLM 서버 (API 키/네트워크 불필요)")
+    parser.add_argument("--port", type=int, default=DEFAULT_FAKE_PORT, help="포트")
+    parser.add_argument("--profile", choices=list(FAKE_PROFILES), default=DEFAULT_FAKE_PROFILE, help="응답 특성 프로파일")
+    parser.add_argument("--latency", type=float, default=None, help="기본 응답 지연 (초, 프로파일 덮어쓰기)")
+    parser.add_argument("--sec-per-1k", type=float, default=None, help="입력 토큰 1000개당 추가 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=None, help="500/503 오류 확률")
+    parser.add_argument("--rpm", type=int, default=None, help="분당 요청 한도 (0 이면 무제한)")
+    parser.add_argument("--seed", type=int, default=None, help="오류 발생 난수 시드")
+    parser.add_argument("-v", "--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args()
+
+    FakeLLMHandler.verbose = args.verbose
+    server = create_server(
+        args.port, args.profile, seed=args.seed, latency=args.latency, sec_per_1k_tokens=args.sec_per_1k,
+        error_rate=args.error_rate, rpm=args.rpm,
+    )
+    print(f"✅ 가짜 LLM 서버 시작: http://127.0.0.1:{server.server_address[1]} (프로파일 {args.profile}: {server.state.profile})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n처리 현황: {server.state.stats}")
@@ -0,0 +1,24 @@
+import os
+import json
+import uuid
+import hashlib
+from pathlib import Path
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def write_json_atomic(path, data, indent=None, separators=None):
+    """임시 파일에 쓴 뒤 교체 (중간에 프로세스가 죽어도 파일이 깨지지 않도록)"""
+    tmp_path = Path(path).with_name(f".{Path(path).name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent, separators=separators)
+    os.replace(tmp_path, path)
+
+
+def file_checksum(path):
+    """파일 내용 해시 (sha256)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import uuid
+from pathlib import Path
+
+from file_utils import file_checksum, write_json_atomic
+
+# 캐시 저장 위치 및 최대 크기 (환경변수로 변경 가능)
+DEFAULT_CACHE_DIR = os.getenv("FRAME_CACHE_DIR", str(Path.home() / ".cache" / "cw_modules" / "frames"))
+DEFAULT_MAX_BYTES = int(os.getenv("FRAME_CACHE_MAX_BYTES", str(20 * 1024 ** 3)))
+
+# 캐시 형식이 바뀌면 올려서 기존 항목을 무효화
+CACHE_VERSION = 2
+
+_SIZE_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_size(text):
+    """'500M', '20G' 같은 크기 문자열을 바이트 수로 변환"""
+    text = str(text).strip().upper().rstrip("B")
+    if text and text[-1] in _SIZE_UNITS:
+        return int(float(text[:-1]) * _SIZE_UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(num_bytes):
+    """바이트 수를 읽기 쉬운 문자열로 변환"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}TB"
+
+
+class FrameCache:
+    """
+    프레임 추출 결과 캐시
+
+    (비디오 내용 해시, 추출 함수, 추출 파라미터) 를 키로 추출 프레임을 저장하고,
+    전체 크기가 max_bytes 를 넘으면 가장 오래 사용하지 않은 항목부터 삭제한다.
+    내용이 같은 영상은 파일명이 달라도 같은 항목을 쓰므로, 프레임 파일명은
+    비디오 파일명(stem)을 뺀 나머지 부분으로 저장한다.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.entries_dir = self.cache_dir / "entries"
+        self.max_bytes = max_bytes
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # 키 생성
+    # ------------------------------------------------------------------
+    def video_hash(self, video_path):
+        """
+        비디오 내용 해시 (sha256)
+        경로/크기/수정시각이 같으면 이전 계산 결과를 재사용
+        (여러 프로세스가 동시에 기록해도 다른 항목을 덮어쓰지 않도록 항목마다 파일 1개)
+        """
+        stat = os.stat(video_path)
+        memo_key = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        memo_dir = self.cache_dir / "video_hashes"
+        memo_path = memo_dir / f"{hashlib.sha256(memo_key.encode('utf-8')).hexdigest()}.json"
+
+        try:
+            with open(memo_path, "r", encoding="utf-8") as f:
+                memo = json.load(f)
+            if memo.get("key") == memo_key:
+                return memo["hash"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        content_hash = file_checksum(video_path)
+
+        memo_dir.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(memo_path, {"key": memo_key, "hash": content_hash})
+        return content_hash
+
+    def make_key(self, video_path, extractor, params):
+        """캐시 키 생성"""
+        key_data = {
+            "version": CACHE_VERSION,
+            "video": self.video_hash(video_path),
+            "extractor": extractor,
+            "params": params,
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+    def get(self, key, output_dir, video_stem="", frame_log=None):
+        """
+        캐시 항목을 output_dir 로 복원
+
+        Args:
+            key (str): 캐시 키
+            output_dir (Path): 복원할 디렉토리
+            video_stem (str): 프레임 파일명 앞에 붙일 비디오 파일명
+            frame_log (dict): 지정하면 {파일명: 원본 프레임 번호} 를 채움
+
+        Returns:
+            list | None: 저장된 프레임 파일명 리스트 (캐시에 없으면 None)
+        """
+        entry_dir = self.entries_dir / key
+        meta_path = entry_dir / "meta.json"
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        saved_frames = [f"{video_stem}{suffix}" for suffix in meta["saved_frames"]]
+        try:
+            # 출력 파일이 나중에 덮어써져도 캐시가 바뀌지 않도록 하드링크 대신 복사
+            for suffix, name in zip(meta["saved_frames"], saved_frames):
+                shutil.copyfile(entry_dir / suffix.lstrip("_"), output_dir / name)
+        except FileNotFoundError:
+            # 다른 프로세스가 삭제 중인 항목
+            return None
+
+        if frame_log is not None:
+            for suffix, name in zip(meta["saved_frames"], saved_frames):
+                if suffix in meta.get("frame_indices", {}):
+                    frame_log[name] = meta["frame_indices"][suffix]
+
+        meta["last_access"] = time.time()
+        meta["hits"] = meta.get("hits", 0) + 1
+        write_json_atomic(meta_path, meta)
+        return saved_frames
+
+    def put(self, key, output_dir, saved_frames, video_stem="", frame_log=None, info=None):
+        """추출 결과를 캐시에 저장 후 용량 초과 시 정리"""
+        entry_dir = self.entries_dir / key
+        if entry_dir.exists():
+            return
+
+        # 임시 폴더에 모두 복사한 뒤 이름 변경 (동시에 같은 키를 저장해도 안전)
+        tmp_dir = self.entries_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        tmp_dir.mkdir()
+        total_bytes = 0
+        suffixes = []
+        frame_indices = {}
+        for name in saved_frames:
+            suffix = name[len(video_stem):] if name.startswith(video_stem) else name
+            shutil.copyfile(Path(output_dir) / name, tmp_dir / suffix.lstrip("_"))
+            total_bytes += (tmp_dir / suffix.lstrip("_")).stat().st_size
+            suffixes.append(suffix)
+            if frame_log and name in frame_log:
+                frame_indices[suffix] = frame_log[name]
+
+        now = time.time()
+        write_json_atomic(tmp_dir / "meta.json", {
+            "key": key,
+            "saved_frames": suffixes,
+            "frame_indices": frame_indices,
+            "bytes": total_bytes,
+            "created": now,
+            "last_access": now,
+            "hits": 0,
+            "info": info or {},
+        })
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        self.evict()
+
+    # ------------------------------------------------------------------
+    # 관리
+    # ------------------------------------------------------------------
+    def entries(self):
+        """캐시 항목 메타데이터 리스트 (최근 사용 순)"""
+        entries = []
+        for meta_path in self.entries_dir.glob("*/meta.json"):
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    entries.append(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        entries.sort(key=lambda e: e["last_access"], reverse=True)
+        return entries
+
+    def total_bytes(self):
+        """캐시 전체 크기"""
+        return sum(e["bytes"] for e in self.entries())
+
+    def evict(self, max_bytes=None):
+        """
+        가장 오래 사용하지 않은 항목부터 삭제하여 max_bytes 이하로 유지
+
+        Returns:
+            tuple: (삭제한 항목 수, 확보한 바이트 수)
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(e["bytes"] for e in entries)
+
+        removed = 0
+        freed = 0
+        for entry in reversed(entries):
+            if total <= max_bytes:
+                break
+            shutil.rmtree(self.entries_dir / entry["key"], ignore_errors=True)
+            total -= entry["bytes"]
+            freed += entry["bytes"]
+            removed += 1
+        return removed, freed
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        return self.evict(max_bytes=0)
+
+
+def cached_extract(extract_fn, video_path, output_dir, cache=None, frame_log=None, **params):
+    """
+    캐시를 거쳐 프레임 추출 함수 호출
+
+    Args:
+        extract_fn (callable): extract_fn(video_path, output_dir, **params) -> 프레임 파일명 리스트
+        video_path (str): 비디오 파일 경로
+        output_dir (Path): 프레임 저장 디렉토리
+        cache (FrameCache): 사용할 캐시 (None 이면 기본 위치)
+        frame_log (dict): 지정하면 {파일명: 원본 프레임 번호} 를 채움 (캐시 적중 시에도)
+        **params: 추출 파라미터 (캐시 키에 포함)
+
+    Returns:
+        list: 저장된 프레임 파일명 리스트
+    """
+    cache = cache or FrameCache()
+    key = cache.make_key(video_path, extract_fn.__name__, params)
+    video_stem = Path(video_path).stem
+
+    entry_log = {}
+    saved_frames = cache.get(key, output_dir, video_stem, entry_log)
+    if saved_frames is not None:
+        if frame_log is not None:
+            frame_log.update(entry_log)
+        print(f"⚡ 프레임 캐시 적중: {len(saved_frames)}개 복원 ({key[:12]})")
+        return saved_frames
+
+    saved_frames = extract_fn(video_path, output_dir, frame_log=entry_log, **params)
+    cache.put(key, output_dir, saved_frames, video_stem, entry_log, info={
+        "video_path": str(video_path),
+        "extractor": extract_fn.__name__,
+        "params": params,
+    })
+    if frame_log is not None:
+        frame_log.update(entry_log)
+    return saved_frames
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python frame_cache.py stats / list / prune --max-bytes 5G / clear
+    import argparse
+
+    parser = argparse.ArgumentParser(description="프레임 추출 캐시 관리")
+    parser.add_argument("command", choices=["stats", "list", "prune", "clear"], help="실행할 명령")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="캐시 폴더")
+    parser.add_argument("--max-bytes", default=None, help="prune 시 유지할 최대 크기 (예: 500M, 20G)")
+    args = parser.parse_args()
+
+    cache = FrameCache(args.cache_dir)
+
+    if args.command == "stats":
+        entries = cache.entries()
+        print(f"캐시 폴더: {cache.cache_dir}")
+        print(f"항목 수: {len(entries)}개, 전체 크기: {format_size(sum(e['bytes'] for e in entries))} "
+              f"(최대 {format_size(cache.max_bytes)})")
+        print(f"누적 적중: {sum(e.get('hits', 0) for e in entries)}회")
+    elif args.command == "list":
+        for entry in cache.entries():
+            info = entry.get("info", {})
+            last_access = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_access"]))
+            print(f"{entry['key'][:12]}  {format_size(entry['bytes']):>9}  {len(entry['saved_frames']):3d}장  "
+                  f"적중 {entry.get('hits', 0):3d}  {last_access}  "
+                  f"{info.get('extractor', '')} {Path(info.get('video_path', '')).name}")
+    elif args.command == "prune":
+        max_bytes = parse_size(args.max_bytes) if args.max_bytes else cache.max_bytes
+        removed, freed = cache.evict(max_bytes)
+        print(f"🧹 {removed}개 항목 삭제, {format_size(freed)} 확보")
+    else:
+        removed, freed = cache.clear()
+        print(f"🧹 캐시 전체 삭제: {removed}개 항목, {format_size(freed)}")
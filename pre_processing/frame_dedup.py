@@ -0,0 +1,144 @@
+import numpy as np
+from pathlib import Path
+
+from frame_sampler import select_evenly
+from frame_features import load_thumbnails
+
+# 해시 방식
+# - dhash : 인접 픽셀 밝기 차이 (빠름, 밝기 변화에 강함)
+# - phash : 저주파 DCT 계수 (느림, 압축/크기 변화에 강함)
+HASH_METHODS = ("dhash", "phash")
+
+# 64비트 해시 기준, 이 거리 이하이면 거의 같은 프레임으로 판단
+DEFAULT_MAX_DISTANCE = 6
+
+# 바이트 값별 1 비트 수
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _dct_matrix(n):
+    """n x n DCT-II 변환 행렬"""
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+def dhash(gray_batch):
+    """
+    dHash 일괄 계산
+
+    Args:
+        gray_batch (np.ndarray): (N, 8, 9) 흑백 이미지 배치
+
+    Returns:
+        np.ndarray: (N, 8) uint8, 이미지당 64비트 해시
+    """
+    gray_batch = np.asarray(gray_batch, dtype=np.int16)
+    bits = gray_batch[:, :, 1:] > gray_batch[:, :, :-1]
+    return np.packbits(bits.reshape(len(bits), -1), axis=1)
+
+
+def phash(gray_batch):
+    """
+    pHash 일괄 계산
+
+    Args:
+        gray_batch (np.ndarray): (N, 32, 32) 흑백 이미지 배치
+
+    Returns:
+        np.ndarray: (N, 8) uint8, 이미지당 64비트 해시
+    """
+    gray_batch = np.asarray(gray_batch, dtype=np.float32)
+    dct = _dct_matrix(gray_batch.shape[1]).astype(np.float32)
+    # 배치 전체에 2차원 DCT 적용: D @ X @ D.T
+    coeffs = np.einsum("ij,njk,lk->nil", dct, gray_batch, dct)
+    low = coeffs[:, :8, :8].reshape(len(coeffs), -1)
+    # 직류 성분을 제외한 중앙값 기준으로 비트 생성
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    return np.packbits(low > median, axis=1)
+
+
+def hash_images(paths, method="dhash"):
+    """이미지 파일들의 지각 해시 계산"""
+    if method not in HASH_METHODS:
+        raise ValueError(f"지원하지 않는 해시 방식입니다: {method}")
+    if method == "dhash":
+        return dhash(load_thumbnails(paths, size=(9, 8), gray=True))
+    return phash(load_thumbnails(paths, size=(32, 32), gray=True))
+
+
+def hamming_matrix(hashes):
+    """(N, 8) 해시 배열의 쌍별 해밍 거리 (N, N)"""
+    hashes = np.asarray(hashes, dtype=np.uint8)
+    xor = hashes[:, None, :] ^ hashes[None, :, :]
+    return _POPCOUNT[xor].sum(axis=2, dtype=np.int32)
+
+
+def group_near_duplicates(hashes, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    시간 순서대로 보면서 앞서 남긴 프레임과 거의 같은 프레임을 묶음
+
+    Args:
+        hashes (np.ndarray): (N, 8) 해시 배열 (시간 순서)
+        max_distance (int): 같은 프레임으로 볼 최대 해밍 거리
+
+    Returns:
+        list: 각 프레임의 대표 프레임 위치 (대표 프레임은 자기 자신)
+    """
+    distances = hamming_matrix(hashes)
+    representatives = []
+    kept = []
+    for i in range(len(distances)):
+        matches = [j for j in kept if distances[i, j] <= max_distance]
+        if matches:
+            representatives.append(matches[0])
+        else:
+            kept.append(i)
+            representatives.append(i)
+    return representatives
+
+
+def _redundant_picks(picks, representatives):
+    """선택된 프레임 중 이미 선택된 프레임과 중복인 개수"""
+    return len(picks) - len({representatives[i] for i in picks})
+
+
+def dedup_frames(saved_frames, output_dir, max_distance=DEFAULT_MAX_DISTANCE, method="dhash"):
+    """
+    후보 프레임에서 거의 같은 프레임 제거
+
+    제거 후 남은 후보에서 다시 고르게 12/9개를 선택하므로
+    중복으로 빠진 자리는 나머지 후보 프레임으로 채워진다.
+
+    Args:
+        saved_frames (list): 추출된 프레임 파일명 리스트 (시간 순서)
+        output_dir (Path): 프레임이 저장된 디렉토리
+        max_distance (int): 같은 프레임으로 볼 최대 해밍 거리
+        method (str): "dhash" 또는 "phash"
+
+    Returns:
+        tuple: (중복 제거된 프레임 파일명 리스트, 리포트 dict)
+    """
+    if not saved_frames:
+        return [], {"candidates": 0, "kept": 0, "dropped": 0, "object_slots_saved": 0, "vqa_slots_saved": 0}
+
+    hashes = hash_images([Path(output_dir) / name for name in saved_frames], method)
+    representatives = group_near_duplicates(hashes, max_distance)
+    unique_frames = [name for i, name in enumerate(saved_frames) if representatives[i] == i]
+
+    # 기존 방식대로 선택했다면 중복으로 낭비됐을 객체/VQA 슬롯 수
+    positions = list(range(len(saved_frames)))
+    report = {
+        "candidates": len(saved_frames),
+        "kept": len(unique_frames),
+        "dropped": len(saved_frames) - len(unique_frames),
+        "object_slots_saved": _redundant_picks(select_evenly(positions, 12), representatives),
+        "vqa_slots_saved": _redundant_picks(select_evenly(positions, 9), representatives),
+    }
+
+    print(f"중복 프레임 제거 ({method}, 거리 ≤ {max_distance}): "
+          f"{report['candidates']}개 → {report['kept']}개 (제거 {report['dropped']}개)")
+    print(f"절감: 객체 이미지 {report['object_slots_saved']}장, VQA(API) 이미지 {report['vqa_slots_saved']}장")
+    return unique_frames, report
@@ -0,0 +1,118 @@
+import numpy as np
+from pathlib import Path
+
+from frame_features import THUMBNAIL_SIZE, color_histograms, load_thumbnails
+
+# 축소 이미지를 가로/세로 이 배수로 평균 내어 배치(구도) 특징으로 사용
+# THUMBNAIL_SIZE (64, 36) → (16, 9)
+LAYOUT_POOL = 4
+
+# 특징별 가중치 (색상 분포 / 배치)
+HISTOGRAM_WEIGHT = 1.0
+LAYOUT_WEIGHT = 1.0
+
+
+def frame_feature_vectors(thumbnails):
+    """
+    프레임 특징 벡터 일괄 계산 (색상 히스토그램 + 축소 이미지)
+
+    Args:
+        thumbnails (np.ndarray): (N, H, W, 3) uint8 BGR 축소 이미지 배치
+
+    Returns:
+        np.ndarray: (N, D) float32 특징 벡터 (유클리드 거리로 비교)
+    """
+    thumbnails = np.asarray(thumbnails)
+    count, height, width = thumbnails.shape[:3]
+    hist = color_histograms(thumbnails)
+
+    # 블록 평균으로 더 작게 축소 (반복문 없이 reshape 로 처리)
+    h, w = height // LAYOUT_POOL, width // LAYOUT_POOL
+    blocks = thumbnails[:, :h * LAYOUT_POOL, :w * LAYOUT_POOL].astype(np.float32)
+    layout = blocks.reshape(count, h, LAYOUT_POOL, w, LAYOUT_POOL, 3).mean(axis=(2, 4))
+    layout = layout.reshape(count, -1) / 255.0
+
+    # 두 특징의 거리 범위가 비슷하도록 크기 보정
+    # (히스토그램 거리는 최대 √2, 축소 이미지 거리는 최대 √D)
+    return np.hstack([
+        hist * HISTOGRAM_WEIGHT,
+        layout * (LAYOUT_WEIGHT / np.sqrt(layout.shape[1])),
+    ]).astype(np.float32)
+
+
+def farthest_point_order(features, count, min_gap=None):
+    """
+    최원점 샘플링(farthest-point sampling)으로 서로 가장 다른 프레임 선택
+
+    이미 고른 프레임들과의 최소 거리가 가장 큰 프레임을 하나씩 추가한다.
+    프레임별 최소 거리를 배열로 유지하므로 O(count × N) 번의 거리 계산이면 된다.
+    고른 프레임의 앞뒤 min_gap 개 후보는 제외하여 한 구간에 몰리지 않게 하고,
+    제외 때문에 더 고를 수 없으면 간격 제한 없이 이어서 고른다.
+
+    Args:
+        features (np.ndarray): (N, D) 특징 벡터 (시간 순서)
+        count (int): 선택할 개수
+        min_gap (int): 선택 프레임 사이 최소 간격 (후보 위치 기준, None 이면 N // (count * 2))
+
+    Returns:
+        list: 선택된 후보 위치 (시간 순서)
+    """
+    features = np.asarray(features, dtype=np.float32)
+    total = len(features)
+    if count >= total:
+        return list(range(total))
+    if count <= 0:
+        return []
+    if min_gap is None:
+        min_gap = total // (count * 2)
+
+    # 시작점: 전체 평균에서 가장 먼 프레임 (가장 특징적인 장면)
+    center = features.mean(axis=0)
+    first = int(np.argmax(((features - center) ** 2).sum(axis=1)))
+
+    min_dist = np.full(total, np.inf, dtype=np.float32)
+    blocked = np.zeros(total, dtype=bool)
+    picked = np.zeros(total, dtype=bool)
+    picks = []
+    current = first
+    while True:
+        picks.append(current)
+        picked[current] = True
+        blocked[max(0, current - min_gap):current + min_gap + 1] = True
+        if len(picks) == count:
+            break
+
+        dist = ((features - features[current]) ** 2).sum(axis=1)
+        np.minimum(min_dist, dist, out=min_dist)
+
+        # 간격 제한을 만족하는 후보가 없으면 선택되지 않은 후보 전체에서 선택
+        candidates = np.where(blocked, -1.0, min_dist)
+        if (candidates < 0).all():
+            candidates = np.where(picked, -1.0, min_dist)
+        current = int(np.argmax(candidates))
+
+    return sorted(picks)
+
+
+def select_diverse(saved_frames, output_dir, counts=(12, 9)):
+    """
+    후보 프레임에서 개수별로 내용이 가장 다양한 프레임 선택
+    (특징은 후보당 한 번만 계산)
+
+    Args:
+        saved_frames (list): 추출된 프레임 파일명 리스트 (시간 순서)
+        output_dir (Path): 프레임이 저장된 디렉토리
+        counts (tuple): 선택할 개수들 (예: 객체 12, VQA 9)
+
+    Returns:
+        dict: {개수: 선택된 프레임 파일명 리스트 (시간 순서)}
+    """
+    if not saved_frames:
+        return {count: [] for count in counts}
+
+    thumbnails = load_thumbnails([Path(output_dir) / name for name in saved_frames], THUMBNAIL_SIZE)
+    features = frame_feature_vectors(thumbnails)
+    return {
+        count: [saved_frames[i] for i in farthest_point_order(features, count)]
+        for count in counts
+    }
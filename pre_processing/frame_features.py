@@ -0,0 +1,79 @@
+import cv2
+import numpy as np
+
+# 분석용 축소 이미지 크기 (가로, 세로)
+THUMBNAIL_SIZE = (64, 36)
+
+
+def make_thumbnail(frame, size=THUMBNAIL_SIZE):
+    """분석용 축소 이미지 생성"""
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def color_histograms(thumbnails, bins=8):
+    """
+    축소 이미지 배치의 색상 히스토그램을 한 번에 계산
+
+    Args:
+        thumbnails (np.ndarray): (N, H, W, 3) uint8 BGR 이미지 배치
+        bins (int): 채널당 구간 수
+
+    Returns:
+        np.ndarray: (N, bins**3) 정규화된 히스토그램 (각 행의 합 = 1)
+    """
+    thumbnails = np.asarray(thumbnails)
+    count = thumbnails.shape[0]
+    if count == 0:
+        return np.zeros((0, bins ** 3), dtype=np.float32)
+
+    # 채널별 구간 번호 → 3차원 구간을 하나의 번호로 합침
+    q = (thumbnails.astype(np.uint16) * bins) >> 8
+    codes = (q[..., 0] * bins + q[..., 1]) * bins + q[..., 2]
+    codes = codes.reshape(count, -1).astype(np.int64)
+
+    # 이미지마다 구간 번호를 겹치지 않게 이동시켜 bincount 한 번으로 처리
+    codes += np.arange(count, dtype=np.int64)[:, None] * bins ** 3
+    hist = np.bincount(codes.ravel(), minlength=count * bins ** 3)
+    hist = hist.reshape(count, bins ** 3).astype(np.float32)
+    return hist / codes.shape[1]
+
+
+def histogram_distances(histograms):
+    """
+    연속한 히스토그램 사이의 거리 (0: 동일, 1: 완전히 다름)
+
+    Args:
+        histograms (np.ndarray): (N, B) 정규화된 히스토그램
+
+    Returns:
+        np.ndarray: (N-1,) 거리
+    """
+    histograms = np.asarray(histograms)
+    if len(histograms) < 2:
+        return np.zeros(0, dtype=np.float32)
+    return 0.5 * np.abs(np.diff(histograms, axis=0)).sum(axis=1)
+
+
+def load_thumbnails(paths, size=THUMBNAIL_SIZE, gray=False):
+    """
+    이미지 파일들을 축소하여 하나의 배치 배열로 로드
+
+    Args:
+        paths (list): 이미지 파일 경로 리스트
+        size (tuple): 축소 크기 (가로, 세로)
+        gray (bool): 흑백으로 로드할지 여부
+
+    Returns:
+        np.ndarray: (N, H, W) 또는 (N, H, W, 3) uint8 배열
+    """
+    # 1/4 축소 디코딩으로 JPEG 로드 비용 절감
+    flag = cv2.IMREAD_REDUCED_GRAYSCALE_4 if gray else cv2.IMREAD_REDUCED_COLOR_4
+    thumbnails = []
+    for path in paths:
+        image = cv2.imread(str(path), flag)
+        if image is None:
+            raise IOError(f"❌ 이미지 읽기 실패: {path}")
+        thumbnails.append(make_thumbnail(image, size))
+
+    shape = (0, size[1], size[0]) if gray else (0, size[1], size[0], 3)
+    return np.stack(thumbnails) if thumbnails else np.zeros(shape, dtype=np.uint8)
@@ -0,0 +1,136 @@
+import os
+import re
+import json
+from pathlib import Path
+
+from file_utils import write_json_atomic
+from video_probe import format_time
+
+# 비디오별 프레임 매니페스트 파일명: {video_stem}_frames.json
+MANIFEST_SUFFIX = "_frames.json"
+
+# {video_stem}_O_12.jpg, {video_stem}_V_3.jpg, {video_stem}_frame_07.jpg
+_IMAGE_NAME_PATTERN = re.compile(r"^(?P<stem>.+)_(?:O|V|frame)_\d+\.\w+$")
+
+
+def manifest_path(output_dir_vo, video_stem):
+    """매니페스트 파일 경로"""
+    return Path(output_dir_vo) / f"{video_stem}{MANIFEST_SUFFIX}"
+
+
+def write_frame_manifest(output_dir_vo, video_stem, video_path, fps, strategy, frame_log):
+    """
+    이미지 파일명 → 원본 프레임 번호/시간 매니페스트 저장
+
+    Args:
+        output_dir_vo (Path): 최종 출력 디렉토리
+        video_stem (str): 비디오 파일명 (확장자 제외)
+        video_path (str): 원본 비디오 경로
+        fps (float): 원본 FPS
+        strategy (str): 샘플링 방식 (interval, uniform, shots 등)
+        frame_log (dict): {이미지 파일명: 프레임 번호}
+
+    Returns:
+        Path: 저장된 매니페스트 경로
+    """
+    data = {
+        "video": os.path.basename(str(video_path)),
+        "fps": fps,
+        "strategy": strategy,
+        # 파일명: [프레임 번호, 시간(초)]
+        "frames": {
+            name: [frame_idx, round(frame_idx / fps, 3) if fps else 0.0]
+            for name, frame_idx in sorted(frame_log.items())
+        },
+    }
+
+    path = manifest_path(output_dir_vo, video_stem)
+    write_json_atomic(path, data, separators=(",", ":"))
+
+    print(f"✅ 프레임 매니페스트 저장 완료: {path} ({len(frame_log)}개)")
+    return path
+
+
+class FrameManifestIndex:
+    """
+    여러 비디오의 프레임 매니페스트 조회
+
+    처음 조회할 때 root 아래 매니페스트 위치를 한 번만 스캔하고,
+    매니페스트 내용은 비디오별로 처음 필요할 때 한 번만 읽는다.
+    이후 이미지 1장당 조회는 dict 조회 두 번이다.
+
+    매니페스트는 root/{category}/{video_name}/ 아래에 있으므로 (category, video_stem) 으로 구분한다.
+    category 없이 조회하면 같은 video_stem 이 한 카테고리에만 있을 때만 찾는다.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._paths = None
+        self._manifests = {}
+        self._ambiguous = set()
+
+    def _scan(self):
+        # video_stem → {category: 매니페스트 경로}
+        self._paths = {}
+        for p in self.root.rglob(f"*{MANIFEST_SUFFIX}"):
+            category = p.relative_to(self.root).parent.parent.as_posix()
+            self._paths.setdefault(p.name[: -len(MANIFEST_SUFFIX)], {})[
+                "" if category == "." else category
+            ] = p
+
+    def _resolve(self, video_stem, category):
+        """조회할 (category, video_stem) 키 (찾을 수 없거나 여러 카테고리에 있으면 None)"""
+        if self._paths is None:
+            self._scan()
+        paths = self._paths.get(video_stem, {})
+        if category is not None:
+            return (category, video_stem) if category in paths else None
+        if len(paths) == 1:
+            return next(iter(paths)), video_stem
+        if len(paths) > 1 and video_stem not in self._ambiguous:
+            self._ambiguous.add(video_stem)
+            print(f"⚠️ 여러 카테고리에 같은 비디오 매니페스트가 있어 카테고리 지정 필요: {video_stem} "
+                  f"({', '.join(sorted(paths))})")
+        return None
+
+    def _load(self, video_stem, category=None):
+        key = self._resolve(video_stem, category)
+        if key is None:
+            return None
+        if key not in self._manifests:
+            with open(self._paths[video_stem][key[0]], "r", encoding="utf-8") as f:
+                self._manifests[key] = json.load(f)
+        return self._manifests[key]
+
+    def lookup(self, image_name, category=None):
+        """
+        이미지 파일명으로 프레임 정보 조회
+
+        Args:
+            image_name (str): 이미지 파일명 또는 경로
+            category (str): 비디오 카테고리 (preset_module.py -c 값, None 이면 비디오명으로만 조회)
+
+        Returns:
+            dict | None: video, strategy, frame_index, timestamp
+        """
+        name = os.path.basename(str(image_name).replace("\\", "/"))
+        match = _IMAGE_NAME_PATTERN.match(name)
+        if not match:
+            return None
+
+        manifest = self._load(match.group("stem"), category)
+        if manifest is None or name not in manifest["frames"]:
+            return None
+
+        frame_idx, timestamp = manifest["frames"][name]
+        return {
+            "video": manifest["video"],
+            "strategy": manifest["strategy"],
+            "frame_index": frame_idx,
+            "timestamp": timestamp,
+        }
+
+    def image_frame(self, image_name, category=None):
+        """템플릿 image_frame 필드 값 ("00:01" 형식, 없으면 빈 문자열)"""
+        info = self.lookup(image_name, category)
+        return format_time(info["timestamp"]) if info else ""
@@ -0,0 +1,221 @@
+import os
+import time
+import queue
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+# 인코딩 스레드 수 기본값 (cv2.imencode 는 GIL 을 놓으므로 스레드로 병렬 처리됨)
+DEFAULT_ENCODE_WORKERS = min(4, os.cpu_count() or 1)
+
+# 진행바 처리량 표시 갱신 간격(초)
+_POSTFIX_INTERVAL = 0.5
+
+_DONE = object()
+
+
+def write_to_destinations(data, paths):
+    """
+    인코딩된 이미지 바이트를 여러 경로에 저장
+    첫 경로에만 실제로 쓰고, 나머지는 가능하면 하드링크로 연결
+
+    Args:
+        data (bytes): 인코딩된 이미지 데이터
+        paths (list): 저장 경로 리스트
+
+    Returns:
+        int: 실제로 디스크에 쓴 바이트 수
+    """
+    first = Path(paths[0])
+    # 기존 파일이 다른 경로와 하드링크되어 있을 수 있으므로 새 파일로 교체
+    if first.exists():
+        first.unlink()
+    with open(first, "wb") as f:
+        f.write(data)
+    written = len(data)
+
+    for path in paths[1:]:
+        path = Path(path)
+        if path.exists():
+            path.unlink()
+        try:
+            os.link(first, path)
+        except OSError:
+            # 하드링크 미지원 파일시스템(FAT, 다른 드라이브 등)이면 복사
+            with open(path, "wb") as f:
+                f.write(data)
+            written += len(data)
+
+    return written
+
+
+def format_stage_rates(stats, workers):
+    """
+    단계별 처리량 문자열 (진행바 표시용)
+    각 단계가 실제로 일한 시간 기준 초당 프레임 수이므로 가장 낮은 값이 병목 단계
+    """
+    def rate(count, busy_sec):
+        return count / busy_sec if busy_sec > 0 else 0.0
+
+    return (
+        f"dec={rate(stats['decoded'], stats['decode_sec']):.0f}/s "
+        f"enc={rate(stats['encoded'], stats['encode_sec'] / workers):.0f}/s "
+        f"wr={rate(stats['written'], stats['write_sec']):.0f}/s"
+    )
+
+
+def run_pipeline(
+    jobs,
+    workers=None,
+    queue_size=None,
+    ext=".jpg",
+    encode_params=None,
+    on_written=None,
+    on_failed=None,
+    pbar=None,
+    variants=None,
+    on_encoded=None,
+    write_files=True,
+):
+    """
+    디코딩 → JPEG 인코딩 → 저장 파이프라인 실행
+
+    - 디코딩: 호출 스레드에서 jobs 를 순회 (VideoCapture 는 한 스레드에서만 사용)
+    - 인코딩: 스레드 풀에서 cv2.imencode
+    - 저장  : 저장 스레드 1개가 jobs 순서대로 기록 (파일명/콜백 순서가 항상 동일)
+
+    저장 대기열이 가득 차면 디코딩이 멈추므로(backpressure) 메모리에 올라가는
+    프레임은 최대 queue_size + 1 장이다.
+
+    Args:
+        jobs (iterable): (key, frame, paths) 를 순서대로 내는 이터러블 (디코딩 시점에 파일명 결정)
+        workers (int): 인코딩 스레드 수 (None 이면 DEFAULT_ENCODE_WORKERS)
+        queue_size (int): 저장 대기 프레임 수 상한 (None 이면 workers * 2)
+        ext (str): 인코딩 확장자
+        encode_params (list): cv2.imencode 파라미터 (예: [cv2.IMWRITE_JPEG_QUALITY, 90])
+        on_written (callable): on_written(key, paths, nbytes), 저장 스레드에서 순서대로 호출
+        on_failed (callable): on_failed(key, paths), 인코딩/저장 실패 시 호출
+        pbar (tqdm): 단계별 처리량을 postfix 로 표시할 진행바
+        variants (dict): 같은 프레임을 다른 크기/화질로 함께 저장 {이름: (encode_fn, paths_fn)}
+            - encode_fn(frame) -> bytes | None (인코딩 스레드에서 호출)
+            - paths_fn(paths) -> 추가 저장 경로 리스트 (빈 리스트면 저장하지 않음)
+        on_encoded (callable): on_encoded(key, paths, data, variant_data), 저장 전에 인코딩 결과를
+            메모리로 넘겨받을 때 사용 (저장 스레드에서 순서대로 호출)
+        write_files (bool): False 면 디스크에 저장하지 않음 (on_encoded 로만 전달, nbytes = 0)
+
+    Returns:
+        dict: decoded, encoded, written, failed, bytes_written, variant_bytes, 단계별 소요 시간(*_sec), elapsed_sec
+    """
+    workers = workers or DEFAULT_ENCODE_WORKERS
+    queue_size = queue_size or workers * 2
+    encode_params = encode_params or []
+    variants = variants or {}
+
+    stats = {
+        "decoded": 0,
+        "encoded": 0,
+        "written": 0,
+        "failed": 0,
+        "bytes_written": 0,
+        "variant_bytes": {name: 0 for name in variants},
+        "decode_sec": 0.0,
+        "encode_sec": 0.0,
+        "write_sec": 0.0,
+    }
+    lock = threading.Lock()
+    pending = queue.Queue(maxsize=queue_size)
+    errors = []
+
+    def encode(frame):
+        start = time.perf_counter()
+        success, buffer = cv2.imencode(ext, frame, encode_params)
+        variant_data = {name: encode_fn(frame) for name, (encode_fn, _) in variants.items()} if success else {}
+        with lock:
+            stats["encode_sec"] += time.perf_counter() - start
+            if success:
+                stats["encoded"] += 1
+        return (buffer.tobytes(), variant_data) if success else (None, {})
+
+    def write():
+        last_postfix = 0.0
+        while True:
+            item = pending.get()
+            if item is _DONE:
+                return
+            if errors:
+                # 오류 이후 항목은 버리고 디코딩 쪽이 멈출 때까지 대기열만 비움
+                continue
+
+            key, paths, future = item
+            try:
+                data, variant_data = future.result()
+                nbytes = None
+                if data is not None and on_encoded:
+                    on_encoded(key, paths, data, variant_data)
+                if data is not None and not write_files:
+                    nbytes = 0
+                elif data is not None:
+                    start = time.perf_counter()
+                    try:
+                        nbytes = write_to_destinations(data, paths)
+                        for name, variant in variant_data.items():
+                            variant_paths = variants[name][1](paths)
+                            if variant is not None and variant_paths:
+                                stats["variant_bytes"][name] += write_to_destinations(variant, variant_paths)
+                    except OSError as e:
+                        print(f"⚠️ 저장 실패: {paths[0]} ({e})")
+                    stats["write_sec"] += time.perf_counter() - start
+
+                if nbytes is None:
+                    stats["failed"] += 1
+                    if on_failed:
+                        on_failed(key, paths)
+                else:
+                    stats["written"] += 1
+                    stats["bytes_written"] += nbytes
+                    if on_written:
+                        on_written(key, paths, nbytes)
+
+                now = time.perf_counter()
+                if pbar is not None and now - last_postfix >= _POSTFIX_INTERVAL:
+                    pbar.set_postfix_str(format_stage_rates(stats, workers), refresh=False)
+                    last_postfix = now
+            except Exception as e:
+                errors.append(e)
+
+    started = time.perf_counter()
+    writer = threading.Thread(target=write, name="frame-writer", daemon=True)
+    writer.start()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frame-encode") as executor:
+        try:
+            iterator = iter(jobs)
+            while not errors:
+                start = time.perf_counter()
+                try:
+                    key, frame, paths = next(iterator)
+                except StopIteration:
+                    break
+                stats["decode_sec"] += time.perf_counter() - start
+                stats["decoded"] += 1
+
+                if write_files:
+                    for path in paths:
+                        Path(path).parent.mkdir(parents=True, exist_ok=True)
+                    for _, paths_fn in variants.values():
+                        for path in paths_fn(paths):
+                            Path(path).parent.mkdir(parents=True, exist_ok=True)
+                # 대기열이 가득 차면 저장 스레드가 따라올 때까지 디코딩 대기
+                pending.put((key, paths, executor.submit(encode, frame)))
+        finally:
+            pending.put(_DONE)
+            writer.join()
+
+    stats["elapsed_sec"] = time.perf_counter() - started
+    if pbar is not None:
+        pbar.set_postfix_str(format_stage_rates(stats, workers))
+    if errors:
+        raise errors[0]
+    return stats
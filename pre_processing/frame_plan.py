@@ -0,0 +1,191 @@
+from pathlib import Path
+
+from frame_sampler import (
+    choose_read_mode,
+    interval_frame_indices,
+    uniform_frame_indices,
+    select_evenly,
+)
+from shot_detection import DEFAULT_ANALYSIS_BUDGET, detect_shots, spread_picks_across_shots
+from frame_pipeline import run_pipeline
+from frame_profiles import BASE_PROFILE, profile_variants
+from decoders import get_decoder
+
+# 샘플링 방식
+# - interval : extract_frames_from_video 와 동일 (2초 간격)
+# - uniform  : extract_45_frames_from_video 와 동일 (영상 전체 균등 분할)
+# - shots    : 샷 경계 검출 후 후보/객체/VQA 프레임을 샷 전체에 분산
+SAMPLING_MODES = ("interval", "uniform", "shots")
+
+
+def build_frame_plan(
+    video_path,
+    output_dir,
+    output_dir_vo,
+    num_frames=45,
+    sampling="interval",
+    keep_extracted=False,
+    shot_budget=DEFAULT_ANALYSIS_BUDGET,
+    decoder="opencv",
+):
+    """
+    프레임 추출 계획 생성
+    extracted / _O_n / _V_n 각 소비처가 필요로 하는 프레임 번호의 합집합을 미리 계산
+
+    Args:
+        video_path (str): 비디오 파일 경로
+        output_dir (Path): 추출 프레임 저장 디렉토리 (keep_extracted 일 때만 사용)
+        output_dir_vo (Path): 최종 출력 디렉토리 (_O_, _V_ 이미지)
+        num_frames (int): 후보 프레임 수
+        sampling (str): "interval", "uniform", "shots" 중 하나
+        keep_extracted (bool): extracted_frames 폴더에도 후보 프레임 전체를 저장할지 여부
+        shot_budget (int): shots 방식에서 샷 검출에 분석할 프레임 수 상한
+        decoder (str): 영상 정보 확인 / 샷 검출에 쓸 디코더 백엔드 (execute_frame_plan 과 같은 값)
+
+    Returns:
+        dict: 프레임 계획
+            - frame_indices: 디코딩할 프레임 번호 (오름차순)
+            - destinations: {프레임 번호: [저장 경로, ...]}
+            - saved_frames, image_object_filenames, image_V_map: 기존 함수와 동일한 구조
+              (saved_frames 는 keep_extracted 가 아니어서 파일을 저장하지 않아도 후보 프레임 파일명 전체)
+            - candidate_indices: saved_frames 순서의 후보 프레임 번호
+            - frame_log: {파일명: 프레임 번호} (실제로 저장하는 파일만)
+    """
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"지원하지 않는 샘플링 방식입니다: {sampling}")
+
+    # 프레임 번호 기준이 실행 단계와 같도록 같은 디코더로 영상 정보 확인
+    with get_decoder(decoder, video_path) as video_decoder:
+        fps = video_decoder.fps
+        frame_count = video_decoder.frame_count
+
+    shots = None
+    if sampling == "shots":
+        shots = detect_shots(video_path, budget=shot_budget, decoder=decoder)["shots"]
+        candidates = spread_picks_across_shots(shots, num_frames)
+        selected_12 = spread_picks_across_shots(shots, 12)
+        selected_9 = spread_picks_across_shots(shots, 9)
+    else:
+        if sampling == "interval":
+            candidates = list(interval_frame_indices(fps, frame_count)[:max(0, num_frames)])
+        else:
+            candidates = list(uniform_frame_indices(frame_count, num_frames))
+        selected_12 = select_evenly(candidates, 12)
+        selected_9 = select_evenly(candidates, 9)
+
+    video_stem = Path(video_path).stem
+    output_dir = Path(output_dir)
+    output_dir_vo = Path(output_dir_vo)
+
+    saved_frames = [f"{video_stem}_frame_{i+1:02}.jpg" for i in range(len(candidates))]
+
+    image_object_filenames = [f"{video_stem}_O_{i+1}.jpg" for i in range(len(selected_12))]
+    image_V_map = {f"image_VQA_{i+1:02}": f"{video_stem}_V_{i+1}.jpg" for i in range(len(selected_9))}
+
+    # 프레임 번호별 저장 경로
+    destinations = {}
+    if keep_extracted:
+        for frame_idx, name in zip(candidates, saved_frames):
+            destinations.setdefault(frame_idx, []).append(output_dir / name)
+    for frame_idx, name in zip(selected_12, image_object_filenames):
+        destinations.setdefault(frame_idx, []).append(output_dir_vo / name)
+    for frame_idx, name in zip(selected_9, image_V_map.values()):
+        destinations.setdefault(frame_idx, []).append(output_dir_vo / name)
+
+    # 파일명 → 원본 프레임 번호 (프레임 매니페스트용)
+    frame_log = {Path(path).name: frame_idx for frame_idx, paths in destinations.items() for path in paths}
+
+    return {
+        "video_path": str(video_path),
+        "output_dir_vo": output_dir_vo,
+        "fps": fps,
+        "frame_count": frame_count,
+        "sampling": sampling,
+        "shots": shots,
+        "frame_indices": sorted(destinations),
+        "destinations": destinations,
+        "saved_frames": saved_frames,
+        "candidate_indices": list(candidates),
+        "keep_extracted": keep_extracted,
+        "image_object_filenames": image_object_filenames,
+        "image_V_map": image_V_map,
+        "frame_log": frame_log,
+    }
+
+
+def execute_frame_plan(
+    plan, read_mode="auto", workers=None, profiles=None, keep_in_memory=None, write_files=True, decoder="opencv"
+):
+    """
+    프레임 계획 실행: 필요한 프레임만 한 번씩 디코딩/인코딩하여 모든 경로에 저장
+    (디코딩/인코딩/저장은 frame_pipeline 으로 병렬 처리)
+
+    Args:
+        plan (dict): build_frame_plan 결과
+        read_mode (str): "auto", "seek", "sequential" 중 하나
+        workers (int): 인코딩 스레드 수 (None 이면 기본값)
+        profiles (list): 추가 추출 프로파일 이름, _O_/_V_ 이미지를 같은 디코딩에서 profiles/<이름>/ 에도 저장
+        keep_in_memory (list): 인코딩 결과를 메모리로도 돌려받을 파일명 (예: _V_ 이미지)
+        write_files (bool): False 면 디스크에 저장하지 않고 메모리로만 전달
+        decoder (str): 디코더 백엔드 ("opencv", "ffmpeg", "pyav", "auto")
+
+    Returns:
+        dict: 실행 결과 (written_files, bytes_written, failed_frames,
+            images: {파일명: {프로파일명: JPEG 바이트}} - keep_in_memory 로 지정한 파일만)
+    """
+    frame_indices = plan["frame_indices"]
+    read_mode = choose_read_mode(frame_indices, read_mode)
+    print(f"프레임 계획 실행: {len(frame_indices)}개 프레임 디코딩, 읽기 모드: {read_mode}")
+
+    written_files = 0
+    failed_frames = []
+    keep_in_memory = set(keep_in_memory or [])
+    images = {}
+
+    def decode():
+        video_decoder = get_decoder(decoder, plan["video_path"], read_mode)
+        try:
+            for frame_idx, success, frame in video_decoder.read_frames(frame_indices):
+                if not success:
+                    print(f"❌ 프레임 읽기 실패 (frame {frame_idx})")
+                    failed_frames.append(frame_idx)
+                    continue
+                yield frame_idx, frame, plan["destinations"][frame_idx]
+        finally:
+            video_decoder.close()
+
+    def on_encoded(frame_idx, paths, data, variant_data):
+        for path in paths:
+            if Path(path).name in keep_in_memory:
+                images[Path(path).name] = {BASE_PROFILE: data, **variant_data}
+
+    def on_written(frame_idx, paths, nbytes):
+        nonlocal written_files
+        names = ", ".join(Path(p).name for p in paths)
+        if write_files:
+            written_files += len(paths)
+            print(f"✅ 저장 완료: {names} (시간: {frame_idx/plan['fps']:.1f}초)")
+        else:
+            print(f"✅ 인코딩 완료 (메모리): {names} (시간: {frame_idx/plan['fps']:.1f}초)")
+
+    def on_failed(frame_idx, paths):
+        print(f"❌ 프레임 인코딩/저장 실패 (frame {frame_idx})")
+        failed_frames.append(frame_idx)
+
+    stats = run_pipeline(
+        decode(),
+        workers=workers,
+        on_written=on_written,
+        on_failed=on_failed,
+        variants=profile_variants(profiles or [], plan["output_dir_vo"]),
+        on_encoded=on_encoded if keep_in_memory else None,
+        write_files=write_files,
+    )
+
+    print(f"프레임 계획 실행 완료: 파일 {written_files}개, {stats['bytes_written']/1024:.1f}KB 기록")
+    return {
+        "written_files": written_files,
+        "bytes_written": stats["bytes_written"],
+        "failed_frames": sorted(failed_frames),
+        "images": images,
+    }
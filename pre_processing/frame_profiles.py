@@ -0,0 +1,236 @@
+import os
+import json
+import math
+import shutil
+from pathlib import Path
+
+import cv2
+
+# 추출 프로파일 (max_side: 긴 변 최대 픽셀, None 이면 원본 크기 / quality: JPEG 화질)
+# - labeling : 라벨링용 원본 (기존 출력 파일 그대로, OpenCV 기본 화질 95)
+# - llm      : Gemini 전송용 (긴 변 768 = 타일 1장)
+# - llm_small: 토큰 예산이 작을 때 (긴 변 384 이하 = 이미지당 258 토큰)
+EXTRACTION_PROFILES = {
+    "labeling": {"max_side": None, "quality": 95},
+    "llm": {"max_side": 768, "quality": 80},
+    "llm_small": {"max_side": 384, "quality": 75},
+}
+
+# 원본 프로파일 (별도 폴더 없이 출력 폴더의 파일 자체)
+BASE_PROFILE = "labeling"
+
+# 추가 프로파일 저장 위치: {output_dir}/profiles/{프로파일명}/
+PROFILES_DIR = "profiles"
+PROFILES_MANIFEST = "profiles.json"
+
+# Gemini 이미지 토큰 계산 기준
+# 가로/세로 모두 384 이하면 258 토큰, 그보다 크면 768x768 타일당 258 토큰
+TOKENS_PER_TILE = 258
+TILE_SIZE = 768
+SMALL_IMAGE_SIDE = 384
+
+# 한 번 호출에 보낼 이미지 전체 토큰 예산 (환경변수로 변경 가능)
+DEFAULT_TOKEN_BUDGET = int(os.getenv("LLM_IMAGE_TOKEN_BUDGET", "4000"))
+
+
+def profile_size(width, height, max_side):
+    """프로파일 적용 후 이미지 크기 (가로, 세로)"""
+    if not max_side or max(width, height) <= max_side:
+        return width, height
+    scale = max_side / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def encode_frame(frame, profile):
+    """
+    프레임을 프로파일 크기/화질로 JPEG 인코딩
+
+    Returns:
+        bytes | None: 인코딩 결과 (실패 시 None)
+    """
+    height, width = frame.shape[:2]
+    size = profile_size(width, height, profile["max_side"])
+    if size != (width, height):
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    success, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, profile["quality"]])
+    return buffer.tobytes() if success else None
+
+
+def estimate_image_tokens(width, height):
+    """이미지 1장의 Gemini 입력 토큰 수 추정"""
+    if width <= SMALL_IMAGE_SIDE and height <= SMALL_IMAGE_SIDE:
+        return TOKENS_PER_TILE
+    return math.ceil(width / TILE_SIZE) * math.ceil(height / TILE_SIZE) * TOKENS_PER_TILE
+
+
+def jpeg_size(data):
+    """
+    JPEG 바이트의 (가로, 세로) 를 헤더(SOF 마커)에서 읽음 (디코딩 없음)
+
+    Returns:
+        tuple | None: (가로, 세로), JPEG 가 아니면 None
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+    pos = 2
+    while pos + 9 < len(data):
+        if data[pos] != 0xFF:
+            pos += 1
+            continue
+        marker = data[pos + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            pos += 1 if marker == 0xFF else 2
+            continue
+        length = int.from_bytes(data[pos + 2:pos + 4], "big")
+        # SOF0~SOF15 (DHT=C4, JPG=C8, DAC=CC 제외)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[pos + 5:pos + 7], "big")
+            width = int.from_bytes(data[pos + 7:pos + 9], "big")
+            return width, height
+        pos += 2 + length
+    return None
+
+
+def validate_profiles(names):
+    """프로파일 이름 확인 (원본 프로파일 제외한 리스트 반환)"""
+    for name in names:
+        if name not in EXTRACTION_PROFILES:
+            raise ValueError(f"지원하지 않는 추출 프로파일입니다: {name}")
+    return [name for name in names if name != BASE_PROFILE]
+
+
+def profile_dir(base_dir, name):
+    """프로파일별 이미지 폴더 (원본 프로파일은 base_dir 자체)"""
+    if name == BASE_PROFILE:
+        return Path(base_dir)
+    return Path(base_dir) / PROFILES_DIR / name
+
+
+def profile_variants(names, base_dir):
+    """
+    frame_pipeline.run_pipeline 의 variants 인자 생성
+    base_dir 에 저장되는 파일만 같은 이름으로 프로파일 폴더에 함께 저장
+
+    Args:
+        names (list): 추가 프로파일 이름 리스트
+        base_dir (Path): 원본 이미지 폴더
+    """
+    base_dir = Path(base_dir)
+
+    def make_variant(name):
+        profile = EXTRACTION_PROFILES[name]
+        target_dir = profile_dir(base_dir, name)
+
+        def paths_fn(paths):
+            return [target_dir / Path(p).name for p in paths if Path(p).parent == base_dir]
+
+        return (lambda frame: encode_frame(frame, profile)), paths_fn
+
+    return {name: make_variant(name) for name in validate_profiles(names)}
+
+
+def copy_profile_images(names, src_dir, src_name, dst_dir, dst_name):
+    """원본 이미지를 복사할 때 프로파일 이미지도 같은 이름으로 복사"""
+    for name in validate_profiles(names):
+        src_path = profile_dir(src_dir, name) / src_name
+        if not src_path.exists():
+            continue
+        dst_path = profile_dir(dst_dir, name) / dst_name
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(src_path, dst_path)
+
+
+def profile_entries(names, width, height):
+    """
+    프로파일별 이미지 크기/예상 토큰 수
+
+    Args:
+        names (list): 추가 프로파일 이름 리스트 (원본 프로파일은 항상 포함)
+        width (int): 원본 가로 크기
+        height (int): 원본 세로 크기
+
+    Returns:
+        dict: {프로파일명: {dir, max_side, quality, width, height, tokens_per_image}}
+    """
+    manifest = {}
+    for name in [BASE_PROFILE] + validate_profiles(names):
+        profile = EXTRACTION_PROFILES[name]
+        w, h = profile_size(width, height, profile["max_side"])
+        manifest[name] = {
+            "dir": "." if name == BASE_PROFILE else f"{PROFILES_DIR}/{name}",
+            "max_side": profile["max_side"],
+            "quality": profile["quality"],
+            "width": w,
+            "height": h,
+            "tokens_per_image": estimate_image_tokens(w, h),
+        }
+    return manifest
+
+
+def write_profiles_manifest(base_dir, names, width, height):
+    """프로파일별 이미지 크기/예상 토큰 수 저장 ({base_dir}/profiles/profiles.json)"""
+    manifest = profile_entries(names, width, height)
+    path = Path(base_dir) / PROFILES_DIR / PROFILES_MANIFEST
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_profiles_manifest(base_dir):
+    """프로파일 매니페스트 로드 (없으면 None)"""
+    path = Path(base_dir) / PROFILES_DIR / PROFILES_MANIFEST
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def rank_profiles(entries, image_count, token_budget=None):
+    """
+    토큰 예산 안에서 가장 큰(화질이 좋은) 프로파일 선택
+    예산을 맞추는 프로파일이 없으면 토큰이 가장 적은 프로파일
+
+    Args:
+        entries (dict): profile_entries 결과 또는 profiles.json 내용
+        image_count (int): 전송할 이미지 수
+        token_budget (int): 이미지 전체 토큰 예산 (None 이면 DEFAULT_TOKEN_BUDGET)
+
+    Returns:
+        tuple: (프로파일 이름, 프로파일 정보)
+    """
+    token_budget = DEFAULT_TOKEN_BUDGET if token_budget is None else token_budget
+
+    # 토큰 수(같으면 픽셀 수, 화질)가 큰 순서
+    ranked = sorted(
+        entries.items(),
+        key=lambda item: (
+            item[1]["tokens_per_image"],
+            item[1]["width"] * item[1]["height"],
+            item[1]["quality"],
+        ),
+        reverse=True,
+    )
+    fitting = [item for item in ranked if item[1]["tokens_per_image"] * image_count <= token_budget]
+    return fitting[0] if fitting else ranked[-1]
+
+
+def choose_profile(base_dir, image_count, token_budget=None):
+    """
+    출력 폴더의 profiles.json 기준으로 토큰 예산에 맞는 프로파일 선택 (rank_profiles)
+
+    Args:
+        base_dir (str): 원본 이미지 폴더
+        image_count (int): 전송할 이미지 수
+        token_budget (int): 이미지 전체 토큰 예산 (None 이면 DEFAULT_TOKEN_BUDGET)
+
+    Returns:
+        tuple: (프로파일 이름, 이미지 폴더 경로, 예상 토큰 수)
+    """
+    manifest = load_profiles_manifest(base_dir)
+    if not manifest:
+        return BASE_PROFILE, str(base_dir), None
+
+    name, info = rank_profiles(manifest, image_count, token_budget)
+    return name, str(Path(base_dir) / info["dir"]), info["tokens_per_image"] * image_count
@@ -0,0 +1,155 @@
+import numpy as np
+from pathlib import Path
+
+from frame_features import load_thumbnails
+
+# 품질 분석용 흑백 축소 이미지 크기 (가로, 세로)
+# 흐림 판단에 필요한 윤곽이 남도록 frame_features 기본 크기보다 크게
+QUALITY_THUMBNAIL_SIZE = (160, 90)
+
+# 평균 밝기가 이 값 이하이면 검은 프레임 (0~255)
+BLACK_LUMA = 16
+
+# 선명도(라플라시안 분산)가 후보 프레임 중앙값의 이 비율 미만이면 흐린 프레임
+BLUR_RATIO = 0.2
+
+# 앞뒤 프레임보다 대비가 이 비율 미만으로 떨어지고
+# 밝기가 FADE_LUMA_DELTA 이상 달라졌으면 페이드 중인 프레임
+FADE_CONTRAST_RATIO = 0.5
+FADE_LUMA_DELTA = 20
+
+# 제외 사유
+REJECT_REASONS = ("black", "blur", "fade")
+
+
+def laplacian_variance(gray_batch):
+    """
+    라플라시안 분산(선명도) 일괄 계산
+
+    Args:
+        gray_batch (np.ndarray): (N, H, W) 흑백 이미지 배치
+
+    Returns:
+        np.ndarray: (N,) 이미지별 라플라시안 분산 (작을수록 흐림)
+    """
+    gray = np.asarray(gray_batch, dtype=np.float32)
+    if gray.shape[0] == 0:
+        return np.zeros(0, dtype=np.float32)
+    # 4-이웃 라플라시안 커널을 배치 전체에 한 번에 적용 (테두리 1픽셀 제외)
+    lap = (
+        gray[:, :-2, 1:-1] + gray[:, 2:, 1:-1] + gray[:, 1:-1, :-2] + gray[:, 1:-1, 2:]
+        - 4 * gray[:, 1:-1, 1:-1]
+    )
+    return lap.reshape(len(lap), -1).var(axis=1)
+
+
+def frame_metrics(gray_batch):
+    """
+    품질 지표 일괄 계산
+
+    Args:
+        gray_batch (np.ndarray): (N, H, W) 흑백 이미지 배치 (시간 순서)
+
+    Returns:
+        dict: sharpness, luma, contrast - 각각 (N,) 배열
+    """
+    gray = np.asarray(gray_batch, dtype=np.float32)
+    flat = gray.reshape(len(gray), -1)
+    return {
+        "sharpness": laplacian_variance(gray),
+        "luma": flat.mean(axis=1) if len(flat) else np.zeros(0, dtype=np.float32),
+        "contrast": flat.std(axis=1) if len(flat) else np.zeros(0, dtype=np.float32),
+    }
+
+
+def classify_frames(metrics):
+    """
+    지표로 제외 사유 판단
+
+    - black: 평균 밝기 BLACK_LUMA 이하
+    - blur : 선명도가 후보 중앙값 × BLUR_RATIO 미만 (해상도/영상마다 기준이 달라 상대값 사용)
+    - fade : 앞뒤 프레임보다 대비가 크게 떨어지고 밝기가 크게 바뀐 프레임 (페이드 인/아웃 중간)
+
+    Args:
+        metrics (dict): frame_metrics 결과
+
+    Returns:
+        list: 프레임별 제외 사유 리스트 (빈 리스트면 사용 가능)
+    """
+    sharpness = metrics["sharpness"]
+    luma = metrics["luma"]
+    contrast = metrics["contrast"]
+    count = len(luma)
+    if count == 0:
+        return []
+
+    black = luma <= BLACK_LUMA
+    # 검은 프레임은 선명도 기준에서 제외 (중앙값이 낮아지지 않도록)
+    reference = np.median(sharpness[~black]) if (~black).any() else 0.0
+    blur = ~black & (sharpness < reference * BLUR_RATIO)
+
+    # 앞뒤 프레임 (처음/마지막은 한쪽만)
+    prev_contrast = np.concatenate([contrast[:1], contrast[:-1]])
+    next_contrast = np.concatenate([contrast[1:], contrast[-1:]])
+    prev_luma = np.concatenate([luma[:1], luma[:-1]])
+    next_luma = np.concatenate([luma[1:], luma[-1:]])
+    neighbor_contrast = np.maximum(prev_contrast, next_contrast)
+    luma_shift = np.maximum(np.abs(luma - prev_luma), np.abs(luma - next_luma))
+    fade = (
+        ~black
+        & (contrast < neighbor_contrast * FADE_CONTRAST_RATIO)
+        & (luma_shift >= FADE_LUMA_DELTA)
+    )
+
+    reasons = []
+    for i in range(count):
+        reasons.append([name for name, flags in zip(REJECT_REASONS, (black, blur, fade)) if flags[i]])
+    return reasons
+
+
+def filter_quality(saved_frames, output_dir, min_keep=12):
+    """
+    후보 프레임에서 검은/흐린/페이드 중인 프레임 제거
+
+    제거 후 남은 후보에서 12/9개를 고르므로 빠진 자리는 나머지 후보로 채워진다.
+    남은 프레임이 min_keep 개 미만이면 제외된 프레임 중 선명한 순서로 되살린다
+    (어두운 영상 등에서 선택할 프레임이 모자라지 않도록).
+
+    Args:
+        saved_frames (list): 추출된 프레임 파일명 리스트 (시간 순서)
+        output_dir (Path): 프레임이 저장된 디렉토리
+        min_keep (int): 최소로 남길 프레임 수
+
+    Returns:
+        tuple: (사용 가능한 프레임 파일명 리스트, 리포트 dict)
+    """
+    report = {"candidates": len(saved_frames), "kept": 0, "dropped": 0, "restored": 0, "rejected": {}}
+    if not saved_frames:
+        return [], report
+
+    gray = load_thumbnails([Path(output_dir) / name for name in saved_frames], QUALITY_THUMBNAIL_SIZE, gray=True)
+    metrics = frame_metrics(gray)
+    reasons = classify_frames(metrics)
+
+    usable = [not r for r in reasons]
+    shortfall = min(min_keep, len(saved_frames)) - sum(usable)
+    if shortfall > 0:
+        rejected = [i for i, ok in enumerate(usable) if not ok]
+        for i in sorted(rejected, key=lambda i: -metrics["sharpness"][i])[:shortfall]:
+            usable[i] = True
+        report["restored"] = shortfall
+
+    kept_frames = [name for name, ok in zip(saved_frames, usable) if ok]
+    report["kept"] = len(kept_frames)
+    report["dropped"] = len(saved_frames) - len(kept_frames)
+    report["rejected"] = {
+        name: reasons[i] for i, name in enumerate(saved_frames) if not usable[i]
+    }
+
+    print(f"품질 필터: {report['candidates']}개 → {report['kept']}개 (제거 {report['dropped']}개)")
+    for i, name in enumerate(saved_frames):
+        if reasons[i]:
+            status = "제외" if not usable[i] else "부족하여 유지"
+            print(f"  - {name}: {', '.join(reasons[i])} ({status}, 선명도 {metrics['sharpness'][i]:.1f}, "
+                  f"밝기 {metrics['luma'][i]:.1f}, 대비 {metrics['contrast'][i]:.1f})")
+    return kept_frames, report
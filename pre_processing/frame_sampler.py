@@ -0,0 +1,128 @@
+import cv2
+
+# 읽기 모드
+# - seek       : 프레임마다 CAP_PROP_POS_FRAMES 로 이동 후 read (키프레임부터 다시 디코딩)
+# - sequential : 스트림을 한 번만 순차 탐색, 건너뛸 프레임은 grab(), 저장할 프레임만 retrieve()
+# - auto       : 샘플링 간격(밀도)에 따라 위 두 방식 중 자동 선택
+READ_MODES = ("auto", "seek", "sequential")
+
+# 평균 샘플링 간격이 이 값(프레임) 이하이면 순차 탐색이 더 빠름
+# 방송 영상의 GOP 길이(대략 1~10초)를 고려한 기준값
+SEQUENTIAL_MAX_STRIDE = 300
+
+# interval 샘플링 간격 (초)
+INTERVAL_SEC = 2
+
+
+def choose_read_mode(frame_indices, mode="auto"):
+    """
+    샘플링 밀도에 따라 읽기 모드 결정
+
+    Args:
+        frame_indices (Sequence[int]): 읽을 프레임 번호 (오름차순)
+        mode (str): "auto", "seek", "sequential" 중 하나
+
+    Returns:
+        str: "seek" 또는 "sequential"
+    """
+    if mode not in READ_MODES:
+        raise ValueError(f"지원하지 않는 읽기 모드입니다: {mode}")
+    if mode != "auto":
+        return mode
+
+    if len(frame_indices) < 2:
+        return "seek"
+
+    # 평균 간격 계산
+    stride = (frame_indices[-1] - frame_indices[0]) / (len(frame_indices) - 1)
+    return "sequential" if stride <= SEQUENTIAL_MAX_STRIDE else "seek"
+
+
+def iter_frames(cap, frame_indices, mode="auto"):
+    """
+    지정된 프레임 번호들을 순서대로 읽어 반환하는 제너레이터
+
+    호출 측이 중간에 반복을 멈추면 남은 프레임은 디코딩하지 않는다.
+
+    Args:
+        cap (cv2.VideoCapture): 열린 비디오 캡처 객체 (처음 위치)
+        frame_indices (Sequence[int]): 읽을 프레임 번호 (오름차순)
+        mode (str): "auto", "seek", "sequential" 중 하나
+
+    Yields:
+        tuple: (frame_idx, success, frame)
+    """
+    mode = choose_read_mode(frame_indices, mode)
+
+    if mode == "seek":
+        for frame_idx in frame_indices:
+            # 현재 프레임 위치를 frame_idx로 설정
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            success, frame = cap.read()
+            yield frame_idx, success, frame
+        return
+
+    # 순차 탐색: 현재 디코딩 위치
+    pos = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    exhausted = False
+
+    for frame_idx in frame_indices:
+        if exhausted:
+            yield frame_idx, False, None
+            continue
+
+        if frame_idx < pos:
+            # 이미 지나간 프레임은 seek 으로 처리
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            pos = frame_idx
+
+        # 건너뛸 프레임은 grab() 만 수행 (색변환/복사 생략)
+        while pos < frame_idx:
+            if not cap.grab():
+                exhausted = True
+                break
+            pos += 1
+
+        if exhausted or not cap.grab():
+            exhausted = True
+            yield frame_idx, False, None
+            continue
+        pos += 1
+
+        success, frame = cap.retrieve()
+        yield frame_idx, success, frame
+
+
+def interval_frame_indices(fps, frame_count, interval_sec=INTERVAL_SEC):
+    """interval_sec 초 간격 샘플링 프레임 번호 (영상 끝까지)"""
+    frame_interval = int(fps * interval_sec)
+    return range(0, frame_count, frame_interval)
+
+
+def uniform_frame_indices(frame_count, num_frames):
+    """영상 전체에 고르게 분포한 num_frames 개 샘플링 프레임 번호"""
+    step = max(1, int(frame_count / num_frames))
+    return range(0, frame_count, step)[:max(0, num_frames)]
+
+
+def select_evenly(items, count):
+    """
+    순서를 유지하면서 전체에 고르게 분포하도록 count 개 선택
+    (앞, 중간, 뒤 프레임 모두 포함)
+
+    Args:
+        items (Sequence): 후보 리스트
+        count (int): 선택할 개수
+
+    Returns:
+        list: 선택된 항목 리스트 (후보가 count 개 미만이면 전체)
+    """
+    if len(items) < count:
+        return list(items)
+
+    step = len(items) // count
+    selected_indices = [i * step for i in range(count)]
+    # 마지막 프레임이 빠질 수 있으므로 마지막 인덱스 조정
+    if selected_indices[-1] >= len(items):
+        selected_indices[-1] = len(items) - 1
+    return [items[i] for i in selected_indices]
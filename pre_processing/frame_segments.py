@@ -0,0 +1,113 @@
+import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from frame_pipeline import run_pipeline
+from decoders import get_decoder, resolve_decoder
+
+# 구간(프로세스)마다 사용할 JPEG 인코딩 스레드 수
+# 프로세스 수만큼 디코딩이 병렬이므로 인코딩 스레드는 적게 둔다
+SEGMENT_ENCODE_WORKERS = 2
+
+
+def split_segments(items, num_segments):
+    """
+    순서를 유지하면서 items 를 num_segments 개의 연속 구간으로 분할
+    (구간 크기 차이는 최대 1)
+
+    Returns:
+        list: 구간별 리스트 (빈 구간은 제외)
+    """
+    num_segments = max(1, min(num_segments, len(items)))
+    size, extra = divmod(len(items), num_segments)
+    segments = []
+    start = 0
+    for i in range(num_segments):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            segments.append(list(items[start:end]))
+        start = end
+    return segments
+
+
+def _extract_segment(video_path, jobs, encode_workers, decoder="opencv"):
+    """
+    구간 1개 추출 (워커 프로세스에서 실행)
+    opencv 는 구간 첫 프레임으로 한 번 이동(키프레임 기준 seek)한 뒤 끝까지 순차 디코딩,
+    ffmpeg / pyav 는 프레임 번호를 처음부터 세야 하므로 영상 처음부터 디코딩
+
+    Args:
+        video_path (str): 비디오 파일 경로
+        jobs (list): [(frame_idx, 저장 경로), ...] 프레임 번호 오름차순
+        encode_workers (int): 인코딩 스레드 수
+        decoder (str): 디코더 백엔드 (resolve_decoder 로 확정된 이름)
+
+    Returns:
+        list: [(frame_idx, 파일명, 성공 여부), ...] jobs 순서
+    """
+    paths = dict(jobs)
+    saved = set()
+
+    with get_decoder(decoder, video_path, "sequential") as video_decoder:
+        if video_decoder.name == "opencv":
+            video_decoder.cap.set(cv2.CAP_PROP_POS_FRAMES, jobs[0][0])
+
+        def decode():
+            for frame_idx, success, frame in video_decoder.read_frames([idx for idx, _ in jobs]):
+                if success:
+                    yield frame_idx, frame, [paths[frame_idx]]
+
+        def on_written(frame_idx, written_paths, nbytes):
+            saved.add(frame_idx)
+
+        run_pipeline(decode(), workers=encode_workers, on_written=on_written)
+
+    return [(idx, Path(path).name, idx in saved) for idx, path in jobs]
+
+
+def extract_segments(video_path, frame_indices, file_names, out_dir, segments=None, pbar=None, decoder="opencv"):
+    """
+    긴 영상을 N개 시간 구간으로 나누어 프로세스별로 동시에 프레임 추출
+
+    파일명은 전체 프레임 목록 기준으로 미리 정해지므로(전역 번호)
+    구간 수와 상관없이 항상 같은 파일명/순서가 나온다.
+
+    Args:
+        video_path (str): 비디오 파일 경로
+        frame_indices (list): 추출할 프레임 번호 (오름차순)
+        file_names (list): 프레임 번호별 저장 파일명 (frame_indices 와 같은 길이)
+        out_dir (Path): 저장 폴더
+        segments (int): 구간(프로세스) 수 (None 이면 CPU 코어 수)
+        pbar (tqdm): 구간이 끝날 때마다 추출한 프레임 수만큼 갱신할 진행바
+        decoder (str): 디코더 백엔드 ("opencv", "ffmpeg", "pyav", "auto")
+
+    Returns:
+        list: [(frame_idx, 파일명, 성공 여부), ...] 프레임 번호 순서
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(idx, str(out_dir / name)) for idx, name in zip(frame_indices, file_names)]
+    if not jobs:
+        return []
+
+    # 설치 여부는 워커마다 확인하지 않도록 한 번만
+    decoder = resolve_decoder(decoder)
+    chunks = split_segments(jobs, segments or os.cpu_count() or 1)
+    print(f"구간 병렬 추출: {len(jobs)}개 프레임, {len(chunks)}개 구간")
+
+    results = [None] * len(chunks)
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        futures = {
+            executor.submit(_extract_segment, str(video_path), chunk, SEGMENT_ENCODE_WORKERS, decoder): i
+            for i, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            if pbar is not None:
+                pbar.update(len(results[i]))
+
+    # 구간 순서대로 합치면 전체 프레임 번호 순서
+    return [item for segment in results for item in segment]
@@ -0,0 +1,139 @@
+import math
+
+import cv2
+import numpy as np
+
+# 격자(contact sheet) 1장에 넣을 이미지 수 (가로 × 세로)
+GRID_COLUMNS = 3
+GRID_ROWS = 3
+
+# 격자 이미지 크기 (가로, 세로)
+# 1536x864 = 768 타일 2×2 = 258 × 4 토큰 (16:9 이미지 9장을 따로 보내면 최소 258 × 9 토큰)
+GRID_SHEET_SIZE = (1536, 864)
+GRID_JPEG_QUALITY = 85
+
+# 칸 사이 간격 / 배경색 (BGR)
+GRID_GAP = 4
+GRID_BACKGROUND = (0, 0, 0)
+
+
+def grid_layout(image_count, columns=GRID_COLUMNS, rows=GRID_ROWS):
+    """
+    이미지별 격자 위치
+
+    Args:
+        image_count (int): 이미지 개수
+        columns (int): 격자 1장의 가로 칸 수
+        rows (int): 격자 1장의 세로 칸 수
+
+    Returns:
+        list: 이미지 순서대로 (격자 번호, 행, 열) - 모두 0부터
+    """
+    per_sheet = columns * rows
+    return [(i // per_sheet, (i % per_sheet) // columns, i % columns) for i in range(image_count)]
+
+
+def sheet_count(image_count, columns=GRID_COLUMNS, rows=GRID_ROWS):
+    """필요한 격자 이미지 수"""
+    return math.ceil(image_count / (columns * rows)) if image_count else 0
+
+
+def _draw_label(cell, number):
+    """칸 왼쪽 위에 이미지 번호 표시 (검은 바탕 흰 글씨)"""
+    text = str(number)
+    scale = max(0.5, cell.shape[0] / 240)
+    thickness = max(1, round(scale * 2))
+    (text_w, text_h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    pad = max(2, text_h // 3)
+    cv2.rectangle(cell, (0, 0), (text_w + pad * 2, text_h + baseline + pad * 2), (0, 0, 0), -1)
+    cv2.putText(
+        cell, text, (pad, text_h + pad), cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), thickness, cv2.LINE_AA
+    )
+
+
+def pack_contact_sheets(
+    jpeg_images, columns=GRID_COLUMNS, rows=GRID_ROWS, sheet_size=GRID_SHEET_SIZE, quality=GRID_JPEG_QUALITY
+):
+    """
+    이미지들을 번호를 붙인 격자 이미지(contact sheet)로 합침
+
+    이미지마다 따로 보내면 이미지 1장당 최소 토큰과 JPEG 헤더가 반복되므로,
+    columns × rows 장씩 한 장으로 합쳐 전송량과 입력 토큰을 줄인다.
+    각 칸에는 비율을 유지해 축소한 이미지와 이미지 번호(1부터, 격자를 넘어 이어짐)를 그린다.
+    원본이 칸보다 작으면 확대하지 않고 격자 크기를 줄인다 (토큰/전송량이 늘지 않도록).
+
+    Args:
+        jpeg_images (list): JPEG 바이트 리스트 (이미지 번호 순서)
+        columns (int): 격자 1장의 가로 칸 수
+        rows (int): 격자 1장의 세로 칸 수
+        sheet_size (tuple): 격자 이미지 최대 크기 (가로, 세로)
+        quality (int): JPEG 화질
+
+    Returns:
+        list: 격자 이미지 JPEG 바이트 리스트
+    """
+    frames = []
+    for index, data in enumerate(jpeg_images):
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError(f"{index + 1}번 이미지를 디코딩할 수 없습니다")
+        frames.append(frame)
+    if not frames:
+        return []
+
+    cell_w = (sheet_size[0] - GRID_GAP * (columns - 1)) // columns
+    cell_h = (sheet_size[1] - GRID_GAP * (rows - 1)) // rows
+    cell_w = min(cell_w, max(frame.shape[1] for frame in frames))
+    cell_h = min(cell_h, max(frame.shape[0] for frame in frames))
+    sheet_w = cell_w * columns + GRID_GAP * (columns - 1)
+    sheet_h = cell_h * rows + GRID_GAP * (rows - 1)
+
+    sheets = [
+        np.full((sheet_h, sheet_w, 3), GRID_BACKGROUND, dtype=np.uint8)
+        for _ in range(sheet_count(len(frames), columns, rows))
+    ]
+    for index, (frame, (sheet, row, col)) in enumerate(zip(frames, grid_layout(len(frames), columns, rows))):
+        # 비율 유지 축소 후 칸 가운데 배치
+        scale = min(1.0, cell_w / frame.shape[1], cell_h / frame.shape[0])
+        size = (max(1, int(frame.shape[1] * scale)), max(1, int(frame.shape[0] * scale)))
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+        x = col * (cell_w + GRID_GAP)
+        y = row * (cell_h + GRID_GAP)
+        cell = sheets[sheet][y:y + cell_h, x:x + cell_w]
+        top = (cell_h - size[1]) // 2
+        left = (cell_w - size[0]) // 2
+        cell[top:top + size[1], left:left + size[0]] = frame
+        _draw_label(cell, index + 1)
+
+    encoded = []
+    for sheet in sheets:
+        success, buffer = cv2.imencode(".jpg", sheet, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not success:
+            raise ValueError("격자 이미지 인코딩 실패")
+        encoded.append(buffer.tobytes())
+    return encoded
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python image_grid.py C:\guide\preset_data\cat\a.mp4 -o grid
+    #   (_V_ 이미지를 격자로 합쳐 저장, 프롬프트에 보낼 이미지 확인용)
+    import argparse
+    from pathlib import Path
+
+    from video_llm_RnD import get_images_from_folder
+
+    parser = argparse.ArgumentParser(description="_V_ 이미지 격자(contact sheet) 생성")
+    parser.add_argument("folder", help="_V_ 이미지가 있는 폴더")
+    parser.add_argument("-o", "--output", default="grid", help="저장 파일명 접두사")
+    parser.add_argument("--columns", type=int, default=GRID_COLUMNS, help="가로 칸 수")
+    parser.add_argument("--rows", type=int, default=GRID_ROWS, help="세로 칸 수")
+    parser.add_argument("--size", default="x".join(map(str, GRID_SHEET_SIZE)), help="격자 이미지 크기 (예: 1536x864)")
+    args = parser.parse_args()
+
+    images = [Path(path).read_bytes() for path in get_images_from_folder(args.folder)]
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    for i, data in enumerate(pack_contact_sheets(images, args.columns, args.rows, (width, height))):
+        path = Path(f"{args.output}_{i + 1}.jpg")
+        path.write_bytes(data)
+        print(f"✅ 격자 이미지 저장: {path} ({len(data) / 1024:.0f}KB)")
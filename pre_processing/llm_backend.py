@@ -0,0 +1,375 @@
+import os
+import re
+import json
+import time
+import urllib.error
+import urllib.request
+
+# 사용할 LLM 백엔드 (환경변수로 변경 가능)
+# - gemini: Google Gemini API (google.generativeai, GEMINI_API_KEY 필요)
+# - fake  : 로컬 가짜 서버 (fake_llm_server.py, 키/네트워크 없이 부하 테스트/CI 용)
+BACKEND_NAMES = ("gemini", "fake")
+DEFAULT_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+
+# Gemini 모델 / 가짜 서버 주소
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-pro")
+DEFAULT_FAKE_LLM_URL = os.getenv("FAKE_LLM_URL", "http://127.0.0.1:8765")
+
+# 모델별 컨텍스트 캐시(CachedContent) 최소 토큰 수 (모델 이름 앞부분으로 찾음)
+# 이보다 짧은 지시문은 등록 요청이 거절되므로 요청하지 않음 (목록에 없는 모델은 API 응답으로 판단)
+GEMINI_CONTEXT_MIN_TOKENS = {
+    "gemini-1.5": 32768,
+    "gemini-2.0": 4096,
+    "gemini-2.5-pro": 4096,
+    "gemini-2.5-flash": 1024,
+}
+
+# 가짜 서버 요청 제한 시간 (초)
+FAKE_REQUEST_TIMEOUT_SEC = 300
+
+# Gemini 한도 초과 오류 메시지의 재시도 대기 시간 (예: "Please retry in 23.4s.")
+GEMINI_RETRY_IN = re.compile(r"retry in ([\d.]+)s", re.IGNORECASE)
+
+
+class LLMBackendError(Exception):
+    """
+    백엔드 호출 실패 (HTTP 상태 코드와 서버가 알려준 재시도 대기 시간 포함)
+
+    Args:
+        message (str): 오류 내용
+        status (int): HTTP 상태 코드 (알 수 없으면 None)
+        retry_after (float): 서버가 요청한 재시도 대기 시간 (초, 없으면 None)
+    """
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def empty_usage():
+    """사용량 기본값 (입력 / 출력 / 컨텍스트 캐시 토큰 수)"""
+    return {"prompt_tokens": 0, "candidate_tokens": 0, "cached_tokens": 0}
+
+
+class LLMResponse:
+    """백엔드 응답 (텍스트 + 사용량)"""
+
+    def __init__(self, text, usage=None):
+        self.text = text
+        self.usage = usage or empty_usage()
+
+    def __repr__(self):
+        return f"LLMResponse({len(self.text)}자, usage={self.usage})"
+
+
+class LLMStream:
+    """
+    스트리밍 응답 (텍스트 조각을 순서대로 반환, 끝까지 읽으면 text / usage 가 채워짐)
+
+    Args:
+        chunks (iterable): 텍스트 조각을 내보내는 이터레이터
+        usage_fn (callable): 스트림이 끝난 뒤 사용량 dict 를 반환 (None 이면 0)
+    """
+
+    def __init__(self, chunks, usage_fn=None):
+        self._chunks = chunks
+        self._usage_fn = usage_fn
+        self._parts = []
+        self.text = ""
+        self.usage = empty_usage()
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            if chunk:
+                self._parts.append(chunk)
+                yield chunk
+        self.text = "".join(self._parts)
+        if self._usage_fn:
+            self.usage = self._usage_fn() or empty_usage()
+
+
+class LLMBackend:
+    """
+    LLM 백엔드 공통 형태
+
+    - configure()                         : 인증/연결 설정
+    - generate(prompt, images, ...)       : 프롬프트 + Base64 JPEG 이미지 → LLMResponse
+    - stream(prompt, images, ...)         : 같은 요청을 LLMStream 으로 (조각 단위)
+    - create_context / get_context / delete_context : 고정 지시문 컨텍스트 캐시
+      (supports_context_cache 가 False 면 호출하지 않음, 지시문이 min_context_tokens 보다 짧아도 호출하지 않음)
+    """
+
+    name = "base"
+    model_name = "unknown"
+    supports_context_cache = False
+    min_context_tokens = 0
+
+    def configure(self):
+        pass
+
+    def generate(self, prompt, encoded_images, generation_config=None, context=None):
+        raise NotImplementedError
+
+    def stream(self, prompt, encoded_images, generation_config=None, context=None):
+        # 스트리밍을 지원하지 않으면 전체 응답을 조각 하나로 반환
+        response = self.generate(prompt, encoded_images, generation_config, context)
+        return LLMStream(iter([response.text]), lambda: response.usage)
+
+    def create_context(self, instruction, ttl_sec):
+        raise NotImplementedError(f"{self.name} 백엔드는 컨텍스트 캐시를 지원하지 않습니다")
+
+    def get_context(self, name):
+        raise NotImplementedError(f"{self.name} 백엔드는 컨텍스트 캐시를 지원하지 않습니다")
+
+    def delete_context(self, name):
+        raise NotImplementedError(f"{self.name} 백엔드는 컨텍스트 캐시를 지원하지 않습니다")
+
+
+def gemini_context_min_tokens(model_name):
+    """모델의 컨텍스트 캐시 최소 토큰 수 (GEMINI_CONTEXT_MIN_TOKENS 에 없으면 0)"""
+    model_name = model_name.split("/")[-1]
+    for prefix in sorted(GEMINI_CONTEXT_MIN_TOKENS, key=len, reverse=True):
+        if model_name.startswith(prefix):
+            return GEMINI_CONTEXT_MIN_TOKENS[prefix]
+    return 0
+
+
+def build_parts(prompt, encoded_images):
+    """Gemini 입력 데이터 구성 (프롬프트 + 이미지 inline_data)"""
+    parts = [{"text": prompt}]
+    parts.extend([
+        {"inline_data": {"mime_type": "image/jpeg", "data": img}}
+        for img in encoded_images
+    ])
+    return parts
+
+
+class GeminiBackend(LLMBackend):
+    """
+    Google Gemini API 백엔드
+    google.generativeai 는 configure() 에서 처음 import 한다 (가짜 백엔드만 쓸 때는 설치/키 불필요).
+    """
+
+    name = "gemini"
+    supports_context_cache = True
+
+    def __init__(self, model_name=GEMINI_MODEL_NAME, api_key=None):
+        self.model_name = model_name
+        self.min_context_tokens = gemini_context_min_tokens(model_name)
+        self.api_key = api_key
+        self.genai = None
+
+    def configure(self):
+        if self.genai is not None:
+            return
+        api_key = self.api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY 환경변수가 설정되지 않았습니다.")
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.genai = genai
+        print("✅ Gemini API 설정 완료!")
+
+    def _model(self, generation_config, context):
+        self.configure()
+        if context is not None:
+            return self.genai.GenerativeModel.from_cached_content(context, generation_config=generation_config)
+        return self.genai.GenerativeModel(self.model_name, generation_config=generation_config)
+
+    @staticmethod
+    def _usage(response):
+        meta = getattr(response, "usage_metadata", None)
+        return {
+            "prompt_tokens": getattr(meta, "prompt_token_count", 0) or 0,
+            "candidate_tokens": getattr(meta, "candidates_token_count", 0) or 0,
+            "cached_tokens": getattr(meta, "cached_content_token_count", 0) or 0,
+        }
+
+    @staticmethod
+    def _error(e):
+        # google.api_core 예외는 code 에 HTTP 상태 코드를 가짐 (429 ResourceExhausted 등)
+        status = getattr(e, "code", None)
+        match = GEMINI_RETRY_IN.search(str(e))
+        return LLMBackendError(
+            f"{type(e).__name__}: {e}", status if isinstance(status, int) else None,
+            float(match.group(1)) if match else None,
+        )
+
+    def generate(self, prompt, encoded_images, generation_config=None, context=None):
+        model = self._model(generation_config, context)
+        try:
+            response = model.generate_content(build_parts(prompt, encoded_images))
+            return LLMResponse(response.text, self._usage(response))
+        except Exception as e:
+            raise self._error(e) from e
+
+    def stream(self, prompt, encoded_images, generation_config=None, context=None):
+        model = self._model(generation_config, context)
+        try:
+            response = model.generate_content(build_parts(prompt, encoded_images), stream=True)
+        except Exception as e:
+            raise self._error(e) from e
+
+        def chunks():
+            try:
+                for chunk in response:
+                    try:
+                        yield chunk.text
+                    except ValueError:
+                        # 텍스트 없이 종료 사유만 있는 조각
+                        continue
+            except Exception as e:
+                raise self._error(e) from e
+
+        # 스트리밍 응답은 모든 조각을 받은 뒤 사용량 정보가 채워짐
+        return LLMStream(chunks(), lambda: self._usage(response))
+
+    def create_context(self, instruction, ttl_sec):
+        import datetime
+
+        self.configure()
+        return self.genai.caching.CachedContent.create(
+            model=self.model_name,
+            display_name="cw_modules prompt context",
+            system_instruction=instruction,
+            ttl=datetime.timedelta(seconds=ttl_sec),
+        )
+
+    def get_context(self, name):
+        self.configure()
+        return self.genai.caching.CachedContent.get(name)
+
+    def delete_context(self, name):
+        self.get_context(name).delete()
+
+
+class FakeContext:
+    """가짜 서버 컨텍스트 (Gemini CachedContent 처럼 name 만 사용)"""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeHTTPBackend(LLMBackend):
+    """
+    로컬 가짜 서버 백엔드 (fake_llm_server.py)
+    실제 요청과 같은 크기의 이미지를 HTTP 로 보내므로 전송/동시성/한도 처리까지 부하 테스트할 수 있다.
+
+    Args:
+        url (str): 가짜 서버 주소
+        model_name (str): 응답 캐시 키 등에 쓰는 모델 이름
+    """
+
+    name = "fake"
+    supports_context_cache = True
+
+    def __init__(self, url=DEFAULT_FAKE_LLM_URL, model_name="fake-llm"):
+        self.url = url.rstrip("/")
+        self.model_name = model_name
+
+    def configure(self):
+        pass
+
+    def _request(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(
+            self.url + path, data=data, method=method, headers={"Content-Type": "application/json"}
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=FAKE_REQUEST_TIMEOUT_SEC)
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("Retry-After")
+            detail = e.read().decode("utf-8", "replace")
+            raise LLMBackendError(
+                f"가짜 서버 오류 {e.code}: {detail}", e.code, float(retry_after) if retry_after else None
+            ) from e
+        except urllib.error.URLError as e:
+            raise LLMBackendError(f"가짜 서버 연결 실패 ({self.url}): {e.reason}") from e
+
+    def _body(self, prompt, encoded_images, generation_config, context, stream):
+        return {
+            "model": self.model_name,
+            "prompt": prompt,
+            "images": list(encoded_images),
+            "generation_config": generation_config,
+            "context": context.name if context is not None else None,
+            "stream": stream,
+        }
+
+    def generate(self, prompt, encoded_images, generation_config=None, context=None):
+        with self._request("POST", "/v1/generate", self._body(prompt, encoded_images, generation_config, context, False)) as r:
+            data = json.loads(r.read())
+        return LLMResponse(data["text"], data.get("usage"))
+
+    def stream(self, prompt, encoded_images, generation_config=None, context=None):
+        response = self._request("POST", "/v1/generate", self._body(prompt, encoded_images, generation_config, context, True))
+        usage = {}
+
+        def chunks():
+            # 한 줄에 JSON 하나 (조각 {"text"}, 마지막 {"usage", "done"})
+            with response:
+                for line in response:
+                    if not line.strip():
+                        continue
+                    event = json.loads(line)
+                    if "error" in event:
+                        raise LLMBackendError(f"가짜 서버 스트리밍 오류: {event['error']}", event.get("status"))
+                    if event.get("done"):
+                        usage.update(event.get("usage") or {})
+                        break
+                    yield event["text"]
+
+        return LLMStream(chunks(), lambda: usage)
+
+    def create_context(self, instruction, ttl_sec):
+        body = {"model": self.model_name, "instruction": instruction, "ttl_sec": ttl_sec}
+        with self._request("POST", "/v1/contexts", body) as r:
+            return FakeContext(json.loads(r.read())["name"])
+
+    def get_context(self, name):
+        with self._request("GET", f"/v1/contexts/{name}"):
+            return FakeContext(name)
+
+    def delete_context(self, name):
+        with self._request("DELETE", f"/v1/contexts/{name}"):
+            pass
+
+    def stats(self):
+        """가짜 서버 누적 처리 현황"""
+        with self._request("GET", "/v1/stats") as r:
+            return json.loads(r.read())
+
+
+def get_backend(backend=None):
+    """
+    설정으로 백엔드 선택
+
+    Args:
+        backend (str | LLMBackend): 백엔드 이름 (BACKEND_NAMES) 또는 백엔드 객체 (None 이면 LLM_BACKEND)
+
+    Returns:
+        LLMBackend: 백엔드 객체
+    """
+    if isinstance(backend, LLMBackend) or (backend is not None and not isinstance(backend, str)):
+        return backend
+    name = backend or DEFAULT_BACKEND
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "fake":
+        return FakeHTTPBackend()
+    raise ValueError(f"지원하지 않는 LLM 백엔드입니다: {name} (가능: {', '.join(BACKEND_NAMES)})")
+
+
+def wait_for_server(url=DEFAULT_FAKE_LLM_URL, timeout=10.0):
+    """가짜 서버가 응답할 때까지 대기 (서버를 띄운 직후 사용)"""
+    deadline = time.monotonic() + timeout
+    backend = FakeHTTPBackend(url)
+    while True:
+        try:
+            return backend.stats()
+        except LLMBackendError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+from frame_cache import format_size, parse_size
+
+# 캐시 저장 위치 / 유효 기간 / 최대 크기 (환경변수로 변경 가능)
+DEFAULT_LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH", str(Path.home() / ".cache" / "cw_modules" / "llm_cache.sqlite3")
+)
+DEFAULT_TTL_SEC = float(os.getenv("LLM_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+DEFAULT_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(200 * 1024 ** 2)))
+
+# 키 형식이 바뀌면 올려서 기존 항목을 무효화
+CACHE_VERSION = 1
+
+
+def make_cache_key(model_name, prompt, encoded_images, generation_config=None):
+    """
+    LLM 응답 캐시 키 (모델, 프롬프트 해시, 이미지 내용 해시(순서 포함), 생성 설정)
+
+    Args:
+        model_name (str): 모델 이름
+        prompt (str): 프롬프트
+        encoded_images (list): Base64로 인코딩된 이미지 데이터 리스트 (이미지 번호 순서)
+        generation_config (dict): 생성 설정 (temperature 등)
+
+    Returns:
+        str: sha256 키
+    """
+    key_data = {
+        "version": CACHE_VERSION,
+        "model": model_name,
+        "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        # Base64 문자열 해시 = 이미지 내용 해시 (디코딩 불필요)
+        "images": [hashlib.sha256(img.encode("ascii")).hexdigest() for img in encoded_images],
+        "config": generation_config or {},
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 캐시 (SQLite)
+
+    같은 모델/프롬프트/이미지/설정의 요청은 저장된 응답을 반환한다.
+    ttl_sec 이 지난 항목은 사용하지 않고, 전체 크기가 max_bytes 를 넘으면
+    가장 오래 사용하지 않은 항목부터 삭제한다.
+    적중/미적중 횟수는 DB 에 누적되므로 여러 프로세스의 합계를 볼 수 있다.
+    """
+
+    def __init__(self, cache_path=DEFAULT_LLM_CACHE_PATH, ttl_sec=DEFAULT_TTL_SEC, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_path = Path(cache_path)
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Dispatcher 의 여러 스레드에서 함께 사용
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.cache_path), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT,
+                    bytes INTEGER,
+                    created_at REAL,
+                    last_access REAL,
+                    hits INTEGER DEFAULT 0
+                )
+                """
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+            self.conn.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+
+    def close(self):
+        self.conn.close()
+
+    def _count(self, name):
+        self.conn.execute("UPDATE counters SET value = value + 1 WHERE name = ?", (name,))
+
+    def get(self, key):
+        """
+        응답 조회 (없거나 유효 기간이 지났으면 None)
+
+        Returns:
+            str | None: 저장된 응답 텍스트
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_sec and now - row["created_at"] > self.ttl_sec:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self._count("misses")
+                return None
+            self.conn.execute(
+                "UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self._count("hits")
+            return row["response"]
+
+    def put(self, key, model_name, response):
+        """응답 저장 후 최대 크기를 넘으면 정리"""
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, bytes, created_at, last_access, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (key, model_name, response, len(response.encode("utf-8")), now, now),
+                )
+            self._evict(self.max_bytes)
+
+    def _evict(self, max_bytes):
+        """유효 기간이 지난 항목과 크기 초과분 삭제 (오래 사용하지 않은 순)"""
+        removed = 0
+        freed = 0
+        with self.conn:
+            if self.ttl_sec:
+                expired = self.conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM responses WHERE created_at < ?",
+                    (time.time() - self.ttl_sec,),
+                ).fetchone()
+                self.conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_sec,))
+                removed, freed = expired[0], expired[1]
+
+            total = self.total_bytes()
+            if total <= max_bytes:
+                return removed, freed
+            for row in self.conn.execute("SELECT key, bytes FROM responses ORDER BY last_access").fetchall():
+                if total <= max_bytes:
+                    break
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (row["key"],))
+                total -= row["bytes"]
+                removed += 1
+                freed += row["bytes"]
+        return removed, freed
+
+    def evict(self, max_bytes=None):
+        """
+        정리 실행
+
+        Returns:
+            tuple: (삭제한 항목 수, 확보한 바이트 수)
+        """
+        with self._lock:
+            return self._evict(self.max_bytes if max_bytes is None else max_bytes)
+
+    def clear(self):
+        """캐시 전체 삭제 (적중/미적중 횟수는 유지)"""
+        return self.evict(max_bytes=0)
+
+    def total_bytes(self):
+        return self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM responses").fetchone()[0]
+
+    def counters(self):
+        """누적 적중/미적중 횟수"""
+        with self._lock:
+            rows = self.conn.execute("SELECT name, value FROM counters").fetchall()
+        return {row["name"]: row["value"] for row in rows}
+
+    def stats(self):
+        """항목 수, 전체 크기, 누적 적중/미적중"""
+        with self._lock:
+            count, total = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM responses"
+            ).fetchone()
+        return {"entries": count, "bytes": total, **self.counters()}
+
+
+def counter_delta(before, after):
+    """counters() 두 시점 차이 (이번 실행의 적중/미적중)"""
+    return {name: after.get(name, 0) - before.get(name, 0) for name in after}
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python llm_cache.py stats / prune --max-bytes 50M / clear
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LLM 응답 캐시 관리")
+    parser.add_argument("command", choices=["stats", "prune", "clear"], help="실행할 명령")
+    parser.add_argument("--cache-path", default=DEFAULT_LLM_CACHE_PATH, help="캐시 DB 경로")
+    parser.add_argument("--max-bytes", default=None, help="prune 시 유지할 최대 크기 (예: 50M)")
+    args = parser.parse_args()
+
+    cache = LLMResponseCache(args.cache_path)
+    if args.command == "stats":
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups else 0.0
+        print(f"캐시 DB: {cache.cache_path}")
+        print(f"항목 수: {stats['entries']}개, 전체 크기: {format_size(stats['bytes'])} "
+              f"(최대 {format_size(cache.max_bytes)}, 유효 기간 {cache.ttl_sec / 3600:.0f}시간)")
+        print(f"누적 적중: {stats['hits']}회, 미적중: {stats['misses']}회 (적중률 {hit_rate:.0%})")
+    elif args.command == "prune":
+        max_bytes = parse_size(args.max_bytes) if args.max_bytes else cache.max_bytes
+        removed, freed = cache.evict(max_bytes)
+        print(f"🧹 {removed}개 항목 삭제, {format_size(freed)} 확보")
+    else:
+        removed, freed = cache.clear()
+        print(f"🧹 캐시 전체 삭제: {removed}개 항목, {format_size(freed)}")
+    cache.close()
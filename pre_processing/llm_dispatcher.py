@@ -0,0 +1,188 @@
+import os
+import time
+import asyncio
+from collections import deque
+
+# 동시에 처리 중인 요청 수 / 분당 요청 수 / 분당 입력 토큰 수 기본값 (환경변수로 변경 가능)
+DEFAULT_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+DEFAULT_RPM = int(os.getenv("LLM_RPM", "60"))
+DEFAULT_TPM = int(os.getenv("LLM_TPM", "1000000"))
+
+# RPM/TPM 계산 구간(초)
+RATE_WINDOW_SEC = 60.0
+
+
+class RateLimiter:
+    """
+    분당 요청 수(RPM) / 분당 토큰 수(TPM) 제한
+
+    최근 RATE_WINDOW_SEC 초 동안의 요청 시각과 토큰 수를 기록하고,
+    새 요청이 한도를 넘으면 가장 오래된 요청이 구간을 벗어날 때까지 기다린다.
+    대기는 요청 순서대로 처리된다 (먼저 기다린 요청이 먼저 통과).
+    """
+
+    def __init__(self, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, window=RATE_WINDOW_SEC, clock=time.monotonic):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.clock = clock
+        self.events = deque()  # (시각, 토큰 수)
+        self.tokens_in_window = 0
+        self.waited_sec = 0.0
+        self._lock = asyncio.Lock()
+
+    def _expire(self, now):
+        while self.events and now - self.events[0][0] >= self.window:
+            _, tokens = self.events.popleft()
+            self.tokens_in_window -= tokens
+
+    def _fits(self, tokens):
+        if not self.events:
+            # 한 요청이 TPM 보다 커도 구간이 비어 있으면 통과 (영원히 대기하지 않도록)
+            return True
+        if self.rpm and len(self.events) >= self.rpm:
+            return False
+        return not self.tpm or self.tokens_in_window + tokens <= self.tpm
+
+    async def acquire(self, tokens=0):
+        """한도 안에 들어올 때까지 대기한 뒤 요청 1건 기록"""
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self._expire(now)
+                if self._fits(tokens):
+                    self.events.append((now, tokens))
+                    self.tokens_in_window += tokens
+                    return
+                wait = self.events[0][0] + self.window - now
+                self.waited_sec += wait
+                await asyncio.sleep(wait)
+
+
+class Dispatcher:
+    """
+    LLM 요청 비동기 동시 처리기
+
+    최대 concurrency 개의 요청을 동시에 보내면서 RateLimiter 로 RPM/TPM 을 지킨다.
+    prepare_fn / call_fn 은 블로킹 함수여도 되며 스레드에서 실행된다.
+    결과는 완료 순서와 상관없이 입력 순서대로 반환한다.
+
+    Args:
+        call_fn (callable): call_fn(payload) -> 응답 (예: Gemini 응답 텍스트)
+        prepare_fn (callable): prepare_fn(item) -> (payload, 예상 입력 토큰 수)
+            요청 직전에 호출되므로 이미지 로드 등을 여기서 하면 메모리에는 concurrency 개만 올라간다
+            (None 이면 item 을 그대로 payload 로, 토큰 수 0)
+        concurrency (int): 동시 요청 수
+        rpm (int): 분당 요청 수 한도 (0 이면 제한 없음)
+        tpm (int): 분당 입력 토큰 수 한도 (0 이면 제한 없음)
+    """
+
+    def __init__(self, call_fn, prepare_fn=None, concurrency=None, rpm=None, tpm=None):
+        self.call_fn = call_fn
+        self.prepare_fn = prepare_fn or (lambda item: (item, 0))
+        self.concurrency = concurrency or DEFAULT_CONCURRENCY
+        self.rpm = DEFAULT_RPM if rpm is None else rpm
+        self.tpm = DEFAULT_TPM if tpm is None else tpm
+
+    async def _run_one(self, index, item, semaphore, limiter, results, on_result):
+        async with semaphore:
+            result = {"index": index, "ok": False, "response": None, "error": None, "tokens": 0, "latency_sec": 0.0}
+            try:
+                payload, tokens = await asyncio.to_thread(self.prepare_fn, item)
+                result["tokens"] = tokens
+                await limiter.acquire(tokens)
+                start = time.perf_counter()
+                result["response"] = await asyncio.to_thread(self.call_fn, payload)
+                result["latency_sec"] = time.perf_counter() - start
+                result["ok"] = True
+            except Exception as e:
+                # 한 요청의 실패가 나머지 요청을 멈추지 않도록 결과에 기록
+                result["error"] = f"{type(e).__name__}: {e}"
+            results[index] = result
+            if on_result:
+                on_result(result)
+
+    async def run_async(self, items, on_result=None):
+        """
+        모든 요청 처리 (비동기)
+
+        Args:
+            items (list): 요청 항목 리스트 (prepare_fn 입력)
+            on_result (callable): on_result(result), 요청이 끝날 때마다 완료 순서대로 호출
+
+        Returns:
+            list: 입력 순서의 결과 dict (index, ok, response, error, tokens, latency_sec)
+        """
+        items = list(items)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = RateLimiter(self.rpm, self.tpm)
+        results = [None] * len(items)
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            self._run_one(i, item, semaphore, limiter, results, on_result) for i, item in enumerate(items)
+        ))
+        self.elapsed_sec = time.perf_counter() - started
+        self.rate_wait_sec = limiter.waited_sec
+        return results
+
+    def run(self, items, on_result=None):
+        """모든 요청 처리 (동기 호출용, run_async 참고)"""
+        return asyncio.run(self.run_async(items, on_result))
+
+
+def print_dispatch_summary(results, elapsed_sec, rate_wait_sec=0.0):
+    """요청 결과 요약 출력"""
+    ok = [r for r in results if r["ok"]]
+    latencies = sorted(r["latency_sec"] for r in ok)
+    print(f"\n=== LLM 요청 결과: 성공 {len(ok)}개, 실패 {len(results) - len(ok)}개, 전체 {len(results)}개 ===")
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"전체 {elapsed_sec:.1f}초, 요청당 평균 {sum(latencies) / len(latencies):.2f}초 (p95 {p95:.2f}초), "
+              f"한도 대기 {rate_wait_sec:.1f}초, 예상 입력 토큰 {sum(r['tokens'] for r in results)}")
+    for r in results:
+        if not r["ok"]:
+            print(f"  ❌ {r['index'] + 1}번: {r['error']}")
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python llm_dispatcher.py C:\guide\preset_data\cat\a.mp4 C:\guide\preset_data\cat\b.mp4 -j 8
+    #             python llm_dispatcher.py FOLDER... --fake 1.5   (API 호출 없이 지연만 흉내)
+    #             python llm_dispatcher.py FOLDER... --llm-backend fake   (fake_llm_server.py 로 한도/오류 확인)
+    import argparse
+    import random
+
+    from llm_backend import BACKEND_NAMES
+    from video_llm_RnD import transform2_many
+
+    parser = argparse.ArgumentParser(description="여러 폴더 장면 요약 동시 처리")
+    parser.add_argument("folders", nargs="+", help="_V_ 이미지가 있는 폴더들")
+    parser.add_argument("-j", "--concurrency", type=int, default=None, help="동시 요청 수")
+    parser.add_argument("--rpm", type=int, default=None, help="분당 요청 수 한도")
+    parser.add_argument("--tpm", type=int, default=None, help="분당 입력 토큰 수 한도")
+    parser.add_argument(
+        "--prompt-context", action="store_true", help="고정 지시문을 Gemini 컨텍스트 캐시로 재사용 (prompt_context.py)",
+    )
+    parser.add_argument(
+        "--fake", type=float, default=None, metavar="LATENCY",
+        help="Gemini 대신 평균 LATENCY 초 후 고정 문장을 반환 (동시성/한도 확인용)",
+    )
+    parser.add_argument("--llm-backend", choices=BACKEND_NAMES, default=None, help="LLM 백엔드 (기본 LLM_BACKEND)")
+    args = parser.parse_args()
+
+    call_fn = None
+    if args.fake is not None:
+        def call_fn(encoded_images):
+            time.sleep(random.uniform(0.5, 1.5) * args.fake)
+            return " ".join(f"{i + 1}번 장면이다." for i in range(len(encoded_images)))
+
+    context_cache = None
+    if args.prompt_context:
+        from prompt_context import PromptContextCache
+
+        context_cache = PromptContextCache()
+    summaries = transform2_many(
+        args.folders, args.concurrency, args.rpm, args.tpm, call_fn=call_fn, context_cache=context_cache,
+        backend=args.llm_backend,
+    )
+    for folder, summary in zip(args.folders, summaries):
+        print(f"\n[{folder}]\n{summary}")
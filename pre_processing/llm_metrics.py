@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import threading
+import contextlib
+import contextvars
+from pathlib import Path
+
+# 호출별 지표 기록 위치 (JSONL, 한 줄에 호출 1건)
+DEFAULT_METRICS_PATH = os.getenv(
+    "LLM_METRICS_PATH", str(Path.home() / ".cache" / "cw_modules" / "llm_metrics.jsonl")
+)
+
+# 지금 처리 중인 호출의 묶음 이름 (비디오 등, 영상별 비용 집계용)
+# 스레드/asyncio.to_thread 로 넘어가도 값이 유지되도록 contextvars 사용
+CALL_LABEL = contextvars.ContextVar("llm_call_label", default=None)
+
+
+@contextlib.contextmanager
+def call_label(label):
+    """
+    이 블록 안의 LLM 호출에 label 을 붙여 기록
+
+    Args:
+        label (str): 묶음 이름 (예: "cat/a.mp4")
+    """
+    token = CALL_LABEL.set(label)
+    try:
+        yield
+    finally:
+        CALL_LABEL.reset(token)
+
+
+def image_bytes(encoded_images):
+    """Base64 이미지들의 원본 바이트 수 (디코딩 없이 길이로 계산)"""
+    return sum(len(img) * 3 // 4 - img[-2:].count("=") for img in encoded_images if img)
+
+
+class MetricsLog:
+    """
+    LLM 호출별 지표 JSONL 기록 (지연, 입력/출력 토큰, 이미지 바이트, 재시도, 오류)
+
+    한 줄을 한 번의 write 로 추가 모드에 쓰므로 여러 프로세스가 같은 파일에 기록해도 줄이 섞이지 않는다.
+
+    Args:
+        path (str): 기록 파일 경로 (None 이면 기록하지 않음)
+    """
+
+    def __init__(self, path=DEFAULT_METRICS_PATH):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+
+    def record(self, **fields):
+        """호출 1건 기록 (시각과 현재 call_label 을 함께 저장)"""
+        if self.path is None:
+            return
+        entry = {"ts": round(time.time(), 3), "label": CALL_LABEL.get(), **fields}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def load_metrics(path=DEFAULT_METRICS_PATH, since=None):
+    """
+    기록 읽기
+
+    Args:
+        path (str): 기록 파일 경로
+        since (float): 이 시각(epoch 초) 이후 기록만
+
+    Returns:
+        list: 기록 dict 리스트 (깨진 줄은 건너뜀)
+    """
+    entries = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if since is None or entry.get("ts", 0) >= since:
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def percentile(values, q):
+    """정렬 후 q 분위 값 (values 가 비어 있으면 None)"""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def summarize_metrics(entries):
+    """
+    묶음(label)별 집계
+
+    Returns:
+        dict: label → {calls, ok, errors, retries, prompt_tokens, candidate_tokens, cached_tokens,
+            image_bytes, p50_sec, p95_sec}
+    """
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry.get("label") or "-", {
+            "calls": 0, "ok": 0, "errors": 0, "retries": 0, "prompt_tokens": 0, "candidate_tokens": 0,
+            "cached_tokens": 0, "image_bytes": 0, "latencies": [],
+        })
+        group["calls"] += 1
+        group["retries"] += 1 if entry.get("attempt", 1) > 1 else 0
+        if entry.get("ok"):
+            group["ok"] += 1
+            group["latencies"].append(entry["latency_sec"])
+            for key in ("prompt_tokens", "candidate_tokens", "cached_tokens", "image_bytes"):
+                group[key] += entry.get(key) or 0
+        else:
+            group["errors"] += 1
+
+    for group in groups.values():
+        latencies = group.pop("latencies")
+        group["p50_sec"] = percentile(latencies, 0.5)
+        group["p95_sec"] = percentile(latencies, 0.95)
+    return groups
+
+
+def print_metrics_summary(groups):
+    """묶음별 집계 표 출력"""
+    print(f"{'묶음':40} {'호출':>5} {'실패':>5} {'재시도':>6} {'입력 토큰':>10} {'출력 토큰':>9} "
+          f"{'이미지 KB':>9} {'p50':>7} {'p95':>7}")
+    for label, g in sorted(groups.items()):
+        p50 = f"{g['p50_sec']:.2f}s" if g["p50_sec"] is not None else "-"
+        p95 = f"{g['p95_sec']:.2f}s" if g["p95_sec"] is not None else "-"
+        print(f"{label[-40:]:40} {g['calls']:>5} {g['errors']:>5} {g['retries']:>6} {g['prompt_tokens']:>10} "
+              f"{g['candidate_tokens']:>9} {g['image_bytes'] / 1024:>9.0f} {p50:>7} {p95:>7}")
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python llm_metrics.py                 (비디오별 토큰/지연 집계)
+    #             python llm_metrics.py --hours 24 --json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LLM 호출 지표 집계 (비디오별 토큰 사용량, p95 지연)")
+    parser.add_argument("path", nargs="?", default=DEFAULT_METRICS_PATH, help="지표 JSONL 파일")
+    parser.add_argument("--hours", type=float, default=None, help="최근 N시간 기록만")
+    parser.add_argument("--json", action="store_true", help="표 대신 JSON 출력")
+    args = parser.parse_args()
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    groups = summarize_metrics(load_metrics(args.path, since))
+    if args.json:
+        print(json.dumps(groups, ensure_ascii=False, indent=2))
+    else:
+        print_metrics_summary(groups)
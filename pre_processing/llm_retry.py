@@ -0,0 +1,285 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+
+from llm_backend import LLMBackend, LLMBackendError, LLMStream
+from llm_metrics import MetricsLog, image_bytes
+
+# 재시도 정책 (환경변수로 변경 가능)
+# 대기 시간 = 0 ~ min(RETRY_MAX_SEC, RETRY_BASE_SEC × 2^(시도-1)) 무작위 (full jitter),
+# 서버가 Retry-After 를 알려주면 그 시간 + 최대 10% 무작위
+RETRY_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "5"))
+RETRY_BASE_SEC = float(os.getenv("LLM_RETRY_BASE_SEC", "1.0"))
+RETRY_MAX_SEC = float(os.getenv("LLM_RETRY_MAX_SEC", "60.0"))
+
+# 다시 시도할 HTTP 상태 코드 (None: 연결 실패 등 상태 코드 없음)
+RETRYABLE_STATUSES = {None, 408, 429, 500, 502, 503, 504}
+
+# 회로 차단: 최근 BREAKER_WINDOW 건 중 BREAKER_MIN_CALLS 건 이상 기록되고
+# 실패율이 BREAKER_ERROR_RATE 이상이면 BREAKER_COOLDOWN_SEC 초 동안 모든 호출을 멈춤
+BREAKER_WINDOW = 20
+BREAKER_MIN_CALLS = 5
+BREAKER_ERROR_RATE = 0.5
+BREAKER_COOLDOWN_SEC = float(os.getenv("LLM_BREAKER_COOLDOWN_SEC", "30.0"))
+
+
+def is_retryable(error):
+    """다시 시도하면 성공할 수 있는 오류인지 (한도 초과, 서버 오류, 연결 실패)"""
+    return isinstance(error, LLMBackendError) and error.status in RETRYABLE_STATUSES
+
+
+def backoff_delay(attempt, retry_after=None, base_sec=RETRY_BASE_SEC, max_sec=RETRY_MAX_SEC):
+    """
+    재시도 전 대기 시간
+
+    Args:
+        attempt (int): 실패한 시도 번호 (1부터)
+        retry_after (float): 서버가 요청한 대기 시간 (초, 있으면 우선)
+        base_sec (float): 첫 재시도 최대 대기 시간
+        max_sec (float): 대기 시간 상한 (Retry-After 에는 적용하지 않음)
+
+    Returns:
+        float: 대기 시간 (초)
+    """
+    if retry_after is not None:
+        # 여러 요청이 같은 시각에 몰리지 않도록 조금씩 어긋나게
+        return retry_after * random.uniform(1.0, 1.1)
+    return random.uniform(0, min(max_sec, base_sec * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    회로 차단기 (프로세스 안의 모든 LLM 호출이 공유)
+
+    실패율이 높아지면 열림(open) 상태가 되어 cooldown_sec 동안 모든 호출이 before_call 에서 대기한다
+    (llm_dispatcher 의 동시 요청도 함께 멈춤). 대기가 끝나면 호출 1건만 시험으로 보내고(half_open)
+    성공하면 닫고, 실패하면 다시 연다.
+
+    Args:
+        window (int): 실패율 계산에 쓰는 최근 호출 수
+        min_calls (int): 차단 판단에 필요한 최소 호출 수
+        error_rate (float): 차단 기준 실패율
+        cooldown_sec (float): 차단 시간 (초)
+    """
+
+    def __init__(self, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS, error_rate=BREAKER_ERROR_RATE,
+                 cooldown_sec=BREAKER_COOLDOWN_SEC, clock=time.monotonic):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown_sec = cooldown_sec
+        self.clock = clock
+        self.outcomes = deque(maxlen=window)
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.trips = 0
+        self.paused_sec = 0.0
+        self._cond = threading.Condition()
+
+    def before_call(self):
+        """호출 전 확인 (열려 있으면 닫히거나 시험 호출 차례가 될 때까지 대기)"""
+        started = self.clock()
+        with self._cond:
+            while True:
+                if self.state == "closed":
+                    break
+                if self.state == "open":
+                    remaining = self.opened_at + self.cooldown_sec - self.clock()
+                    if remaining > 0:
+                        self._cond.wait(remaining)
+                        continue
+                    self.state = "half_open"
+                if not self.probe_in_flight:
+                    # 시험 호출 1건만 통과, 나머지는 결과가 나올 때까지 대기
+                    self.probe_in_flight = True
+                    break
+                self._cond.wait()
+            self.paused_sec += self.clock() - started
+
+    def record(self, ok):
+        """
+        호출 결과 기록
+
+        Args:
+            ok (bool): 성공 여부 (재시도 대상이 아닌 오류는 서비스 상태와 무관하므로 성공으로 기록)
+        """
+        with self._cond:
+            if self.state == "half_open":
+                self.probe_in_flight = False
+                if ok:
+                    self.state = "closed"
+                    self.outcomes.clear()
+                    print("✅ LLM 호출 회로 복구")
+                else:
+                    self._open()
+                self._cond.notify_all()
+                return
+            self.outcomes.append(ok)
+            failures = self.outcomes.count(False)
+            if (self.state == "closed" and len(self.outcomes) >= self.min_calls
+                    and failures / len(self.outcomes) >= self.error_rate):
+                self._open()
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = self.clock()
+        self.trips += 1
+        print(f"⛔ LLM 호출 실패율이 높아 {self.cooldown_sec:.0f}초 동안 호출 중단 (최근 {len(self.outcomes)}건 중 "
+              f"실패 {self.outcomes.count(False)}건)")
+
+
+# 프로세스 전체가 공유하는 회로 차단기 (비디오마다 백엔드를 새로 설정해도 상태 유지)
+_PROCESS_BREAKER = CircuitBreaker()
+
+
+class ResilientBackend(LLMBackend):
+    """
+    재시도 / 회로 차단 / 호출 지표 기록을 더한 백엔드 (다른 LLMBackend 를 감쌈)
+
+    - 재시도 대상 오류(RETRYABLE_STATUSES)는 backoff_delay 만큼 기다린 뒤 최대 max_attempts 번까지 시도
+    - 스트리밍은 첫 조각을 받기 전에 실패한 경우만 재시도 (이미 전달한 문장을 다시 보내지 않도록)
+    - 시도마다 MetricsLog 에 지연, 토큰 수, 이미지 바이트, 오류를 기록
+
+    Args:
+        backend (LLMBackend): 실제 호출할 백엔드
+        max_attempts (int): 최대 시도 횟수
+        breaker (CircuitBreaker): 회로 차단기 (None 이면 프로세스 공유 차단기)
+        metrics (MetricsLog): 지표 기록 (None 이면 LLM_METRICS_PATH)
+    """
+
+    def __init__(self, backend, max_attempts=RETRY_MAX_ATTEMPTS, breaker=None, metrics=None):
+        self.backend = backend
+        self.max_attempts = max(1, max_attempts)
+        self.breaker = breaker or _PROCESS_BREAKER
+        self.metrics = metrics or MetricsLog()
+        self.stats = {"calls": 0, "retries": 0, "failures": 0}
+
+    @property
+    def name(self):
+        return self.backend.name
+
+    @property
+    def model_name(self):
+        return self.backend.model_name
+
+    @property
+    def supports_context_cache(self):
+        return self.backend.supports_context_cache
+
+    @property
+    def min_context_tokens(self):
+        return self.backend.min_context_tokens
+
+    def configure(self):
+        self.backend.configure()
+
+    def create_context(self, instruction, ttl_sec):
+        return self.backend.create_context(instruction, ttl_sec)
+
+    def get_context(self, name):
+        return self.backend.get_context(name)
+
+    def delete_context(self, name):
+        return self.backend.delete_context(name)
+
+    def _record(self, kind, attempt, started, encoded_images, context, usage=None, error=None, **extra):
+        self.metrics.record(
+            backend=self.backend.name,
+            model=self.backend.model_name,
+            kind=kind,
+            attempt=attempt,
+            ok=error is None,
+            status=getattr(error, "status", None),
+            error=f"{type(error).__name__}: {error}" if error is not None else None,
+            latency_sec=round(time.perf_counter() - started, 3),
+            prompt_tokens=(usage or {}).get("prompt_tokens"),
+            candidate_tokens=(usage or {}).get("candidate_tokens"),
+            cached_tokens=(usage or {}).get("cached_tokens"),
+            images=len(encoded_images),
+            image_bytes=image_bytes(encoded_images),
+            context=context is not None,
+            **extra,
+        )
+
+    def _failed(self, error, attempt):
+        """
+        실패 처리 (회로 차단기 기록, 재시도 여부 판단 후 대기)
+
+        Returns:
+            bool: 다시 시도하면 True (아니면 호출한 쪽에서 예외를 다시 발생)
+        """
+        retryable = is_retryable(error)
+        self.breaker.record(not retryable)
+        if not retryable or attempt >= self.max_attempts:
+            self.stats["failures"] += 1
+            return False
+        delay = backoff_delay(attempt, getattr(error, "retry_after", None))
+        print(f"⚠️ LLM 호출 실패 ({attempt}/{self.max_attempts}), {delay:.1f}초 후 재시도: {error}")
+        self.stats["retries"] += 1
+        time.sleep(delay)
+        return True
+
+    def generate(self, prompt, encoded_images, generation_config=None, context=None):
+        self.stats["calls"] += 1
+        for attempt in range(1, self.max_attempts + 1):
+            self.breaker.before_call()
+            started = time.perf_counter()
+            try:
+                response = self.backend.generate(prompt, encoded_images, generation_config, context)
+            except Exception as e:
+                self._record("generate", attempt, started, encoded_images, context, error=e)
+                if self._failed(e, attempt):
+                    continue
+                raise
+            self.breaker.record(True)
+            self._record("generate", attempt, started, encoded_images, context, response.usage)
+            return response
+
+    def stream(self, prompt, encoded_images, generation_config=None, context=None):
+        self.stats["calls"] += 1
+        for attempt in range(1, self.max_attempts + 1):
+            self.breaker.before_call()
+            started = time.perf_counter()
+            try:
+                inner = self.backend.stream(prompt, encoded_images, generation_config, context)
+                chunks = iter(inner)
+                first = next(chunks, None)
+            except Exception as e:
+                self._record("stream", attempt, started, encoded_images, context, error=e)
+                if self._failed(e, attempt):
+                    continue
+                raise
+            first_chunk_sec = round(time.perf_counter() - started, 3)
+            return LLMStream(
+                self._rest(inner, chunks, first, attempt, started, first_chunk_sec, encoded_images, context),
+                lambda inner=inner: inner.usage,
+            )
+
+    def _rest(self, inner, chunks, first, attempt, started, first_chunk_sec, encoded_images, context):
+        """첫 조각 이후 스트리밍 (도중 실패는 재시도하지 않고 기록 후 예외)"""
+        try:
+            if first is not None:
+                yield first
+            yield from chunks
+        except GeneratorExit:
+            # 읽는 쪽이 도중에 멈춤 (서비스 오류 아님)
+            self.breaker.record(True)
+            raise
+        except Exception as e:
+            self.breaker.record(not is_retryable(e))
+            self.stats["failures"] += 1
+            self._record("stream", attempt, started, encoded_images, context, error=e, first_chunk_sec=first_chunk_sec)
+            raise
+        self.breaker.record(True)
+        self._record("stream", attempt, started, encoded_images, context, inner.usage, first_chunk_sec=first_chunk_sec)
+
+
+def print_resilience_stats(backend):
+    """재시도 / 회로 차단 결과 출력 (ResilientBackend 가 아니면 출력하지 않음)"""
+    if not isinstance(backend, ResilientBackend):
+        return
+    stats, breaker = backend.stats, backend.breaker
+    print(f"LLM 호출: {stats['calls']}건, 재시도 {stats['retries']}회, 최종 실패 {stats['failures']}건, "
+          f"회로 차단 {breaker.trips}회 (대기 {breaker.paused_sec:.1f}초)")
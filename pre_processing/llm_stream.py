@@ -0,0 +1,148 @@
+import re
+import time
+
+from llm_backend import LLMBackend, LLMResponse, LLMStream
+from fake_llm_server import fake_response_text
+
+# 문장 경계: 마침표 뒤 공백, 또는 줄바꿈
+SENTENCE_BOUNDARY = re.compile(r"(?<=\.)\s+|\s*\n\s*")
+# 줄 경계: 격자 응답 ("[번호] 문장." 한 줄에 한 칸, "2. 문장." 처럼 번호 뒤 마침표가 있어도 나누지 않도록)
+LINE_BOUNDARY = re.compile(r"\s*\n\s*")
+
+# 장면 요약 문장 검사 규칙 (video_llm_RnD.SCENE_SUMMARY_RULES 의 [Constraints] 중 기계적으로 확인 가능한 것)
+FORBIDDEN_EXPRESSIONS = ("하는 상태이다", "듯하다", "되어지고", "있고 있으며", "하고 있으며")
+HONORIFIC_ENDINGS = ("습니다.", "니다.", "요.")
+
+
+class SentenceSplitter:
+    """
+    스트리밍 응답 조각을 받아 완성된 문장만 내보내는 분리기
+
+    조각 경계는 문장 경계와 상관없으므로 마지막 미완성 부분은 다음 조각까지 보관한다.
+    마침표 바로 뒤에서 조각이 끝나면 (예: "1." 다음 "5초") 다음 조각을 보고 판단한다.
+
+    Args:
+        boundary (re.Pattern): 문장 경계 (SENTENCE_BOUNDARY, LINE_BOUNDARY)
+    """
+
+    def __init__(self, boundary=SENTENCE_BOUNDARY):
+        self.boundary = boundary
+        self.buffer = ""
+
+    def feed(self, text):
+        """
+        응답 조각 추가
+
+        Returns:
+            list: 이번 조각으로 완성된 문장 리스트
+        """
+        self.buffer += text
+        parts = self.boundary.split(self.buffer)
+        self.buffer = parts[-1]
+        return [part.strip() for part in parts[:-1] if part.strip()]
+
+    def flush(self):
+        """응답이 끝났을 때 남은 부분 (마침표 없이 끝난 마지막 문장)"""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
+
+
+def validate_sentence(sentence):
+    """
+    장면 요약 문장 1개 검사 (스트리밍 중 문장이 완성될 때마다 호출)
+
+    Returns:
+        list: 규칙 위반 내용 (빈 리스트면 통과)
+    """
+    issues = []
+    if not sentence.endswith("."):
+        issues.append("마침표 없음")
+    if sentence.endswith(HONORIFIC_ENDINGS):
+        issues.append("경어")
+    issues.extend(f"금지 표현 '{expr}'" for expr in FORBIDDEN_EXPRESSIONS if expr in sentence)
+    return issues
+
+
+class StubStreamingModel(LLMBackend):
+    """
+    스트리밍 확인용 가짜 백엔드 (프로세스 안에서 동작, 서버 불필요)
+
+    요청 이미지 수만큼 문장을 만들어 (fake_llm_server.fake_response_text)
+    chunk_chars 글자씩 delay 초 간격으로 내보낸다.
+
+    Args:
+        delay (float): 조각 사이 지연 (초)
+        first_delay (float): 첫 조각까지 지연 (초, 입력 처리 시간)
+        chunk_chars (int): 조각 1개의 글자 수
+        text (str): 고정 응답 (None 이면 이미지 수로 생성)
+    """
+
+    name = "stub"
+    model_name = "stub-streaming"
+
+    def __init__(self, delay=0.1, first_delay=0.5, chunk_chars=16, text=None):
+        self.delay = delay
+        self.first_delay = first_delay
+        self.chunk_chars = chunk_chars
+        self.text = text
+
+    def _response_text(self, prompt, encoded_images, generation_config):
+        if self.text is not None:
+            return self.text
+        json_mode = (generation_config or {}).get("response_mime_type") == "application/json"
+        return fake_response_text(prompt, len(encoded_images), json_mode)
+
+    def _chunks(self, text):
+        time.sleep(self.first_delay)
+        for start in range(0, len(text), self.chunk_chars):
+            if start:
+                time.sleep(self.delay)
+            yield text[start:start + self.chunk_chars]
+
+    def stream(self, prompt, encoded_images, generation_config=None, context=None):
+        return LLMStream(self._chunks(self._response_text(prompt, encoded_images, generation_config)))
+
+    def generate(self, prompt, encoded_images, generation_config=None, context=None):
+        # 스트리밍이 아니면 모든 조각이 끝날 때까지 기다린 뒤 한 번에 반환
+        text = self._response_text(prompt, encoded_images, generation_config)
+        for _ in self._chunks(text):
+            pass
+        return LLMResponse(text)
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python llm_stream.py --images 45 --delay 0.05        (가짜 모델, API 호출 없음)
+    #             python llm_stream.py C:\guide\preset_data\cat\a.mp4 --gemini   (실제 Gemini 스트리밍)
+    import argparse
+
+    from video_llm_RnD import analyze_images_with_gemini, load_folder_images, setup_llm_backend
+
+    parser = argparse.ArgumentParser(description="장면 요약 스트리밍 / 문장 단위 처리 확인")
+    parser.add_argument("folder", nargs="?", default=None, help="_V_ 이미지가 있는 폴더 (없으면 --images 개수의 빈 이미지)")
+    parser.add_argument("--images", type=int, default=9, help="폴더가 없을 때 이미지 수")
+    parser.add_argument("--delay", type=float, default=0.1, help="가짜 모델 조각 사이 지연 (초)")
+    parser.add_argument("--first-delay", type=float, default=0.5, help="가짜 모델 첫 조각까지 지연 (초)")
+    parser.add_argument("--chunk-chars", type=int, default=16, help="가짜 모델 조각 글자 수")
+    parser.add_argument("--gemini", action="store_true", help="가짜 모델 대신 실제 Gemini 사용")
+    args = parser.parse_args()
+
+    encoded_images = load_folder_images(args.folder) if args.folder else [""] * args.images
+    if args.gemini:
+        backend = setup_llm_backend("gemini")
+    else:
+        backend = StubStreamingModel(args.delay, args.first_delay, args.chunk_chars)
+
+    started = time.perf_counter()
+    arrivals = []
+
+    def on_sentence(index, sentence):
+        arrivals.append(time.perf_counter() - started)
+        issues = validate_sentence(sentence)
+        print(f"  [{arrivals[-1]:6.2f}초] {index + 1:2d}. {sentence}" + (f"  ⚠️ {', '.join(issues)}" if issues else ""))
+
+    analyze_images_with_gemini(encoded_images, len(encoded_images), on_sentence=on_sentence, backend=backend)
+    total = time.perf_counter() - started
+    if arrivals:
+        print(f"\n첫 문장 {arrivals[0]:.2f}초, 전체 {total:.2f}초 "
+              f"(스트리밍 없이는 {total:.2f}초 후에 모든 문장을 한 번에 받음)")
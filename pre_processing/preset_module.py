@@ -1,124 +1,186 @@
-import cv2
+import os
 import random
 from pathlib import Path
 import json
-import re
 import shutil
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from pathlib import Path
+from frame_sampler import (
+    INTERVAL_SEC,
+    choose_read_mode,
+    interval_frame_indices,
+    uniform_frame_indices,
+    select_evenly,
+)
+from frame_plan import build_frame_plan, execute_frame_plan
+from frame_pipeline import run_pipeline
+from frame_dedup import dedup_frames
+from frame_quality import filter_quality
+from frame_diversity import select_diverse
+from frame_cache import FrameCache, cached_extract
+from video_probe import VideoProbeIndex, probe_video
+from frame_manifest import write_frame_manifest
+from run_manifest import DEFAULT_MANIFEST_DIRNAME, RunManifest, VideoRun
+from llm_cache import LLMResponseCache, counter_delta
+from llm_stream import validate_sentence
+from llm_backend import BACKEND_NAMES, DEFAULT_BACKEND
+from llm_metrics import call_label
+from prompt_context import PromptContextCache
+from decoders import DECODER_NAMES, get_decoder
+from frame_profiles import (
+    validate_profiles,
+    profile_variants,
+    copy_profile_images,
+    write_profiles_manifest,
+    profile_entries,
+    rank_profiles,
+    profile_dir,
+)
 from video_llm_RnD import (
-    setup_gemini_api,
-    get_images_from_folder,
-    encode_image,
-    analyze_images_with_gemini,
+    ANALYSIS_MODES,
+    IMAGE_PACKING_MODES,
     transform2,
+    transform2_from_memory,
 )
 
-def extract_frames_from_video(video_path, output_dir, num_frames=45):
-    # 비디오 캡처 객체 생성
-    cap = cv2.VideoCapture(video_path)
-    
-    # 비디오 정보 가져오기
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration_sec = frame_count / fps
-    
-    print(f"비디오 정보: {frame_count} 프레임, {fps:.2f} FPS, {duration_sec:.2f}초")
-    
-    # 2초 간격으로 프레임 추출
-    frame_interval = int(fps * 2)  # 2초 = fps * 2
-    saved_frames = []
-    video_stem = Path(video_path).stem
-    
-    print(f"프레임 추출 시작: 2초 간격, 추출 간격: {frame_interval} 프레임")
-    
-    frame_idx = 0
-    idx = 0
-    
-    while frame_idx < frame_count and idx < num_frames:
-        # 현재 프레임 위치를 frame_idx로 설정
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        success, frame = cap.read()
-        
-        if not success:
-            print(f"❌ 프레임 읽기 실패 (#{idx+1})")
-            frame_idx += frame_interval
-            continue
+# 장면 요약(scene_summary) 방식
+# - off    : 요약하지 않음 (기존 동작, "test")
+# - disk   : 저장된 _V_ 이미지 폴더로 transform2 호출
+# - stream : 프레임 계획에서 인코딩한 _V_ 이미지 바이트를 메모리로 바로 전달
+SCENE_SUMMARY_MODES = ("off", "disk", "stream")
+
+# _O_ 12장 / _V_ 9장 선택 방식
+# - even   : 후보 전체에 고르게 (기존 동작)
+# - diverse: 내용(색상/구도)이 서로 가장 다른 프레임 (최원점 샘플링, frame_diversity 참고)
+FRAME_SELECTORS = ("even", "diverse")
 
-        # 프레임 파일명 생성 및 저장
-        frame_filename = f"{video_stem}_frame_{idx+1:02}.jpg"
-        filepath = output_dir / frame_filename
+# 후보 프레임 수 (extracted_frames)
+NUM_CANDIDATE_FRAMES = 45
 
-        # 프레임 저장
-        success = cv2.imwrite(str(filepath), frame)
+def extract_frames_from_video(
+    video_path, output_dir, num_frames=45, read_mode="auto", frame_log=None, workers=None, profiles=None,
+    decoder="opencv",
+):
+    # 디코더 생성 (opencv / ffmpeg / pyav, 설치되지 않았으면 opencv, 예외가 나도 with 를 벗어나면 해제)
+    with get_decoder(decoder, video_path, read_mode) as video_decoder:
+        # 비디오 정보 가져오기
+        fps = video_decoder.fps
+        frame_count = video_decoder.frame_count
+        duration_sec = frame_count / fps
         
-        if success:
-            # 프레임 파일명 리스트에 추가
-            saved_frames.append(frame_filename)
-            print(f"✅ 저장 완료: {filepath.name} (시간: {frame_idx/fps:.1f}초)")
-        else:
-            print(f"⚠️ 저장 실패: {filepath.resolve()}")
+        print(f"비디오 정보: {frame_count} 프레임, {fps:.2f} FPS, {duration_sec:.2f}초")
+        
+        # INTERVAL_SEC 초 간격으로 프레임 추출
+        frame_interval = int(fps * INTERVAL_SEC)
+        saved_frames = []
+        video_stem = Path(video_path).stem
+        
+        # 읽기 실패 시 다음 간격으로 넘어가므로 후보는 영상 끝까지
+        frame_indices = interval_frame_indices(fps, frame_count) if num_frames > 0 else range(0)
+        read_mode = choose_read_mode(frame_indices, read_mode)
+
+        print(f"프레임 추출 시작: {INTERVAL_SEC}초 간격, 추출 간격: {frame_interval} 프레임, 디코더: {video_decoder.name}, 읽기 모드: {read_mode}")
         
-        idx += 1
-        frame_idx += frame_interval
+        def decode():
+            # 파일명은 디코딩 순서대로 결정 (인코딩/저장은 파이프라인에서 병렬 처리)
+            idx = 0
+            for frame_idx, success, frame in video_decoder.read_frames(frame_indices):
+                if not success:
+                    print(f"❌ 프레임 읽기 실패 (#{idx+1})")
+                    continue
+
+                # 프레임 파일명 생성
+                frame_filename = f"{video_stem}_frame_{idx+1:02}.jpg"
+                yield frame_idx, frame, [output_dir / frame_filename]
+
+                idx += 1
+                if idx >= num_frames:
+                    break
+
+        def on_written(frame_idx, paths, nbytes):
+            # 프레임 파일명 리스트에 추가 (저장 순서 = 디코딩 순서)
+            saved_frames.append(paths[0].name)
+            if frame_log is not None:
+                frame_log[paths[0].name] = frame_idx
+            print(f"✅ 저장 완료: {paths[0].name} (시간: {frame_idx/fps:.1f}초)")
+
+        def on_failed(frame_idx, paths):
+            print(f"⚠️ 저장 실패: {paths[0].resolve()}")
+
+        run_pipeline(
+            decode(),
+            workers=workers,
+            on_written=on_written,
+            on_failed=on_failed,
+            variants=profile_variants(profiles or [], output_dir),
+        )
     
-    # 비디오 캡처 객체 해제
-    cap.release()
     
     print(f"프레임 추출 완료: {len(saved_frames)}개 저장됨")
     return saved_frames
 
-def extract_45_frames_from_video(video_path, output_dir, num_frames=45):
-    # 비디오 캡처 객체 생성
-    cap = cv2.VideoCapture(video_path)
-    
-    # 비디오 정보 가져오기
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration_sec = frame_count / fps
-    
-    print(f"비디오 정보: {frame_count} 프레임, {fps:.2f} FPS, {duration_sec:.2f}초")
-    
-    # 프레임 추출 간격 계산
-    step = max(1, int(frame_count / num_frames))
-    saved_frames = []
-    video_stem = Path(video_path).stem
-    
-    print(f"프레임 추출 시작: {num_frames}개, 간격: {step} 프레임")
-    
-    for idx, frame_idx in enumerate(range(0, frame_count, step)):
-        if idx >= num_frames:
-            break
+def extract_45_frames_from_video(
+    video_path, output_dir, num_frames=45, read_mode="auto", frame_log=None, workers=None, profiles=None,
+    decoder="opencv",
+):
+    # 디코더 생성 (opencv / ffmpeg / pyav, 설치되지 않았으면 opencv, 예외가 나도 with 를 벗어나면 해제)
+    with get_decoder(decoder, video_path, read_mode) as video_decoder:
+        # 비디오 정보 가져오기
+        fps = video_decoder.fps
+        frame_count = video_decoder.frame_count
+        duration_sec = frame_count / fps
         
-        # 현재 프레임 위치를 frame_idx 로 설정
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        success, frame = cap.read()
+        print(f"비디오 정보: {frame_count} 프레임, {fps:.2f} FPS, {duration_sec:.2f}초")
         
-        if not success:
-            print(f"❌ 프레임 읽기 실패 (#{idx+1})")
-            continue
-
-        # 프레임 파일명 생성 및 저장
-        frame_filename = f"{video_stem}_frame_{idx+1:02}.jpg"
-        filepath = output_dir / frame_filename
+        # 프레임 추출 간격 계산
+        step = max(1, int(frame_count / num_frames))
+        saved_frames = []
+        video_stem = Path(video_path).stem
+        
+        frame_indices = uniform_frame_indices(frame_count, num_frames)
+        read_mode = choose_read_mode(frame_indices, read_mode)
 
-        # 프레임 저장
-        success = cv2.imwrite(str(filepath), frame)
+        print(f"프레임 추출 시작: {num_frames}개, 간격: {step} 프레임, 디코더: {video_decoder.name}, 읽기 모드: {read_mode}")
         
-        if success:
-            # 프레임 파일명 리스트에 추가
-            saved_frames.append(frame_filename)
-            print(f"✅ 저장 완료: {filepath.name}")
-        else:
-            print(f"⚠️ 저장 실패: {filepath.resolve()}")
+        def decode():
+            # 파일명은 디코딩 순서대로 결정 (인코딩/저장은 파이프라인에서 병렬 처리)
+            for idx, (frame_idx, success, frame) in enumerate(video_decoder.read_frames(frame_indices)):
+                if not success:
+                    print(f"❌ 프레임 읽기 실패 (#{idx+1})")
+                    continue
+
+                # 프레임 파일명 생성
+                frame_filename = f"{video_stem}_frame_{idx+1:02}.jpg"
+                yield frame_idx, frame, [output_dir / frame_filename]
+
+        def on_written(frame_idx, paths, nbytes):
+            # 프레임 파일명 리스트에 추가 (저장 순서 = 디코딩 순서)
+            saved_frames.append(paths[0].name)
+            if frame_log is not None:
+                frame_log[paths[0].name] = frame_idx
+            print(f"✅ 저장 완료: {paths[0].name}")
+
+        def on_failed(frame_idx, paths):
+            print(f"⚠️ 저장 실패: {paths[0].resolve()}")
+
+        run_pipeline(
+            decode(),
+            workers=workers,
+            on_written=on_written,
+            on_failed=on_failed,
+            variants=profile_variants(profiles or [], output_dir),
+        )
     
-    # 비디오 캡처 객체 해제
-    cap.release()
     
     print(f"프레임 추출 완료: {len(saved_frames)}개 저장됨")
     return saved_frames    
 
-def process_images_and_create_folders(saved_frames, output_dir, output_dir_vo, video_stem):
+def process_images_and_create_folders(
+    saved_frames, output_dir, output_dir_vo, video_stem, frame_log=None, profiles=None, selector="even"
+):
     """
     이미지 처리 및 폴더 생성 함수
     
@@ -127,6 +189,9 @@ def process_images_and_create_folders(saved_frames, output_dir, output_dir_vo, v
         output_dir (Path): 프레임이 저장된 디렉토리
         output_dir_vo (Path): 최종 출력 디렉토리
         video_stem (str): 비디오 파일명 (확장자 제외)
+        frame_log (dict): {파일명: 원본 프레임 번호}, 지정하면 복사한 _O_/_V_ 파일도 추가
+        profiles (list): 추출 프로파일 이름, 지정하면 프로파일 이미지도 같은 이름으로 복사
+        selector (str): 선택 방식 ("even", "diverse" - FRAME_SELECTORS 참고)
         
     Returns:
         tuple: (image_object_filenames, image_V_map)
@@ -143,19 +208,16 @@ def process_images_and_create_folders(saved_frames, output_dir, output_dir_vo, v
     image_V_dir.mkdir(exist_ok=True)
     print(f"✅ image_VQA 폴더 생성: {image_V_dir}")
 
+    if selector not in FRAME_SELECTORS:
+        raise ValueError(f"지원하지 않는 선택 방식입니다: {selector}")
+    if selector == "diverse":
+        # 내용이 서로 가장 다른 12개 / 9개 (시간 순서 유지)
+        diverse = select_diverse(saved_frames, output_dir, (12, 9))
+
     # save_frame에서 순서를 고려한 12개 추출
     # 전체 프레임을 고르게 분포시켜서 12개 선택 (앞, 중간, 뒤 프레임 모두 포함)
-    if len(saved_frames) >= 12:
-        # 12개를 고르게 분포시켜 선택
-        step = len(saved_frames) // 12
-        selected_indices = [i * step for i in range(12)]
-        # 마지막 프레임이 빠질 수 있으므로 마지막 인덱스 조정
-        if selected_indices[-1] >= len(saved_frames):
-            selected_indices[-1] = len(saved_frames) - 1
-        selected_12 = [saved_frames[i] for i in selected_indices]
-    else:
-        # 프레임이 12개 미만인 경우 모두 선택
-        selected_12 = saved_frames
+    # 프레임이 12개 미만인 경우 모두 선택
+    selected_12 = diverse[12] if selector == "diverse" else select_evenly(saved_frames, 12)
     
     image_object_filenames = [f"{video_stem}_O_{i+1}.jpg" for i in range(len(selected_12))]
 
@@ -164,21 +226,16 @@ def process_images_and_create_folders(saved_frames, output_dir, output_dir_vo, v
         src_path = output_dir / src_name
         dst_path = image_object_dir / dst_name
         shutil.copy(src_path, dst_path)
+        if frame_log is not None and src_name in frame_log:
+            frame_log[dst_name] = frame_log[src_name]
+        if profiles:
+            copy_profile_images(profiles, output_dir, src_name, image_object_dir, dst_name)
         print(f"✅ 복사 완료: {src_name} → {dst_name}")
 
     # save_frame에서 순서를 고려한 9개 추출
     # 전체 프레임을 고르게 분포시켜서 9개 선택 (앞, 중간, 뒤 프레임 모두 포함)
-    if len(saved_frames) >= 9:
-        # 9개를 고르게 분포시켜 선택
-        step = len(saved_frames) // 9
-        selected_indices = [i * step for i in range(9)]
-        # 마지막 프레임이 빠질 수 있으므로 마지막 인덱스 조정
-        if selected_indices[-1] >= len(saved_frames):
-            selected_indices[-1] = len(saved_frames) - 1
-        selected_9 = [saved_frames[i] for i in selected_indices]
-    else:
-        # 9개 미만인 경우 모두 선택
-        selected_9 = saved_frames
+    # 9개 미만인 경우 모두 선택
+    selected_9 = diverse[9] if selector == "diverse" else select_evenly(saved_frames, 9)
     image_V_map = {f"image_VQA_{i+1:02}": f"{video_stem}_V_{i+1}.jpg" for i in range(len(selected_9))}
     
     print(image_V_map)
@@ -190,12 +247,39 @@ def process_images_and_create_folders(saved_frames, output_dir, output_dir_vo, v
         dst_name = f"{video_stem}_V_{i+1}.jpg"
         dst_path = image_V_dir / dst_name
         shutil.copy(src_path, dst_path)
+        if frame_log is not None and src_name in frame_log:
+            frame_log[dst_name] = frame_log[src_name]
+        if profiles:
+            copy_profile_images(profiles, output_dir, src_name, image_V_dir, dst_name)
         print(f"✅ VQA 이미지 복사: {src_name} → {dst_name}")
 
     return image_object_filenames, image_V_map
 
 
-def create_vqa_metadata_and_save(video_name, image_object_filenames, image_V_map, output_dir, video_stem, output_dir_json):
+def save_image_objects(output_dir_vo, video_stem, image_V_map, objects):
+    """
+    통합 분석(combined)의 이미지별 객체 목록 저장 ({video_stem}_objects.json)
+
+    Args:
+        output_dir_vo (Path): 최종 출력 디렉토리
+        video_stem (str): 비디오 파일명 (확장자 제외)
+        image_V_map (dict): image_VQA 이미지 매핑 (이미지 번호 순서)
+        objects (list): 이미지별 객체명 리스트 (image_V_map 순서)
+
+    Returns:
+        Path: 저장된 파일 경로
+    """
+    data = {file_name: items for file_name, items in zip(image_V_map.values(), objects)}
+    path = Path(output_dir_vo) / f"{video_stem}_objects.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"✅ 이미지별 객체 저장 완료: {path}")
+    return path
+
+
+def create_vqa_metadata_and_save(
+    video_name, image_object_filenames, image_V_map, output_dir, video_stem, output_dir_json, scene_summary=None
+):
     """
     VQA 유형 선택 및 메타데이터 생성 및 저장 함수
     
@@ -205,6 +289,7 @@ def create_vqa_metadata_and_save(video_name, image_object_filenames, image_V_map
         image_V_map (dict): image_VQA 이미지 매핑
         output_dir (Path): JSON 파일을 저장할 디렉토리
         video_stem (str): 비디오 파일명 (확장자 제외)
+        scene_summary (str): 장면 요약 결과 (None 이면 "test")
         
     Returns:
         dict: 생성된 메타데이터
@@ -232,7 +317,7 @@ def create_vqa_metadata_and_save(video_name, image_object_filenames, image_V_map
     t2_json_folder_path = output_dir_json
 
     #result = transform2(t2_json_folder_path)
-    result = "test"
+    result = scene_summary if scene_summary is not None else "test"
 
     # 메타데이터 구성
     output_data = {
@@ -251,41 +336,586 @@ def create_vqa_metadata_and_save(video_name, image_object_filenames, image_V_map
     print(f"✅ 메타데이터 저장 완료: {json_output_path}")
     return output_data
 
+# 경로 및 제한 설정
+VIDEO_ROOT = os.getenv("VIDEO_ROOT", r"C:\guide\videos")
+PRESET_ROOT = os.getenv("PRESET_ROOT", r"C:\guide\preset_data")
+MAX_DURATION_SEC = 280
+
 video_names = [
     "input.mp4"
 ]
 
-for video_name in video_names:
-# Culture, Drama, Entertainment, News
-    category = "seonghoon_250821"
-    video_path = fr"C:\guide\videos\{category}\{video_name}"
-    output_dir = Path(fr"C:\guide\preset_data\{category}\{video_name}\extracted_frames")
-    output_dir_json = Path(fr"C:\guide\preset_data\{category}\{video_name}")
+
+def process_video(
+    video_name,
+    category,
+    use_frame_plan=False,
+    keep_extracted=True,
+    sampling="interval",
+    dedup_distance=None,
+    use_cache=False,
+    probe_index=None,
+    profiles=None,
+    scene_summary="off",
+    write_images=True,
+    decoder="opencv",
+    quality_filter=False,
+    selector="even",
+    run_manifest=None,
+    llm_cache=False,
+    llm_analysis="summary",
+    llm_packing="separate",
+    llm_stream=False,
+    prompt_context=False,
+    llm_backend=None,
+):
+    """
+    비디오 1개에 대한 전체 프리셋 생성 파이프라인
+    (영상 길이 확인 → 프레임 추출 → 이미지 선택/복사 → 메타데이터 저장)
+    함께 쓸 수 없는 옵션 조합은 ValueError, 다른 옵션에 따라 바뀌는 옵션은 바뀐 값을 출력한다.
+
+    Args:
+        video_name (str): 비디오 파일명
+        category (str): 카테고리 폴더명
+        use_frame_plan (bool): 필요한 프레임만 한 번 디코딩하여 _O_/_V_ 이미지를 바로 저장
+        keep_extracted (bool): 프레임 계획 사용 시 extracted_frames 폴더도 저장할지 여부
+        sampling (str): "interval", "uniform", "shots" 중 하나 ("shots" 는 프레임 계획으로 처리)
+        dedup_distance (int): 지정하면 이 해밍 거리 이하의 중복 프레임을 선택 전에 제거
+            (quality_filter, selector="diverse" 와 마찬가지로 프레임 계획/shots/stream 요약과 함께 사용 불가)
+        use_cache (bool): 프레임 추출 캐시 사용 (같은 영상/파라미터면 디코딩 생략)
+        probe_index (str): 비디오 메타데이터 인덱스 경로 (지정하면 영상 정보를 인덱스에서 조회)
+        profiles (list): 추가 추출 프로파일 이름 (예: ["llm"]), 같은 디코딩에서 profiles/<이름>/ 에 함께 저장
+        scene_summary (str): "off", "disk", "stream" 중 하나 (SCENE_SUMMARY_MODES 참고)
+        write_images (bool): stream 요약 시 _O_/_V_ 이미지를 디스크에 저장할지 여부
+        decoder (str): 디코더 백엔드 ("opencv", "ffmpeg", "pyav", "auto")
+        quality_filter (bool): 검은/흐린/페이드 중인 프레임을 선택 전에 제거
+        selector (str): _O_/_V_ 선택 방식 ("even", "diverse" - FRAME_SELECTORS 참고)
+        run_manifest (str): 실행 매니페스트 폴더, 지정하면 완료된 단계는 건너뛰고 이어서 처리 (run_manifest.py)
+        llm_cache (bool): 장면 요약 응답 캐시 사용 (같은 이미지/프롬프트/모델이면 API 호출 생략, llm_cache.py)
+        llm_analysis (str): "summary" 또는 "combined" (요약 + 이미지별 객체를 한 번에 요청, {stem}_objects.json 저장)
+        llm_packing (str): "separate" 또는 "grid" (_V_ 이미지를 번호 붙인 격자 이미지로 합쳐 전송, image_grid.py)
+        llm_stream (bool): 장면 요약을 스트리밍으로 받아 문장이 완성될 때마다 바로 규칙 검사 (summary 만 지원)
+        prompt_context (bool): 장면 요약 고정 지시문을 Gemini 컨텍스트 캐시로 한 번만 등록해 재사용
+            (summary + separate 만 지원, 미지원 환경에서는 지시문 직접 전송, prompt_context.py)
+            기본 모델 gemini-2.5-pro 는 지시문(약 500토큰)이 최소 토큰 수(4096)에 못 미쳐 등록되지 않음 (절감 0)
+        llm_backend (str): 장면 요약 LLM 백엔드 ("gemini", "fake" - 로컬 가짜 서버, None 이면 LLM_BACKEND, llm_backend.py)
+
+    Returns:
+        dict: 처리 결과 요약
+    """
+    video_path = str(Path(VIDEO_ROOT) / category / video_name)
+    output_dir = Path(PRESET_ROOT) / category / video_name / "extracted_frames"
+    output_dir_json = Path(PRESET_ROOT) / category / video_name
 
     #추출한 이미지 저장 경로
-    output_dir_vo = Path(fr"C:\guide\preset_data\{category}\{video_name}")
+    output_dir_vo = Path(PRESET_ROOT) / category / video_name
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # 영상 길이 확인
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration_sec = frame_count / fps
-    if duration_sec > 280:
-        raise ValueError("❌ 영상 길이가 1분을 초과합니다.")
-
-    # 함수 호출
-    saved_frames = extract_frames_from_video(video_path, output_dir)
     video_stem = Path(video_path).stem
+    plan_result = None
+    dedup_report = None
+    quality_report = None
+    # 중복 제거/품질 필터/다양성 선택은 후보 프레임 이미지 전체가 필요함
+    filter_candidates = dedup_distance is not None or quality_filter or selector == "diverse"
 
-    image_object_filenames, image_V_map = process_images_and_create_folders(
-        saved_frames, output_dir, output_dir_vo, video_stem
-    )
+    if filter_candidates and (use_frame_plan or sampling == "shots" or scene_summary == "stream"):
+        # 후보 프레임 필터는 추출한 프레임 전체가 필요하므로 프레임 계획(shots, stream 요약 포함)과 함께 쓸 수 없음
+        raise ValueError(
+            "dedup_distance / quality_filter / selector=\"diverse\" 는 use_frame_plan, sampling=\"shots\", "
+            "scene_summary=\"stream\" 과 함께 사용할 수 없습니다"
+        )
+
+    if scene_summary not in SCENE_SUMMARY_MODES:
+        raise ValueError(f"지원하지 않는 장면 요약 방식입니다: {scene_summary}")
+    if llm_analysis not in ANALYSIS_MODES:
+        raise ValueError(f"지원하지 않는 분석 방식입니다: {llm_analysis}")
+    if llm_packing not in IMAGE_PACKING_MODES:
+        raise ValueError(f"지원하지 않는 이미지 전송 방식입니다: {llm_packing}")
+    if llm_stream and llm_analysis == "combined":
+        raise ValueError("스트리밍 요약은 summary 분석에서만 지원합니다")
+    if prompt_context and (llm_analysis != "summary" or llm_packing != "separate"):
+        raise ValueError("프롬프트 컨텍스트 캐시는 summary 분석 + separate 전송에서만 지원합니다")
+    llm_backend = llm_backend or DEFAULT_BACKEND
+    if llm_backend not in BACKEND_NAMES:
+        raise ValueError(f"지원하지 않는 LLM 백엔드입니다: {llm_backend}")
+    if scene_summary == "stream" and not use_frame_plan:
+        # 메모리 전달은 프레임 계획에서만 가능
+        print("⚠️ use_frame_plan=False → True (scene_summary=\"stream\" 은 프레임 계획 필요)")
+        use_frame_plan = True
+    if not write_images and scene_summary != "stream":
+        print("⚠️ write_images=False → True (이미지 저장 생략은 scene_summary=\"stream\" 에서만 가능)")
+        write_images = True
+
+    profiles = validate_profiles(profiles or [])
+    if profiles and use_cache:
+        # 캐시에는 원본 프레임만 저장되므로 프로파일 이미지를 만들려면 디코딩 필요
+        print("⚠️ use_cache=True → False (추출 프로파일 사용 시 프레임 캐시를 사용하지 않음)")
+        use_cache = False
+
+    # 단계별 진행 기록 (run_manifest 가 없으면 모든 단계를 새로 실행)
+    run = VideoRun(run_manifest, category, video_name, output_dir_vo, {
+        "sampling": sampling,
+        "use_frame_plan": use_frame_plan,
+        "keep_extracted": keep_extracted,
+        "profiles": profiles,
+        "decoder": decoder,
+        "interval_sec": INTERVAL_SEC,
+        "num_frames": NUM_CANDIDATE_FRAMES,
+        "dedup_distance": dedup_distance,
+        "quality_filter": quality_filter,
+        "selector": selector,
+        "scene_summary": scene_summary,
+        "llm_analysis": llm_analysis,
+        "llm_packing": llm_packing,
+        "llm_backend": llm_backend,
+    }, video_path=video_path)
+    # 메타데이터가 있어도 저장한 이미지가 바뀌었으면 다시 처리
+    finished = run.done("metadata")
+    if finished is not None and (not write_images or run.done("selected") is not None):
+        print(f"⏭️ 이미 완료된 비디오, 건너뜀: {video_name}")
+        return {**finished, "resumed": True}
+
+    # 영상 길이 확인 (인덱스가 있으면 영상을 다시 열지 않음)
+    video_info = run.done("probed")
+    if video_info is None:
+        if probe_index:
+            index = VideoProbeIndex(probe_index)
+            video_info = index.get_or_probe(video_path)
+            index.close()
+        else:
+            video_info = probe_video(video_path)
+        run.complete("probed", data=video_info)
+    duration_sec = video_info["duration"]
+    if duration_sec > MAX_DURATION_SEC:
+        raise ValueError(f"❌ 영상 길이가 {MAX_DURATION_SEC}초를 초과합니다. ({duration_sec:.1f}초)")
+
+    selected = run.done("selected")
+    if selected is not None:
+        # 이전 실행에서 저장한 _O_/_V_ 이미지 그대로 사용
+        print(f"⏭️ 이미지 선택 단계 복원: 객체 {len(selected['image_object_filenames'])}장, "
+              f"VQA {len(selected['image_V_map'])}장")
+        saved_frames = selected["saved_frames"]
+        image_object_filenames = selected["image_object_filenames"]
+        image_V_map = selected["image_V_map"]
+        dedup_report = selected["dedup"]
+        quality_report = selected["quality"]
+    else:
+        if use_frame_plan or sampling == "shots":
+            run.start("extracted")
+            plan = build_frame_plan(
+                video_path, output_dir, output_dir_vo, num_frames=NUM_CANDIDATE_FRAMES, sampling=sampling,
+                keep_extracted=keep_extracted, decoder=decoder,
+            )
+            plan_result = execute_frame_plan(
+                plan,
+                profiles=profiles,
+                keep_in_memory=list(plan["image_V_map"].values()) if scene_summary == "stream" else None,
+                write_files=write_images,
+                decoder=decoder,
+            )
+            saved_frames = plan["saved_frames"]
+            image_object_filenames = plan["image_object_filenames"]
+            image_V_map = plan["image_V_map"]
+            frame_log = plan["frame_log"]
+            if plan_result["failed_frames"]:
+                # 읽기 실패가 있으면 선택 결과가 달라지므로 기존 방식으로 다시 처리
+                print("⚠️ 프레임 계획 실행 중 읽기 실패, 기존 추출 방식으로 재처리")
+                plan_result = None
+                write_images = True
+
+        if plan_result is None:
+            # 함수 호출 (파일명 → 원본 프레임 번호 기록)
+            sampling = "uniform" if sampling == "uniform" else "interval"
+            extracted = run.done("extracted")
+            if extracted is not None and not extracted.get("files_written", True):
+                # 프레임 계획에서 후보 프레임 파일을 저장하지 않았으면 다시 추출
+                extracted = None
+            if extracted is not None:
+                print(f"⏭️ 프레임 추출 단계 복원: {len(extracted['saved_frames'])}개")
+                saved_frames = extracted["saved_frames"]
+                frame_log = dict(extracted["frame_log"])
+            else:
+                run.start("extracted")
+                frame_log = {}
+                extract_fn = extract_45_frames_from_video if sampling == "uniform" else extract_frames_from_video
+                if use_cache:
+                    saved_frames = cached_extract(
+                        extract_fn, video_path, output_dir, FrameCache(), frame_log=frame_log,
+                        num_frames=NUM_CANDIDATE_FRAMES,
+                        read_mode="auto", decoder=decoder,
+                    )
+                else:
+                    saved_frames = extract_fn(
+                        video_path, output_dir, num_frames=NUM_CANDIDATE_FRAMES, frame_log=frame_log,
+                        profiles=profiles, decoder=decoder,
+                    )
+                run.complete(
+                    "extracted",
+                    outputs=[output_dir / name for name in saved_frames],
+                    data={"saved_frames": saved_frames, "frame_log": frame_log},
+                )
+
+            # 사용할 수 없는 프레임, 거의 같은 프레임을 제거한 후보에서 선택
+            # (흐린 프레임이 중복 그룹의 대표로 남지 않도록 품질 필터를 먼저 적용)
+            run.start("selected")
+            candidate_frames = saved_frames
+            if quality_filter:
+                candidate_frames, quality_report = filter_quality(candidate_frames, output_dir)
+            if dedup_distance is not None:
+                candidate_frames, dedup_report = dedup_frames(candidate_frames, output_dir, dedup_distance)
+
+            image_object_filenames, image_V_map = process_images_and_create_folders(
+                candidate_frames, output_dir, output_dir_vo, video_stem, frame_log, profiles, selector
+            )
+        elif write_images:
+            run.complete(
+                "extracted",
+                outputs=[output_dir / name for name in saved_frames] if keep_extracted else [],
+                data={
+                    "saved_frames": saved_frames,
+                    "candidate_indices": plan["candidate_indices"],
+                    "frame_log": frame_log,
+                    "files_written": keep_extracted,
+                },
+            )
+
+        if write_images:
+            outputs = []
+            if profiles:
+                # 프로파일별 이미지 크기/예상 토큰 수 (transform2 가 토큰 예산에 맞는 프로파일 선택)
+                outputs.append(
+                    write_profiles_manifest(output_dir_vo, profiles, video_info["width"], video_info["height"])
+                )
+
+            # 이미지 파일명 → 프레임 번호/시간 매니페스트 (후처리의 image_frame 필드용)
+            strategy = sampling
+            if quality_report is not None:
+                strategy += "+quality"
+            if dedup_report is not None:
+                strategy += "+dedup"
+            if selector != "even":
+                strategy += f"+{selector}"
+            outputs.append(
+                write_frame_manifest(output_dir_vo, video_stem, video_path, video_info["fps"], strategy, frame_log)
+            )
+
+            # 다음 실행에서 이 단계를 건너뛸 수 있도록 선택 결과와 출력 파일 체크섬 기록
+            for name in image_object_filenames + list(image_V_map.values()):
+                outputs.append(output_dir_vo / name)
+                outputs.extend(profile_dir(output_dir_vo, profile) / name for profile in profiles)
+            run.complete("selected", outputs=outputs, data={
+                "saved_frames": saved_frames,
+                "image_object_filenames": image_object_filenames,
+                "image_V_map": image_V_map,
+                "dedup": dedup_report,
+                "quality": quality_report,
+            })
+
+    # 장면 요약
+    summary = None
+    sentence_issues = None
+    context_stats = None
+    if scene_summary != "off":
+        summarized = run.done("summarized")
+        if summarized is not None:
+            print("⏭️ 장면 요약 단계 복원")
+            summary = summarized["summary"]
+            sentence_issues = summarized.get("sentence_issues")
+        else:
+            run.start("summarized")
+            cache = LLMResponseCache() if llm_cache else None
+            context_cache = PromptContextCache() if prompt_context else None
+            on_sentence = None
+            if llm_stream:
+                # 생성이 끝나기 전에 도착한 문장부터 검사
+                sentence_issues = {}
+                def on_sentence(index, sentence):
+                    issues = validate_sentence(sentence)
+                    print(f"📝 {index + 1}. {sentence}" + (f"  ⚠️ {', '.join(issues)}" if issues else ""))
+                    if issues:
+                        sentence_issues[str(index + 1)] = issues
+            # LLM 호출 지표(llm_metrics.py)는 비디오별로 기록
+            with call_label(f"{category}/{video_name}"):
+                if scene_summary == "stream" and plan_result is not None:
+                    # 디스크 재로드 없이 인코딩 결과를 그대로 전달 (토큰 예산에 맞는 프로파일 선택)
+                    entries = profile_entries(profiles, video_info["width"], video_info["height"])
+                    profile_name, _ = rank_profiles(entries, len(image_V_map))
+                    images = plan_result["images"]
+                    analysis = transform2_from_memory(
+                        [images[name][profile_name] for name in image_V_map.values()], cache, llm_analysis,
+                        llm_packing, on_sentence, context_cache, llm_backend,
+                    )
+                else:
+                    analysis = transform2(
+                        str(output_dir_vo), cache=cache, mode=llm_analysis, packing=llm_packing,
+                        on_sentence=on_sentence, context_cache=context_cache, backend=llm_backend,
+                    )
+            if cache is not None:
+                cache.close()
+            if context_cache is not None:
+                context_stats = dict(context_cache.stats)
+                context_cache.close()
+
+            outputs = []
+            if llm_analysis == "combined":
+                # 요약 문장은 하나의 단락으로, 이미지별 객체는 별도 파일로 저장
+                summary = " ".join(analysis["summary"])
+                outputs.append(save_image_objects(output_dir_vo, video_stem, image_V_map, analysis["objects"]))
+            else:
+                summary = analysis
+            data = {"summary": summary}
+            if sentence_issues is not None:
+                data["sentence_issues"] = sentence_issues
+            run.complete("summarized", outputs=outputs, data=data)
 
     # VQA 메타데이터 생성 및 저장
-    metadata = create_vqa_metadata_and_save(
-        video_name, image_object_filenames, image_V_map, output_dir, video_stem, output_dir_json
+    run.start("metadata")
+    create_vqa_metadata_and_save(
+        video_name, image_object_filenames, image_V_map, output_dir, video_stem, output_dir_json, summary
     )
 
+    result = {
+        "frames": len(saved_frames),
+        "object_images": len(image_object_filenames),
+        "vqa_images": len(image_V_map),
+    }
+    if dedup_report is not None:
+        result["dedup"] = dedup_report
+    if quality_report is not None:
+        result["quality"] = quality_report
+    if sentence_issues is not None:
+        result["sentence_issues"] = sentence_issues
+    if context_stats is not None:
+        result["prompt_context"] = context_stats
+    run.complete("metadata", outputs=[output_dir_json / f"{video_stem}_metadata.json"], data=result)
+    return result
+
+
+def _failed_result(video_name, error, elapsed=0.0, detail=""):
+    """실패 결과 항목 생성"""
+    return {
+        "video_name": video_name,
+        "status": "failed",
+        "error": error,
+        "traceback": detail,
+        "elapsed": elapsed,
+    }
+
+
+def _run_video_safely(video_name, category, options=None):
+    """예외를 잡아 결과 항목으로 반환 (한 비디오의 실패가 배치를 멈추지 않도록)"""
+    start = time.time()
+    try:
+        result = process_video(video_name, category, **(options or {}))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if options and options.get("run_manifest"):
+            # 다음 실행 때 실패한 단계부터 재시도
+            RunManifest(options["run_manifest"]).record_failure(category, video_name, error)
+        return _failed_result(video_name, error, time.time() - start, traceback.format_exc())
+    return {"video_name": video_name, "status": "ok", **result, "elapsed": time.time() - start}
+
+
+def _run_isolated(video_name, category, options=None):
+    """단독 프로세스에서 실행 (프로세스 비정상 종료를 해당 비디오 실패로 한정)"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(_run_video_safely, video_name, category, options).result()
+        except BrokenProcessPool as e:
+            return _failed_result(video_name, f"프로세스 비정상 종료: {e}")
+
+
+def _llm_cache_counters():
+    """LLM 응답 캐시 누적 적중/미적중 횟수"""
+    cache = LLMResponseCache()
+    counters = cache.counters()
+    cache.close()
+    return counters
+
+
+def print_batch_summary(results, llm_cache_counts=None):
+    """
+    배치 처리 결과를 입력 순서대로 출력
+
+    Args:
+        results (list): 결과 항목 리스트
+        llm_cache_counts (dict): 이번 실행의 LLM 응답 캐시 적중/미적중 횟수 (hits, misses)
+    """
+    ok_count = sum(1 for r in results if r["status"] == "ok")
+    print("\n=== 배치 처리 결과 ===")
+    for i, r in enumerate(results):
+        if r["status"] == "ok":
+            resumed = ", 이전 실행 결과" if r.get("resumed") else ""
+            print(f"{i+1:3d}. ✅ {r['video_name']} - 프레임 {r['frames']}개, "
+                  f"객체 {r['object_images']}장, VQA {r['vqa_images']}장 ({r['elapsed']:.1f}초{resumed})")
+            if "dedup" in r:
+                print(f"       중복 제거 {r['dedup']['dropped']}개, "
+                      f"절감 슬롯: 객체 {r['dedup']['object_slots_saved']}, VQA {r['dedup']['vqa_slots_saved']}")
+            if "quality" in r:
+                counts = {}
+                for reasons in r["quality"]["rejected"].values():
+                    for reason in reasons:
+                        counts[reason] = counts.get(reason, 0) + 1
+                detail = ", ".join(f"{reason} {count}" for reason, count in counts.items()) or "없음"
+                print(f"       품질 필터 제거 {r['quality']['dropped']}개 ({detail})")
+            if r.get("sentence_issues"):
+                print(f"       요약 문장 규칙 위반 {len(r['sentence_issues'])}개 "
+                      f"({', '.join(f'{n}번' for n in r['sentence_issues'])})")
+        else:
+            print(f"{i+1:3d}. ❌ {r['video_name']} - {r['error']}")
+    print(f"성공: {ok_count}개, 실패: {len(results) - ok_count}개, 전체: {len(results)}개")
+    resumed_count = sum(1 for r in results if r.get("resumed"))
+    if resumed_count:
+        print(f"이미 완료되어 건너뜀: {resumed_count}개")
+
+    dedup_reports = [r["dedup"] for r in results if "dedup" in r]
+    if dedup_reports:
+        print(f"중복 제거 합계: 프레임 {sum(d['dropped'] for d in dedup_reports)}개, "
+              f"VQA(API) 이미지 {sum(d['vqa_slots_saved'] for d in dedup_reports)}장 절감")
+    context_reports = [r["prompt_context"] for r in results if "prompt_context" in r]
+    if context_reports:
+        print(f"프롬프트 컨텍스트: 참조 요청 {sum(c['cached_requests'] for c in context_reports)}건, "
+              f"직접 전송 {sum(c['inline_requests'] for c in context_reports)}건, "
+              f"절감 입력 토큰 약 {sum(c['tokens_saved'] for c in context_reports)}")
+    if llm_cache_counts is not None:
+        print(f"LLM 응답 캐시: 적중 {llm_cache_counts['hits']}회, 미적중 {llm_cache_counts['misses']}회")
 
 
+def run_batch(video_names, category, workers=None, **options):
+    """
+    여러 비디오를 프로세스 풀에서 병렬 처리
+
+    Args:
+        video_names (list): 비디오 파일명 리스트
+        category (str): 카테고리 폴더명
+        workers (int): 프로세스 수 (None 이면 CPU 코어 수, 1 이면 현재 프로세스에서 순차 처리)
+        **options: process_video 에 전달할 옵션
+
+    Returns:
+        list: 입력 순서와 같은 순서의 결과 항목 리스트
+    """
+    # 이번 실행의 캐시 적중/미적중 (캐시 DB 의 누적 횟수 차이, 모든 프로세스 합계)
+    cache_before = _llm_cache_counters() if options.get("llm_cache") else None
+
+    if workers == 1:
+        results = [_run_video_safely(video_name, category, options) for video_name in video_names]
+        print_batch_summary(results, cache_before and counter_delta(cache_before, _llm_cache_counters()))
+        return results
+
+    results = [None] * len(video_names)
+    crashed = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_run_video_safely, video_name, category, options) for video_name in video_names
+        ]
+        for i, future in enumerate(futures):
+            try:
+                results[i] = future.result()
+            except BrokenProcessPool:
+                crashed.append(i)
+
+    # 워커 프로세스가 죽으면 풀 전체가 중단되므로, 남은 비디오는 각각 단독 프로세스에서 재실행
+    if crashed:
+        print(f"⚠️ 워커 프로세스 비정상 종료, {len(crashed)}개 비디오를 개별 프로세스로 재실행")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            retried = executor.map(lambda i: _run_isolated(video_names[i], category, options), crashed)
+            for i, result in zip(crashed, retried):
+                results[i] = result
+
+    print_batch_summary(results, cache_before and counter_delta(cache_before, _llm_cache_counters()))
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="프리셋 데이터 일괄 생성")
+    parser.add_argument("videos", nargs="*", default=video_names, help="비디오 파일명 목록")
+    # Culture, Drama, Entertainment, News
+    parser.add_argument("-c", "--category", default="seonghoon_250821", help="카테고리 폴더명")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--frame-plan", action="store_true", help="필요한 프레임만 한 번 디코딩하여 바로 저장")
+    parser.add_argument("--no-extracted", action="store_true", help="프레임 계획 사용 시 extracted_frames 저장 생략")
+    parser.add_argument(
+        "-s", "--sampling", default="interval", choices=["interval", "uniform", "shots"],
+        help="프레임 샘플링 방식 (shots: 샷 경계 기반 선택)",
+    )
+    parser.add_argument(
+        "--dedup", type=int, default=None, metavar="DISTANCE",
+        help="이 해밍 거리 이하의 중복 프레임을 선택 전에 제거 (예: 6)",
+    )
+    parser.add_argument(
+        "--quality-filter", action="store_true", help="검은/흐린/페이드 중인 프레임을 선택 전에 제거",
+    )
+    parser.add_argument(
+        "--selector", default="even", choices=FRAME_SELECTORS,
+        help="_O_/_V_ 선택 방식 (diverse: 내용이 서로 가장 다른 프레임)",
+    )
+    parser.add_argument(
+        "--resume", nargs="?", const=DEFAULT_MANIFEST_DIRNAME, default=None, metavar="MANIFEST_DIR",
+        help=f"실행 매니페스트로 완료된 단계를 건너뛰고 이어서 처리 (기본: PRESET_ROOT/{DEFAULT_MANIFEST_DIRNAME})",
+    )
+    parser.add_argument(
+        "--llm-cache", action="store_true", help="장면 요약 응답 캐시 사용 (관리: python llm_cache.py)",
+    )
+    parser.add_argument("--cache", action="store_true", help="프레임 추출 캐시 사용 (관리: python frame_cache.py)")
+    parser.add_argument("--probe-index", default=None, help="비디오 메타데이터 인덱스 경로 (python video_probe.py scan 으로 생성)")
+    parser.add_argument(
+        "--profiles", default="", help="추가 추출 프로파일 (쉼표 구분, 예: llm,llm_small)",
+    )
+    parser.add_argument(
+        "--scene-summary", default="off", choices=SCENE_SUMMARY_MODES,
+        help="장면 요약 방식 (stream: 추출한 이미지를 메모리로 바로 Gemini 에 전달)",
+    )
+    parser.add_argument(
+        "--llm-analysis", default="summary", choices=ANALYSIS_MODES,
+        help="장면 요약 방식 (combined: 요약 + 이미지별 객체를 한 번의 호출로 요청)",
+    )
+    parser.add_argument(
+        "--llm-packing", default="separate", choices=IMAGE_PACKING_MODES,
+        help="이미지 전송 방식 (grid: 번호 붙인 격자 이미지로 합쳐 입력 토큰 절감)",
+    )
+    parser.add_argument(
+        "--llm-stream", action="store_true", help="장면 요약을 스트리밍으로 받아 문장 단위로 바로 검사",
+    )
+    parser.add_argument(
+        "--prompt-context", action="store_true",
+        help="장면 요약 고정 지시문을 Gemini 컨텍스트 캐시로 재사용 (미지원 시 직접 전송, "
+        "gemini-2.5-pro 는 지시문이 최소 토큰 수 미만이라 효과 없음)",
+    )
+    parser.add_argument(
+        "--llm-backend", default=None, choices=BACKEND_NAMES,
+        help="장면 요약 LLM 백엔드 (fake: 로컬 가짜 서버 - python fake_llm_server.py, 기본 LLM_BACKEND 환경변수)",
+    )
+    parser.add_argument("--no-images", action="store_true", help="stream 요약 시 이미지 파일 저장 생략")
+    parser.add_argument(
+        "--decoder", default="opencv", choices=DECODER_NAMES,
+        help="디코더 백엔드 (없으면 opencv 로 대체, 확인: python decoders.py VIDEO --check)",
+    )
+    args = parser.parse_args()
+
+    run_batch(
+        args.videos,
+        args.category,
+        args.workers,
+        use_frame_plan=args.frame_plan,
+        keep_extracted=not args.no_extracted,
+        sampling=args.sampling,
+        dedup_distance=args.dedup,
+        use_cache=args.cache,
+        probe_index=args.probe_index,
+        profiles=[name for name in args.profiles.split(",") if name],
+        scene_summary=args.scene_summary,
+        write_images=not args.no_images,
+        decoder=args.decoder,
+        quality_filter=args.quality_filter,
+        selector=args.selector,
+        run_manifest=str(Path(PRESET_ROOT) / args.resume) if args.resume else None,
+        llm_cache=args.llm_cache,
+        llm_analysis=args.llm_analysis,
+        llm_packing=args.llm_packing,
+        llm_stream=args.llm_stream,
+        prompt_context=args.prompt_context,
+        llm_backend=args.llm_backend,
+    )
@@ -0,0 +1,249 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+# 등록한 프롬프트 컨텍스트 기록 위치 (여러 프로세스가 같은 컨텍스트를 재사용하도록 SQLite 로 공유)
+DEFAULT_PROMPT_CONTEXT_PATH = os.getenv(
+    "PROMPT_CONTEXT_PATH", str(Path.home() / ".cache" / "cw_modules" / "prompt_contexts.sqlite3")
+)
+
+# 컨텍스트 유효 기간 (초) / 만료까지 이 시간보다 적게 남으면 요청 도중 만료되지 않도록 새로 등록
+DEFAULT_CONTEXT_TTL_SEC = int(os.getenv("PROMPT_CONTEXT_TTL_SEC", "3600"))
+REFRESH_MARGIN_SEC = 60
+
+# 이 프로세스에서 가져온 컨텍스트 객체 (비디오마다 새 PromptContextCache 를 만들어도 조회는 한 번만)
+_PROCESS_CONTEXTS = {}
+
+# 최소 토큰 수 미달을 이미 알린 컨텍스트 키 (비디오마다 같은 경고를 반복하지 않음)
+_REPORTED_BELOW_MINIMUM = set()
+
+# 토큰 수 추정 기준 (video_llm_RnD.PROMPT_CHARS_PER_TOKEN 과 같음, 응답에 캐시 토큰 수가 없을 때 사용)
+CHARS_PER_TOKEN = 2
+
+_COLUMNS = ("key", "name", "model", "instruction_chars", "unsupported", "created_at", "expire_at")
+
+
+def context_key(model_name, instruction):
+    """모델 + 지시문 내용으로 컨텍스트 식별 (지시문이 바뀌면 새로 등록)"""
+    digest = hashlib.sha256(instruction.encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest[:16]}"
+
+
+def estimate_tokens(instruction):
+    """지시문 토큰 수 추정"""
+    return len(instruction) // CHARS_PER_TOKEN
+
+
+class PromptContextCache:
+    """
+    고정 지시문(프롬프트 앞부분) 컨텍스트 캐시 (Gemini CachedContent, 가짜 서버 /v1/contexts)
+
+    요청마다 같은 지시문을 다시 보내지 않도록 모델별로 한 번 등록하고
+    이후 요청은 등록된 컨텍스트를 참조한다. 만료 시각을 기록해 두고 만료가 가까우면 새로 등록한다.
+    컨텍스트 캐시를 지원하지 않는 환경(백엔드 미지원, 최소 토큰 수 미달, 권한 없음 등)에서는
+    None 을 반환하며, 호출하는 쪽은 지시문을 프롬프트에 그대로 붙여 보낸다.
+
+    주의: 현재 장면 요약 지시문(create_analysis_instruction, 약 500토큰)은 기본 모델 gemini-2.5-pro(최소 4096토큰)는
+    물론 gemini-2.5-flash(최소 1024토큰)보다도 짧아 Gemini 에서는 등록하지 않고 항상 직접 전송한다 (절감 토큰 0).
+    지금은 최소 토큰 수가 없는 가짜 서버(fake_llm_server.py)에서만 등록되며, 지시문이 모델 최소보다 길어질 때 효과가 있다.
+    등록 기록은 SQLite 에 두고 조회 → 등록 → 기록을 한 쓰기 트랜잭션으로 처리하므로
+    여러 프로세스(ProcessPoolExecutor 작업자)가 동시에 시작해도 컨텍스트는 한 번만 등록된다.
+
+    Args:
+        registry_path (str): 등록 기록 DB 파일 (프로세스 간 공유)
+        ttl_sec (int): 컨텍스트 유효 기간 (초)
+    """
+
+    def __init__(self, registry_path=DEFAULT_PROMPT_CONTEXT_PATH, ttl_sec=DEFAULT_CONTEXT_TTL_SEC):
+        self.registry_path = Path(registry_path)
+        self.ttl_sec = ttl_sec
+        self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+        # Dispatcher 의 여러 스레드에서 함께 사용 (트랜잭션은 직접 시작)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.registry_path), timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS contexts (
+                key TEXT PRIMARY KEY,
+                name TEXT,
+                model TEXT,
+                instruction_chars INTEGER,
+                unsupported TEXT,
+                created_at REAL,
+                expire_at REAL
+            )
+            """
+        )
+        self._contexts = _PROCESS_CONTEXTS
+        self.stats = {"cached_requests": 0, "inline_requests": 0, "created": 0, "tokens_saved": 0}
+
+    def close(self):
+        self.conn.close()
+
+    def _create(self, backend, instruction):
+        """컨텍스트 등록 (지원하지 않으면 예외)"""
+        return backend.create_context(instruction, self.ttl_sec)
+
+    def _fetch(self, backend, name):
+        return backend.get_context(name)
+
+    def _put(self, entry):
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO contexts ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+            tuple(entry.get(c) for c in _COLUMNS),
+        )
+
+    def get(self, backend, instruction):
+        """
+        지시문의 컨텍스트 조회 (없거나 만료가 가까우면 새로 등록)
+
+        Args:
+            backend (LLMBackend): 요청할 백엔드 (llm_backend.py)
+            instruction (str): 고정 지시문
+
+        Returns:
+            컨텍스트 | None: 사용할 컨텍스트 (None 이면 지시문을 직접 포함해 요청)
+        """
+        if not backend.supports_context_cache:
+            return None
+        key = context_key(backend.model_name, instruction)
+
+        # 모델 최소 토큰 수 미달: 등록 요청이 거절될 것이므로 API 를 호출하지 않음
+        tokens = estimate_tokens(instruction)
+        if tokens < backend.min_context_tokens:
+            if key not in _REPORTED_BELOW_MINIMUM:
+                _REPORTED_BELOW_MINIMUM.add(key)
+                print(
+                    f"⚠️ 프롬프트 컨텍스트 캐시 사용 불가 (최소 토큰 수 미달): 지시문 약 {tokens}토큰 < "
+                    f"{backend.model_name} 최소 {backend.min_context_tokens}토큰, 지시문 직접 전송"
+                )
+            return None
+
+        now = time.time()
+        with self._lock:
+            # 다른 프로세스가 같은 컨텍스트를 동시에 등록하지 않도록 쓰기 잠금을 잡고 조회
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                context = self._get_locked(backend, instruction, key, now)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return context
+
+    def _get_locked(self, backend, instruction, key, now):
+        row = self.conn.execute("SELECT * FROM contexts WHERE key = ?", (key,)).fetchone()
+        if row is not None and row["expire_at"] - now > REFRESH_MARGIN_SEC:
+            if row["unsupported"]:
+                # 지원하지 않는 것으로 기록된 동안은 다시 시도하지 않음
+                return None
+            context = self._contexts.get(key)
+            if context is None or context.name != row["name"]:
+                try:
+                    context = self._fetch(backend, row["name"])
+                except Exception as e:
+                    print(f"⚠️ 프롬프트 컨텍스트 조회 실패, 새로 등록: {type(e).__name__}: {e}")
+                    context = None
+            if context is not None:
+                self._contexts[key] = context
+                return context
+
+        try:
+            context = self._create(backend, instruction)
+        except Exception as e:
+            print(f"⚠️ 프롬프트 컨텍스트 캐시 사용 불가, 지시문 직접 전송: {type(e).__name__}: {e}")
+            self._put({
+                "key": key, "model": backend.model_name, "unsupported": f"{type(e).__name__}: {e}",
+                "created_at": now, "expire_at": now + self.ttl_sec,
+            })
+            return None
+
+        self._contexts[key] = context
+        self._put({
+            "key": key,
+            "name": context.name,
+            "model": backend.model_name,
+            "instruction_chars": len(instruction),
+            "created_at": now,
+            "expire_at": now + self.ttl_sec,
+        })
+        self.stats["created"] += 1
+        print(f"✅ 프롬프트 컨텍스트 등록: {context.name} (유효 {self.ttl_sec}초)")
+        return context
+
+    def invalidate(self, backend, instruction):
+        """컨텍스트가 서버에서 사라진 경우 (요청 실패 시) 기록 삭제 → 다음 get 에서 새로 등록"""
+        key = context_key(backend.model_name, instruction)
+        with self._lock:
+            self._contexts.pop(key, None)
+            self.conn.execute("DELETE FROM contexts WHERE key = ?", (key,))
+
+    def record(self, instruction, response=None, cached=True):
+        """
+        요청 1건 기록 (절감 토큰 수: 응답의 캐시 토큰 수, 없으면 지시문 길이로 추정)
+        """
+        with self._lock:
+            if not cached:
+                self.stats["inline_requests"] += 1
+                return
+            usage = getattr(response, "usage", None) or {}
+            tokens = usage.get("cached_tokens") or estimate_tokens(instruction)
+            self.stats["cached_requests"] += 1
+            self.stats["tokens_saved"] += tokens
+
+    def entries(self):
+        """등록 기록 (키, 기록) 리스트"""
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM contexts ORDER BY key").fetchall()
+        return [(row["key"], dict(row)) for row in rows]
+
+    def clear(self, backend):
+        """등록한 컨텍스트 삭제 및 기록 초기화 (backend 모델의 기록만)"""
+        removed = 0
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM contexts WHERE model = ?", (backend.model_name,)).fetchall()
+            self.conn.execute("DELETE FROM contexts WHERE model = ?", (backend.model_name,))
+        for row in rows:
+            if row["name"] and row["expire_at"] > time.time():
+                try:
+                    backend.delete_context(row["name"])
+                    removed += 1
+                except Exception as e:
+                    print(f"⚠️ {row['name']} 삭제 실패: {type(e).__name__}: {e}")
+        return removed
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python prompt_context.py list / clear
+    import argparse
+
+    from llm_backend import BACKEND_NAMES
+
+    parser = argparse.ArgumentParser(description="프롬프트 컨텍스트 캐시 등록 기록 확인")
+    parser.add_argument("command", choices=["list", "clear"], help="실행할 명령")
+    parser.add_argument("--registry", default=DEFAULT_PROMPT_CONTEXT_PATH, help="등록 기록 DB 파일")
+    parser.add_argument("--llm-backend", choices=BACKEND_NAMES, default=None, help="clear 할 백엔드 (기본 LLM_BACKEND)")
+    args = parser.parse_args()
+
+    contexts = PromptContextCache(args.registry)
+    if args.command == "list":
+        now = time.time()
+        for key, entry in contexts.entries():
+            remaining = entry["expire_at"] - now
+            state = "만료" if remaining <= 0 else f"{remaining / 60:.0f}분 남음"
+            if entry.get("unsupported"):
+                print(f"{key}: 사용 불가 ({entry['unsupported']}, {state})")
+            else:
+                print(f"{key}: {entry['name']} (지시문 {entry['instruction_chars']}자, {state})")
+    else:
+        from video_llm_RnD import setup_llm_backend
+
+        backend = setup_llm_backend(args.llm_backend)
+        print(f"🧹 프롬프트 컨텍스트 {contexts.clear(backend)}개 삭제")
+    contexts.close()
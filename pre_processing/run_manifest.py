@@ -0,0 +1,226 @@
+import os
+import json
+import time
+from pathlib import Path
+
+from file_utils import file_checksum, write_json_atomic
+
+# 비디오 1개 처리 단계 (순서대로 진행, 앞 단계를 다시 하면 뒤 단계는 무효)
+# - probed    : 영상 정보 확인 (원본 영상 크기/수정 시각 기록, 바뀌면 모든 단계 무효)
+# - extracted : 후보 프레임 추출 (extracted_frames)
+# - selected  : _O_/_V_ 이미지 선택/저장 + 프레임 매니페스트
+# - summarized: 장면 요약 (Gemini)
+# - metadata  : 메타데이터 JSON 저장 (완료)
+STAGES = ("probed", "extracted", "selected", "summarized", "metadata")
+
+# 단계 결과에 영향을 주는 process_video 옵션 / 추출 설정 (바뀌면 해당 단계부터 다시 실행)
+_EXTRACT_OPTIONS = ("sampling", "use_frame_plan", "keep_extracted", "profiles", "decoder", "interval_sec", "num_frames")
+_SELECT_OPTIONS = _EXTRACT_OPTIONS + ("dedup_distance", "quality_filter", "selector")
+_SUMMARY_OPTIONS = _SELECT_OPTIONS + ("scene_summary", "llm_analysis", "llm_packing", "llm_backend")
+STAGE_OPTIONS = {
+    "probed": (),
+    "extracted": _EXTRACT_OPTIONS,
+    "selected": _SELECT_OPTIONS,
+    "summarized": _SUMMARY_OPTIONS,
+    "metadata": _SUMMARY_OPTIONS,
+}
+
+# 실행 매니페스트 기본 위치 (PRESET_ROOT 아래)
+DEFAULT_MANIFEST_DIRNAME = ".run_manifest"
+
+def source_fingerprint(video_path):
+    """원본 영상 식별 정보 (크기 + 수정 시각, video_probe 와 같은 기준, 파일이 없으면 None)"""
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return None
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class RunManifest:
+    """
+    배치 실행 매니페스트
+
+    비디오마다 {manifest_dir}/{category}/{video_name}.json 파일 하나에 단계별 완료 여부,
+    결과 데이터, 출력 파일 체크섬을 기록한다. 비디오별 파일을 원자적으로 교체하므로
+    병렬 실행(프로세스 풀)에서도 잠금이 필요 없고, 프로세스가 강제 종료되어도
+    마지막으로 완료한 단계까지는 그대로 남는다.
+    """
+
+    def __init__(self, manifest_dir):
+        self.manifest_dir = Path(manifest_dir)
+
+    def path_for(self, category, video_name):
+        """비디오별 매니페스트 파일 경로"""
+        return self.manifest_dir / category / f"{video_name}.json"
+
+    def load(self, category, video_name):
+        """비디오 상태 로드 (없거나 깨졌으면 빈 상태)"""
+        try:
+            with open(self.path_for(category, video_name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"video": video_name, "category": category, "stages": {}}
+
+    def save(self, state):
+        """비디오 상태 저장"""
+        path = self.path_for(state["category"], state["video"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state["updated"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        write_json_atomic(path, state, indent=2)
+
+    def record_failure(self, category, video_name, error):
+        """완료되지 않은 첫 단계를 실패로 기록 (다음 실행 시 해당 단계부터 재시도)"""
+        state = self.load(category, video_name)
+        stage = next((s for s in STAGES if state["stages"].get(s, {}).get("status") != "done"), STAGES[-1])
+        state["stages"][stage] = {"status": "failed", "error": str(error)}
+        state["error"] = str(error)
+        self.save(state)
+
+    def entries(self, category=None):
+        """매니페스트에 기록된 비디오 상태 리스트"""
+        root = self.manifest_dir / category if category else self.manifest_dir
+        states = []
+        for path in sorted(root.rglob("*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    states.append(json.load(f))
+            except json.JSONDecodeError:
+                continue
+        return states
+
+
+class VideoRun:
+    """
+    비디오 1개의 단계 진행 기록 (process_video 에서 사용)
+    manifest_dir 가 None 이면 아무것도 기록하지 않고 모든 단계를 새로 실행한다.
+
+    Args:
+        manifest_dir (str): 실행 매니페스트 폴더 (None 이면 사용 안 함)
+        category (str): 카테고리 폴더명
+        video_name (str): 비디오 파일명
+        base_dir (Path): 출력 파일 체크섬을 상대 경로로 기록할 기준 폴더
+        options (dict): process_video 옵션 (STAGE_OPTIONS 의 키)
+        video_path (str): 원본 영상 경로 (같은 이름의 영상이 교체되면 모든 단계를 다시 실행)
+    """
+
+    def __init__(self, manifest_dir, category, video_name, base_dir, options, video_path=None):
+        self.manifest = RunManifest(manifest_dir) if manifest_dir else None
+        self.base_dir = Path(base_dir)
+        self.options = options
+        self.source = source_fingerprint(video_path) if video_path is not None else None
+        self.state = self.manifest.load(category, video_name) if self.manifest else None
+        if self.state and self.state["stages"]:
+            probed = self.state["stages"].get("probed", {})
+            if probed.get("status") == "done" and probed.get("source") != self.source:
+                # 같은 이름의 다른 영상: 이전 프로브/프레임/요약을 쓰지 않음
+                print(f"⚠️ 원본 영상이 바뀌어 처음부터 다시 실행: {video_name}")
+                self.state["stages"] = {}
+
+    @property
+    def enabled(self):
+        return self.manifest is not None
+
+    def _stage_options(self, stage):
+        return {key: self.options.get(key) for key in STAGE_OPTIONS[stage]}
+
+    def done(self, stage):
+        """
+        완료된 단계의 결과 데이터 조회
+        옵션이 바뀌었거나 출력 파일이 없어졌거나 내용이 바뀌었으면 None (다시 실행)
+
+        Returns:
+            dict | None: complete() 때 기록한 data
+        """
+        if not self.enabled:
+            return None
+        entry = self.state["stages"].get(stage)
+        if not entry or entry.get("status") != "done":
+            return None
+        if entry.get("options") != json.loads(json.dumps(self._stage_options(stage))):
+            return None
+        for rel_path, checksum in entry.get("outputs", {}).items():
+            path = self.base_dir / rel_path
+            if not path.exists() or file_checksum(path) != checksum:
+                print(f"⚠️ {stage} 단계 출력 변경됨, 다시 실행: {rel_path}")
+                return None
+        return entry.get("data")
+
+    def start(self, stage):
+        """단계 시작 기록 (완료 전에 프로세스가 죽으면 running 으로 남아 다음 실행 시 재시도)"""
+        if not self.enabled:
+            return
+        self.state["stages"][stage] = {"status": "running", "started": time.strftime("%Y-%m-%d %H:%M:%S")}
+        self.manifest.save(self.state)
+
+    def complete(self, stage, outputs=(), data=None):
+        """
+        단계 완료 기록 (이후 단계는 무효화)
+
+        Args:
+            stage (str): 단계 이름 (STAGES)
+            outputs (list): 이 단계가 만든 파일 경로 (체크섬 기록)
+            data (dict): 다음 실행 때 단계를 건너뛰며 복원할 결과 데이터 (JSON 직렬화 가능)
+        """
+        if not self.enabled:
+            return
+        checksums = {}
+        for path in outputs:
+            path = Path(path)
+            if path.exists():
+                checksums[path.relative_to(self.base_dir).as_posix()] = file_checksum(path)
+
+        for later in STAGES[STAGES.index(stage) + 1:]:
+            self.state["stages"].pop(later, None)
+        self.state["stages"][stage] = {
+            "status": "done",
+            "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "options": self._stage_options(stage),
+            "outputs": checksums,
+            "data": data,
+        }
+        if stage == "probed":
+            self.state["stages"][stage]["source"] = self.source
+        self.state.pop("error", None)
+        self.manifest.save(self.state)
+
+
+def video_status(state):
+    """비디오 상태 요약 (done / failed / running / pending)"""
+    stages = state.get("stages", {})
+    if stages.get(STAGES[-1], {}).get("status") == "done":
+        return "done"
+    statuses = [entry.get("status") for entry in stages.values()]
+    if "failed" in statuses:
+        return "failed"
+    if "running" in statuses:
+        # 실행 중이거나 프로세스가 강제 종료된 경우
+        return "running"
+    return "pending"
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python run_manifest.py C:\guide\preset_data\.run_manifest -c Culture
+    import argparse
+
+    parser = argparse.ArgumentParser(description="배치 실행 매니페스트 상태 확인")
+    parser.add_argument("manifest_dir", help="실행 매니페스트 폴더 (preset_module.py --resume 위치)")
+    parser.add_argument("-c", "--category", default=None, help="카테고리 폴더명")
+    parser.add_argument("--failed", action="store_true", help="완료되지 않은 비디오만 표시")
+    args = parser.parse_args()
+
+    counts = {}
+    for state in RunManifest(args.manifest_dir).entries(args.category):
+        status = video_status(state)
+        counts[status] = counts.get(status, 0) + 1
+        if args.failed and status == "done":
+            continue
+        stages = state.get("stages", {})
+        progress = " ".join(
+            f"{stage}={'✓' if stages.get(stage, {}).get('status') == 'done' else stages.get(stage, {}).get('status', '-')}"
+            for stage in STAGES
+        )
+        print(f"{state['category']}/{state['video']}: {status}  {progress}")
+        if state.get("error"):
+            print(f"    {state['error']}")
+    print("합계: " + ", ".join(f"{status} {count}개" for status, count in sorted(counts.items())))
@@ -0,0 +1,132 @@
+import math
+import numpy as np
+
+from frame_sampler import select_evenly
+from decoders import get_decoder
+from frame_features import make_thumbnail, color_histograms, histogram_distances
+
+# 영상 1개당 분석(retrieve + 축소)할 프레임 수 상한
+# 나머지 프레임은 grab() 만 하므로 전체 비용이 순차 디코딩에 가깝게 유지됨
+DEFAULT_ANALYSIS_BUDGET = 600
+
+# 연속 분석 프레임 간 히스토그램 거리가 이 값을 넘으면 샷 경계로 판단
+SHOT_THRESHOLD = 0.4
+
+# 이보다 짧은 구간은 경계를 무시해 다음 샷에 합침 (장면 전환 효과, 플래시 등)
+MIN_SHOT_SEC = 0.5
+
+# 히스토그램 계산 배치 크기
+HISTOGRAM_BATCH = 64
+
+
+def detect_shots(
+    video_path, budget=DEFAULT_ANALYSIS_BUDGET, threshold=SHOT_THRESHOLD, min_shot_sec=MIN_SHOT_SEC, decoder="opencv"
+):
+    """
+    한 번의 디코딩 패스로 샷 경계 검출
+
+    Args:
+        video_path (str): 비디오 파일 경로
+        budget (int): 분석할 프레임 수 상한
+        threshold (float): 샷 경계 판단 히스토그램 거리
+        min_shot_sec (float): 최소 샷 길이 (초)
+        decoder (str): 디코더 백엔드 ("opencv", "ffmpeg", "pyav", "auto")
+
+    Returns:
+        dict: fps, frame_count, shots([(시작 프레임, 끝 프레임(미포함)), ...]), analyzed_frames, stride
+    """
+    analyzed = []
+    histograms = []
+    batch = []
+
+    with get_decoder(decoder, video_path, "sequential") as video_decoder:
+        fps = video_decoder.fps
+        frame_count = video_decoder.frame_count
+
+        # 분석 간격: 상한을 넘지 않도록 균등하게
+        stride = max(1, math.ceil(frame_count / max(1, budget)))
+        analysis_indices = range(0, frame_count, stride)
+
+        for frame_idx, success, frame in video_decoder.read_frames(analysis_indices):
+            if not success:
+                break
+            analyzed.append(frame_idx)
+            batch.append(make_thumbnail(frame))
+            if len(batch) == HISTOGRAM_BATCH:
+                histograms.append(color_histograms(np.stack(batch)))
+                batch = []
+    if batch:
+        histograms.append(color_histograms(np.stack(batch)))
+
+    if not analyzed:
+        return {"fps": fps, "frame_count": frame_count, "shots": [], "analyzed_frames": 0, "stride": stride}
+
+    distances = histogram_distances(np.concatenate(histograms))
+    min_shot_frames = int(min_shot_sec * fps)
+
+    # 경계: distances[i] 는 analyzed[i] 와 analyzed[i+1] 사이
+    starts = [0]
+    for i in np.flatnonzero(distances > threshold):
+        boundary = analyzed[i + 1]
+        if boundary - starts[-1] >= min_shot_frames:
+            starts.append(boundary)
+
+    end_frame = min(frame_count, analyzed[-1] + stride)
+    shots = [(start, end) for start, end in zip(starts, starts[1:] + [end_frame])]
+
+    print(f"샷 경계 검출: {len(shots)}개 샷 (분석 프레임 {len(analyzed)}개, 간격 {stride} 프레임)")
+    return {
+        "fps": fps,
+        "frame_count": frame_count,
+        "shots": shots,
+        "analyzed_frames": len(analyzed),
+        "stride": stride,
+    }
+
+
+def spread_picks_across_shots(shots, count):
+    """
+    선택할 프레임을 샷 전체에 분산
+
+    - 샷이 count 개 이상이면 시간 순서상 고르게 count 개 샷을 골라 각 샷의 중간 프레임 선택
+    - 샷이 적으면 모든 샷에 1개씩 배정 후 나머지는 샷 길이에 비례해 배정
+      (샷 프레임 수보다 많이 배정된 만큼은 여유가 있는 다른 샷으로 넘김)
+
+    Args:
+        shots (list): [(시작 프레임, 끝 프레임(미포함)), ...]
+        count (int): 선택할 프레임 수
+
+    Returns:
+        list: 선택된 프레임 번호 (오름차순, 중복 없음, 전체 프레임이 count 보다 적을 때만 count 개 미만)
+    """
+    if not shots or count <= 0:
+        return []
+
+    if len(shots) >= count:
+        return [(start + end - 1) // 2 for start, end in select_evenly(shots, count)]
+
+    lengths = np.array([end - start for start, end in shots], dtype=np.float64)
+    remaining = count - len(shots)
+
+    # 최대 나머지 방식으로 남은 개수 배정
+    quotas = lengths / lengths.sum() * remaining
+    allocation = np.floor(quotas).astype(int)
+    leftover = remaining - allocation.sum()
+    if leftover > 0:
+        allocation[np.argsort(-(quotas - allocation), kind="stable")[:leftover]] += 1
+    allocation += 1
+
+    # 짧은 샷은 프레임 수까지만 배정하고 나머지는 여유가 가장 많은 샷부터 1개씩 배정
+    capacity = lengths.astype(int)
+    excess = int(np.maximum(allocation - capacity, 0).sum())
+    allocation = np.minimum(allocation, capacity)
+    while excess > 0 and (allocation < capacity).any():
+        spare = np.where(allocation < capacity, capacity / np.maximum(allocation, 1), -1.0)
+        allocation[int(np.argmax(spare))] += 1
+        excess -= 1
+
+    picks = set()
+    for (start, end), n in zip(shots, allocation):
+        for j in range(n):
+            picks.add(start + int((end - start) * (j + 0.5) / n))
+    return sorted(picks)
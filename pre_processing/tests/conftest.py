@@ -0,0 +1,85 @@
+import sys
+import struct
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+# pre_processing 모듈은 같은 폴더 기준으로 import 하므로 상위 폴더를 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_llm_server import create_server  # noqa: E402
+
+# 합성 영상 크기 / 길이
+CLIP_WIDTH = 96
+CLIP_HEIGHT = 64
+CLIP_FPS = 10.0
+CLIP_FRAMES = 60
+
+# tkhd 회전 행렬 (16.16 고정소수점, 마지막 값은 2.30)
+_ROTATION_MATRICES = {
+    90: (0, 0x10000, 0, -0x10000, 0, 0, 0, 0, 0x40000000),
+    270: (0, -0x10000, 0, 0x10000, 0, 0, 0, 0, 0x40000000),
+}
+
+
+def synthetic_frame(n, width=CLIP_WIDTH, height=CLIP_HEIGHT):
+    """프레임 번호마다 밝기와 막대 위치가 달라 다른 프레임과 쉽게 구분되는 BGR 이미지"""
+    frame = np.full((height, width, 3), (n * 4) % 256, dtype=np.uint8)
+    x = (n * 7) % (width - 16)
+    frame[:, x:x + 16] = (0, 0, 255)
+    # 회전 방향을 확인할 수 있도록 왼쪽 위에 표시
+    frame[:8, :8] = (255, 0, 0)
+    return frame
+
+
+def write_clip(path, frames=CLIP_FRAMES, fps=CLIP_FPS, width=CLIP_WIDTH, height=CLIP_HEIGHT):
+    """cv2.VideoWriter 로 합성 영상 저장"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    if not writer.isOpened():
+        pytest.skip("cv2.VideoWriter 로 mp4 를 쓸 수 없음")
+    for n in range(frames):
+        writer.write(synthetic_frame(n, width, height))
+    writer.release()
+    return path
+
+
+def set_rotation(path, degrees):
+    """mp4 의 tkhd 회전 행렬을 바꿔 회전 정보가 있는 영상으로 만듦 (스마트폰 세로 촬영 영상과 같은 형태)"""
+    data = bytearray(Path(path).read_bytes())
+    box = data.find(b"tkhd")
+    version = data[box + 4]
+    # version/flags(4) + 시각/트랙 ID/duration(20 또는 32) + reserved(8) + layer/group/volume/reserved(8)
+    matrix = box + 4 + 4 + (32 if version == 1 else 20) + 8 + 8
+    data[matrix:matrix + 36] = struct.pack(">9i", *_ROTATION_MATRICES[degrees])
+    Path(path).write_bytes(data)
+    return path
+
+
+@pytest.fixture
+def synthetic_clip(tmp_path):
+    """60프레임 / 10 FPS 합성 영상 경로"""
+    return write_clip(tmp_path / "clip.mp4")
+
+
+@pytest.fixture
+def fake_llm_server():
+    """
+    가짜 LLM 서버 시작 함수 (빈 포트, 테스트가 끝나면 종료)
+
+    start(profile="fast", **overrides) -> (server, url)
+    """
+    servers = []
+
+    def start(profile="fast", **overrides):
+        server = create_server(port=0, profile=profile, seed=0, **overrides)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from video_llm_RnD import parse_combined_response
+
+
+def response(summary, objects):
+    return json.dumps({"summary": summary, "objects": objects}, ensure_ascii=False)
+
+
+def test_valid_response_is_normalized():
+    text = "```json\n" + response(
+        ["거리를 걷는 사람이 보인다", " 공원 벤치가 놓여 있다. "],
+        [["사람", " 가방 ", "", "사람"], []],
+    ) + "\n```"
+
+    # 코드 블록 허용, 마침표 보정, 빈 객체명/중복 제거 (순서 유지)
+    assert parse_combined_response(text, 2) == {
+        "summary": ["거리를 걷는 사람이 보인다.", "공원 벤치가 놓여 있다."],
+        "objects": [["사람", "가방"], []],
+    }
+
+
+@pytest.mark.parametrize("summary, objects", [
+    (["첫 문장."], [["사람"], ["의자"]]),
+    (["첫 문장.", "둘째 문장."], [["사람"]]),
+    (["첫 문장.", "둘째 문장.", "셋째 문장."], [["사람"], ["의자"], []]),
+])
+def test_item_count_must_match_image_count(summary, objects):
+    with pytest.raises(ValueError, match="항목 수가 다릅니다"):
+        parse_combined_response(response(summary, objects), 2)
+
+
+@pytest.mark.parametrize("text, message", [
+    ("첫 문장. 둘째 문장.", "JSON 이 아닙니다"),
+    ('["첫 문장.", "둘째 문장."]', "JSON 객체가 아닙니다"),
+    (response(["첫 문장.", "  "], [[], []]), "summary"),
+    (response(["첫 문장.", 2], [[], []]), "summary"),
+    (response(["첫 문장.", "둘째 문장."], [["사람"], "의자"]), "objects"),
+    (response(["첫 문장.", "둘째 문장."], [["사람"], [None]]), "objects"),
+    (json.dumps({"summary": ["첫 문장.", "둘째 문장."]}), "objects"),
+])
+def test_malformed_response_raises(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_combined_response(text, 2)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from conftest import CLIP_FRAMES, CLIP_HEIGHT, CLIP_WIDTH, set_rotation, write_clip
+from decoders import DECODERS, OpenCVDecoder, check_decoders
+from frame_segments import extract_segments
+from shot_detection import detect_shots
+
+# 샘플 프레임 번호 (등간격 + 불규칙)
+SAMPLE_INDICES = [0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55]
+IRREGULAR_INDICES = [1, 2, 9, 23, 24, 41, 58, 59]
+
+# 기준 프레임과의 허용 평균 픽셀 차이 (check_decoders 기본값과 동일)
+TOLERANCE = 3.0
+
+
+def require(name):
+    """백엔드가 설치되지 않았으면 건너뜀"""
+    if not DECODERS[name].available():
+        pytest.skip(f"{name} 디코더 설치되지 않음")
+
+
+def read_reference(video_path, frame_indices):
+    """OpenCV seek 모드 기준 프레임 {번호: 프레임}"""
+    with OpenCVDecoder(video_path, "seek") as reference:
+        return reference.fps, {idx: frame for idx, ok, frame in reference.read_frames(frame_indices) if ok}
+
+
+def assert_same_frames(decoder, video_path, frame_indices):
+    """기준과 같은 번호/시간/내용의 프레임을 반환하는지 확인"""
+    fps, expected = read_reference(video_path, frame_indices)
+    assert len(expected) == len(frame_indices)
+    assert decoder.fps == pytest.approx(fps, abs=0.01)
+
+    results = list(decoder.read_frames(frame_indices))
+    assert [idx for idx, _, _ in results] == list(frame_indices)
+    for idx, ok, frame in results:
+        assert ok, f"프레임 {idx} 읽기 실패"
+        assert idx / decoder.fps == pytest.approx(idx / fps)
+        assert frame.shape == expected[idx].shape
+        diff = np.abs(frame.astype(np.int16) - expected[idx].astype(np.int16)).mean()
+        assert diff <= TOLERANCE, f"프레임 {idx} 내용 불일치 (차이 {diff:.1f})"
+
+
+@pytest.mark.parametrize("name", list(DECODERS))
+@pytest.mark.parametrize("frame_indices", [SAMPLE_INDICES, IRREGULAR_INDICES])
+def test_backend_matches_opencv_seek(synthetic_clip, name, frame_indices):
+    require(name)
+    with DECODERS[name](synthetic_clip, "sequential") as decoder:
+        assert (decoder.width, decoder.height) == (CLIP_WIDTH, CLIP_HEIGHT)
+        assert decoder.frame_count == CLIP_FRAMES
+        assert_same_frames(decoder, synthetic_clip, frame_indices)
+
+
+@pytest.mark.parametrize("name", list(DECODERS))
+@pytest.mark.parametrize("degrees", [90, 270])
+def test_backend_applies_rotation(tmp_path, name, degrees):
+    require(name)
+    video_path = set_rotation(write_clip(tmp_path / "rotated.mp4"), degrees)
+    with DECODERS[name](video_path) as decoder:
+        # 세로 영상: 가로/세로가 바뀐 크기로 읽어야 함
+        assert (decoder.width, decoder.height) == (CLIP_HEIGHT, CLIP_WIDTH)
+        assert_same_frames(decoder, video_path, SAMPLE_INDICES)
+
+
+@pytest.mark.parametrize("name", list(DECODERS))
+def test_read_every_reads_to_end(synthetic_clip, name):
+    require(name)
+    with DECODERS[name](synthetic_clip) as decoder:
+        results = list(decoder.read_every(7))
+    assert [idx for idx, _, _ in results] == list(range(0, CLIP_FRAMES, 7))
+    assert all(ok for _, ok, _ in results)
+
+
+@pytest.mark.parametrize("name", list(DECODERS))
+def test_frames_past_end_report_failure(synthetic_clip, name):
+    require(name)
+    with DECODERS[name](synthetic_clip) as decoder:
+        results = list(decoder.read_frames([CLIP_FRAMES - 1, CLIP_FRAMES + 5]))
+    assert [(idx, ok) for idx, ok, _ in results] == [(CLIP_FRAMES - 1, True), (CLIP_FRAMES + 5, False)]
+
+
+def test_check_decoders_passes(synthetic_clip):
+    assert check_decoders(str(synthetic_clip), samples=10)
+
+
+@pytest.mark.parametrize("name", ["ffmpeg", "pyav"])
+def test_segments_and_shots_use_decoder(synthetic_clip, tmp_path, name):
+    require(name)
+    names = [f"frame_{i:05d}.jpg" for i in range(len(SAMPLE_INDICES))]
+    results = extract_segments(synthetic_clip, SAMPLE_INDICES, names, tmp_path / name, segments=2, decoder=name)
+    assert [(idx, file_name, ok) for idx, file_name, ok in results] == [
+        (idx, file_name, True) for idx, file_name in zip(SAMPLE_INDICES, names)
+    ]
+
+    expected = detect_shots(synthetic_clip, decoder="opencv")
+    assert detect_shots(synthetic_clip, decoder=name) == expected
@@ -0,0 +1,38 @@
+from frame_manifest import FrameManifestIndex, manifest_path, write_frame_manifest
+
+
+def write_manifest(root, category, frame_log, video_stem="a"):
+    """preset_module 과 같은 위치 (root/{category}/{video_name}/) 에 매니페스트 저장"""
+    output_dir = root / category / f"{video_stem}.mp4"
+    output_dir.mkdir(parents=True)
+    return write_frame_manifest(output_dir, video_stem, f"/videos/{category}/{video_stem}.mp4", 30.0, "interval", frame_log)
+
+
+def test_manifest_round_trip(tmp_path):
+    path = write_manifest(tmp_path, "cat", {"a_V_1.jpg": 45, "a_V_2.jpg": 90})
+    assert path == manifest_path(tmp_path / "cat" / "a.mp4", "a")
+    assert [p.name for p in path.parent.iterdir()] == ["a_frames.json"]
+
+    index = FrameManifestIndex(tmp_path)
+    assert index.lookup(r"C:\guide\preset_data\cat\a.mp4\a_V_2.jpg") == {
+        "video": "a.mp4", "strategy": "interval", "frame_index": 90, "timestamp": 3.0,
+    }
+    assert index.image_frame("a_V_2.jpg") == "00:03"
+    assert index.lookup("a_V_9.jpg") is None
+    assert index.image_frame("other.jpg") == ""
+
+
+def test_same_video_stem_in_two_categories(tmp_path, capsys):
+    write_manifest(tmp_path, "cat", {"a_V_1.jpg": 30})
+    write_manifest(tmp_path, "dog", {"a_V_1.jpg": 300})
+    index = FrameManifestIndex(tmp_path)
+
+    # 카테고리를 지정하면 각자의 매니페스트에서 조회
+    assert index.lookup("a_V_1.jpg", "cat")["frame_index"] == 30
+    assert index.lookup("a_V_1.jpg", "dog")["frame_index"] == 300
+    assert index.lookup("a_V_1.jpg", "bird") is None
+
+    # 지정하지 않으면 다른 카테고리 값을 쓰지 않고 한 번만 경고
+    assert index.lookup("a_V_1.jpg") is None
+    assert index.image_frame("a_V_1.jpg") == ""
+    assert capsys.readouterr().out.count("카테고리 지정 필요") == 1
@@ -0,0 +1,45 @@
+from conftest import CLIP_FRAMES
+from frame_plan import build_frame_plan, execute_frame_plan
+
+
+def plan_for(clip, tmp_path, keep_extracted):
+    return build_frame_plan(
+        str(clip), tmp_path / "extracted", tmp_path / "out", num_frames=20, sampling="uniform",
+        keep_extracted=keep_extracted,
+    )
+
+
+def test_plan_without_extracted_keeps_candidate_names(synthetic_clip, tmp_path):
+    plan = plan_for(synthetic_clip, tmp_path, keep_extracted=False)
+
+    # 파일은 저장하지 않아도 후보 프레임 파일명은 기존 함수와 같은 순서로 전체 반환
+    assert plan["saved_frames"] == [f"clip_frame_{i:02}.jpg" for i in range(1, 21)]
+    assert len(plan["candidate_indices"]) == 20
+    assert all(0 <= idx < CLIP_FRAMES for idx in plan["candidate_indices"])
+    assert plan["image_object_filenames"] == [f"clip_O_{i}.jpg" for i in range(1, 13)]
+    assert list(plan["image_V_map"].values()) == [f"clip_V_{i}.jpg" for i in range(1, 10)]
+
+    # 디코딩/저장 대상은 _O_, _V_ 이미지만
+    paths = [path for paths in plan["destinations"].values() for path in paths]
+    assert all(path.parent == tmp_path / "out" for path in paths)
+    assert sorted(plan["frame_log"]) == sorted(plan["image_object_filenames"] + list(plan["image_V_map"].values()))
+    assert set(plan["frame_indices"]) <= set(plan["candidate_indices"])
+
+    result = execute_frame_plan(plan)
+    assert result["failed_frames"] == []
+    assert not (tmp_path / "extracted").exists()
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == sorted(plan["frame_log"])
+
+
+def test_plan_with_extracted_saves_every_candidate(synthetic_clip, tmp_path):
+    plan = plan_for(synthetic_clip, tmp_path, keep_extracted=True)
+
+    for name, frame_idx in zip(plan["saved_frames"], plan["candidate_indices"]):
+        assert plan["frame_log"][name] == frame_idx
+        assert tmp_path / "extracted" / name in plan["destinations"][frame_idx]
+    assert plan["frame_indices"] == sorted(set(plan["candidate_indices"]))
+
+    # 같은 프레임은 한 번만 디코딩해 모든 경로에 저장
+    result = execute_frame_plan(plan)
+    assert result["written_files"] == 20 + 12 + 9
+    assert sorted(p.name for p in (tmp_path / "extracted").iterdir()) == sorted(plan["saved_frames"])
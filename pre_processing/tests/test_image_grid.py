@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+import pytest
+
+from image_grid import GRID_GAP, grid_layout, pack_contact_sheets, sheet_count
+from video_llm_RnD import parse_numbered_line, parse_numbered_sentences
+
+
+# 3x3 칸이 정확히 160x90 이 되는 격자 크기
+SHEET_SIZE = (3 * 160 + 2 * GRID_GAP, 3 * 90 + 2 * GRID_GAP)
+
+
+def solid_jpeg(value, width=160, height=90):
+    """한 가지 밝기로 채운 JPEG (칸 위치 확인용)"""
+    return cv2.imencode(".jpg", np.full((height, width, 3), value, dtype=np.uint8))[1].tobytes()
+
+
+def test_layout_numbers_cells_row_major_across_sheets():
+    layout = grid_layout(11, columns=3, rows=3)
+    assert layout[:4] == [(0, 0, 0), (0, 0, 1), (0, 0, 2), (0, 1, 0)]
+    assert layout[8] == (0, 2, 2)
+    assert layout[9:] == [(1, 0, 0), (1, 0, 1)]
+    assert [sheet_count(n) for n in (0, 1, 9, 10)] == [0, 1, 1, 2]
+
+
+def test_each_image_lands_in_its_numbered_cell():
+    values = [20 * (i + 1) for i in range(11)]
+    sheets = [cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+              for data in pack_contact_sheets([solid_jpeg(v) for v in values], sheet_size=SHEET_SIZE)]
+    assert len(sheets) == 2
+
+    # 칸 크기 = 원본 크기 (160x90)
+    for value, (sheet, row, col) in zip(values, grid_layout(len(values))):
+        center_y = row * (90 + GRID_GAP) + 60
+        center_x = col * (160 + GRID_GAP) + 80
+        assert abs(int(sheets[sheet][center_y, center_x]) - value) <= 3
+    # 두 번째 격자의 빈 칸은 배경
+    assert sheets[1][2 * (90 + GRID_GAP) + 45, 2 * (160 + GRID_GAP) + 80] <= 3
+
+
+@pytest.mark.parametrize("line, parsed", [
+    ("[3] 거리를 걷는 사람이 보인다.", (2, "거리를 걷는 사람이 보인다.")),
+    ("3. 거리를 걷는 사람이 보인다", (2, "거리를 걷는 사람이 보인다.")),
+    ("(1) 공원 벤치가 놓여 있다.", (0, "공원 벤치가 놓여 있다.")),
+    ("  [9]: 공원 벤치가 놓여 있다.  ", (8, "공원 벤치가 놓여 있다.")),
+    ("[10] 범위를 벗어난 번호.", None),
+    ("[0] 범위를 벗어난 번호.", None),
+    ("번호 없는 문장이다.", None),
+    ("[2]", None),
+])
+def test_parse_numbered_line(line, parsed):
+    assert parse_numbered_line(line, 9) == parsed
+
+
+def test_sentences_restored_by_cell_number():
+    text = "\n".join([
+        "다음은 결과입니다.",
+        "[3] 셋째 칸 문장.",
+        "[1] 첫째 칸 문장.",
+        "[1] 반복된 첫째 칸 문장.",
+        "[7] 범위를 벗어난 칸 문장.",
+    ])
+    # 응답 순서와 관계없이 칸 번호 위치로, 반복된 번호는 첫 문장, 빠진 번호는 None
+    assert parse_numbered_sentences(text, 4) == ["첫째 칸 문장.", None, "셋째 칸 문장.", None]
@@ -0,0 +1,86 @@
+import pytest
+
+from llm_backend import FakeHTTPBackend, LLMBackendError
+from video_llm_RnD import COMBINED_GENERATION_CONFIG
+
+
+def test_generate_returns_text_and_usage(fake_llm_server):
+    server, url = fake_llm_server()
+    response = FakeHTTPBackend(url).generate("총 3장", ["aGVsbG8="] * 3)
+
+    assert response.text.count("장면에서") == 3
+    assert response.usage["prompt_tokens"] > 0
+    assert response.usage["cached_tokens"] == 0
+    assert server.state.stats["ok"] == 1
+
+
+def test_generate_json_mode(fake_llm_server):
+    _, url = fake_llm_server()
+    response = FakeHTTPBackend(url).generate("총 2장", ["aGVsbG8="] * 2, COMBINED_GENERATION_CONFIG)
+    assert response.text.lstrip().startswith("{")
+
+
+def test_stream_yields_ndjson_chunks_then_usage(fake_llm_server):
+    _, url = fake_llm_server(chunk_delay=0.0)
+    backend = FakeHTTPBackend(url)
+
+    stream = backend.stream("총 5장", [])
+    assert stream.usage["prompt_tokens"] == 0
+    chunks = list(stream)
+
+    # 조각 여러 개를 이어 붙이면 일반 응답과 같고, 사용량은 마지막 줄에서 채워짐
+    assert len(chunks) > 1
+    assert "".join(chunks) == backend.generate("총 5장", []).text
+    assert stream.usage["prompt_tokens"] > 0
+
+
+def test_throttled_profile_maps_429_and_retry_after(fake_llm_server):
+    server, url = fake_llm_server("throttled", latency=0.0)
+    backend = FakeHTTPBackend(url)
+    rpm = server.state.profile["rpm"]
+
+    for _ in range(rpm):
+        backend.generate("총 1장", [])
+    with pytest.raises(LLMBackendError) as excinfo:
+        backend.generate("총 1장", [])
+
+    assert excinfo.value.status == 429
+    assert 0 < excinfo.value.retry_after <= 60
+    assert server.state.stats["rate_limited"] == 1
+
+
+def test_server_error_maps_status(fake_llm_server):
+    _, url = fake_llm_server(error_rate=1.0)
+    with pytest.raises(LLMBackendError) as excinfo:
+        FakeHTTPBackend(url).generate("총 1장", [])
+    assert excinfo.value.status in (500, 503)
+    assert excinfo.value.retry_after is None
+
+
+def test_connection_failure_has_no_status():
+    # 열려 있지 않은 포트: HTTP 상태 없이 연결 실패
+    with pytest.raises(LLMBackendError) as excinfo:
+        FakeHTTPBackend("http://127.0.0.1:9").generate("총 1장", [])
+    assert excinfo.value.status is None
+
+
+def test_context_create_get_delete(fake_llm_server):
+    _, url = fake_llm_server()
+    backend = FakeHTTPBackend(url)
+    instruction = "고정 지시문 " * 50
+
+    context = backend.create_context(instruction, ttl_sec=60)
+    assert backend.get_context(context.name).name == context.name
+    assert backend.stats()["contexts"] == 1
+
+    # 컨텍스트를 참조하면 지시문 토큰이 캐시 토큰으로 집계됨
+    response = backend.generate("총 2장", [], context=context)
+    assert response.usage["cached_tokens"] == len(instruction) // 2
+
+    backend.delete_context(context.name)
+    with pytest.raises(LLMBackendError) as excinfo:
+        backend.get_context(context.name)
+    assert excinfo.value.status == 404
+    with pytest.raises(LLMBackendError) as excinfo:
+        backend.generate("총 2장", [], context=context)
+    assert excinfo.value.status == 404
@@ -0,0 +1,92 @@
+import pytest
+
+import llm_cache
+from llm_cache import LLMResponseCache, counter_delta, make_cache_key
+
+
+class FakeClock:
+    """llm_cache 의 time.time 대신 사용 (테스트에서 직접 앞당김)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+
+def open_cache(tmp_path, **kwargs):
+    return LLMResponseCache(tmp_path / "llm_cache.sqlite3", **kwargs)
+
+
+def test_key_depends_on_every_input():
+    key = make_cache_key("m", "총 2장", ["aaa", "bbb"], {"temperature": 0})
+    assert key == make_cache_key("m", "총 2장", ["aaa", "bbb"], {"temperature": 0})
+    assert key != make_cache_key("m", "총 2장", ["bbb", "aaa"], {"temperature": 0})
+    assert key != make_cache_key("m", "총 3장", ["aaa", "bbb"], {"temperature": 0})
+    assert key != make_cache_key("m2", "총 2장", ["aaa", "bbb"], {"temperature": 0})
+    assert key != make_cache_key("m", "총 2장", ["aaa", "bbb"], {"temperature": 1})
+
+
+def test_hits_and_misses_shared_between_instances(tmp_path, clock):
+    cache = open_cache(tmp_path)
+    before = cache.counters()
+    assert cache.get("k") is None
+    cache.put("k", "m", "응답이다.")
+
+    # 다른 프로세스에서 같은 DB 를 열어도 같은 응답과 누적 횟수
+    other = open_cache(tmp_path)
+    assert other.get("k") == "응답이다."
+    assert counter_delta(before, cache.counters()) == {"hits": 1, "misses": 1}
+    other.close()
+    cache.close()
+
+
+def test_expired_entry_is_a_miss_and_removed(tmp_path, clock):
+    cache = open_cache(tmp_path, ttl_sec=60)
+    cache.put("k", "m", "응답이다.")
+
+    clock.now += 60
+    assert cache.get("k") == "응답이다."
+
+    clock.now += 1
+    assert cache.get("k") is None
+    assert cache.stats() == {"entries": 0, "bytes": 0, "hits": 1, "misses": 1}
+    cache.close()
+
+
+def test_put_drops_expired_entries(tmp_path, clock):
+    cache = open_cache(tmp_path, ttl_sec=60)
+    cache.put("old", "m", "오래된 응답.")
+    clock.now += 61
+    cache.put("new", "m", "새 응답.")
+    assert cache.stats()["entries"] == 1
+    assert cache.get("new") == "새 응답."
+    cache.close()
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path, clock):
+    cache = open_cache(tmp_path, max_bytes=10)
+    cache.put("a", "m", "aaaa")
+    clock.now += 1
+    cache.put("b", "m", "bbbb")
+    clock.now += 1
+    # a 를 최근에 사용했으므로 크기를 넘으면 b 부터 삭제
+    assert cache.get("a") == "aaaa"
+    clock.now += 1
+    cache.put("c", "m", "cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get("c") == "cccc"
+    assert cache.total_bytes() == 8
+
+    assert cache.clear() == (2, 8)
+    assert cache.stats()["entries"] == 0
+    cache.close()
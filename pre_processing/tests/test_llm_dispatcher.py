@@ -0,0 +1,154 @@
+# Dispatcher 를 로컬 가짜 Gemini 엔드포인트(fake_llm_server.py, conftest 의 fake_llm_server)에 대해 실행
+# (API 키/네트워크 없이 순서 / 동시성 / 한도 / 실패 격리 확인)
+import asyncio
+import threading
+
+import cv2
+import numpy as np
+
+import llm_dispatcher
+from llm_backend import FakeHTTPBackend
+from llm_dispatcher import Dispatcher, RateLimiter
+from llm_metrics import MetricsLog
+from llm_retry import CircuitBreaker, ResilientBackend
+from video_llm_RnD import transform2_many
+
+
+class FakeClock:
+    """RateLimiter 에 넣는 시계 (asyncio.sleep 을 바꿔 대기한 만큼 시간이 흐름)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_with_clock(monkeypatch, clock, coro_fn):
+    """asyncio.sleep 이 실제로 기다리지 않고 clock 만 앞당기도록 바꾼 뒤 실행"""
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        clock.now += seconds
+        await real_sleep(0)
+
+    monkeypatch.setattr(llm_dispatcher.asyncio, "sleep", fake_sleep)
+    return asyncio.run(coro_fn())
+
+
+def sentence_count(text):
+    return text.count("장면에서")
+
+
+def test_results_keep_input_order_when_latency_varies(fake_llm_server):
+    # 입력 토큰 1000개당 1초: 앞 요청일수록 프롬프트가 길어 늦게 끝남
+    server, url = fake_llm_server(latency=0.0, sec_per_1k_tokens=1.0)
+    backend = FakeHTTPBackend(url)
+    prompts = [f"총 {i + 1}장 " + "가" * (4 - i) * 200 for i in range(5)]
+
+    completed = []
+    dispatcher = Dispatcher(lambda prompt: backend.generate(prompt, []).text, concurrency=5, rpm=0, tpm=0)
+    results = dispatcher.run(prompts, on_result=lambda r: completed.append(r["index"]))
+
+    assert completed == [4, 3, 2, 1, 0]
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert all(r["ok"] for r in results)
+    assert [sentence_count(r["response"]) for r in results] == [1, 2, 3, 4, 5]
+
+
+def test_in_flight_requests_never_exceed_concurrency(fake_llm_server):
+    server, url = fake_llm_server(latency=0.05)
+    backend = FakeHTTPBackend(url)
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def call(prompt):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        try:
+            return backend.generate(prompt, []).text
+        finally:
+            with lock:
+                in_flight -= 1
+
+    results = Dispatcher(call, concurrency=3, rpm=0, tpm=0).run([f"총 {i + 1}장" for i in range(12)])
+
+    assert all(r["ok"] for r in results)
+    assert peak == 3
+    assert server.state.stats["requests"] == 12
+
+
+def test_rate_limiter_enforces_rpm(monkeypatch):
+    clock = FakeClock()
+    limiter = RateLimiter(rpm=2, tpm=0, window=60, clock=clock)
+    times = []
+
+    async def scenario():
+        for _ in range(5):
+            await limiter.acquire()
+            times.append(clock.now)
+
+    run_with_clock(monkeypatch, clock, scenario)
+
+    # 2건마다 가장 오래된 요청이 구간을 벗어날 때까지 대기
+    assert times == [0, 0, 60, 60, 120]
+    assert limiter.waited_sec == 120
+
+
+def test_rate_limiter_enforces_tpm(monkeypatch):
+    clock = FakeClock()
+    limiter = RateLimiter(rpm=0, tpm=100, window=60, clock=clock)
+    times = []
+
+    async def scenario():
+        for tokens in (60, 30, 60, 40):
+            await limiter.acquire(tokens)
+            times.append(clock.now)
+        # 구간이 비면 한도보다 큰 요청도 통과
+        clock.now += 60
+        await limiter.acquire(500)
+        times.append(clock.now)
+
+    run_with_clock(monkeypatch, clock, scenario)
+
+    # 60+30 까지 통과, 다음 60 은 앞 요청들이 구간을 벗어날 때까지 대기, 40 은 60+40 = 한도라 바로 통과
+    assert times == [0, 0, 60, 60, 120]
+    assert limiter.waited_sec == 60
+
+
+def test_failed_request_does_not_abort_batch(fake_llm_server):
+    _, good_url = fake_llm_server()
+    bad_server, bad_url = fake_llm_server(error_rate=1.0)
+    backends = {"good": FakeHTTPBackend(good_url), "bad": FakeHTTPBackend(bad_url)}
+
+    items = ["good", "good", "bad", "good"]
+    results = Dispatcher(
+        lambda name: backends[name].generate("총 1장", []).text, concurrency=2, rpm=0, tpm=0
+    ).run(items)
+
+    assert [r["ok"] for r in results] == [True, True, False, True]
+    assert results[2]["error"].startswith("LLMBackendError")
+    assert results[2]["response"] is None
+    assert bad_server.state.stats["errors"] == 1
+
+
+def test_transform2_many_returns_folder_order(fake_llm_server, tmp_path):
+    _, url = fake_llm_server(latency=0.0, sec_per_1k_tokens=0.2)
+    backend = ResilientBackend(FakeHTTPBackend(url), breaker=CircuitBreaker(), metrics=MetricsLog(None))
+
+    image_counts = [6, 2, 4]
+    folders = []
+    for i, count in enumerate(image_counts):
+        folder = tmp_path / f"video_{i}"
+        folder.mkdir()
+        for n in range(count):
+            cv2.imwrite(str(folder / f"video_{i}_V_{n + 1}.jpg"), np.full((64, 64, 3), n * 30, dtype=np.uint8))
+        folders.append(str(folder))
+
+    summaries = transform2_many(folders, concurrency=3, rpm=0, tpm=0, backend=backend)
+
+    assert [sentence_count(summary) for summary in summaries] == image_counts
+    assert backend.stats["failures"] == 0
@@ -0,0 +1,195 @@
+import random
+import threading
+
+import pytest
+
+import llm_retry
+from llm_backend import LLMBackend, LLMBackendError, LLMStream
+from llm_metrics import MetricsLog
+from llm_retry import CircuitBreaker, ResilientBackend, backoff_delay
+
+
+class FakeClock:
+    """CircuitBreaker 에 넣는 시계 (테스트에서 직접 앞당김)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ScriptedBackend(LLMBackend):
+    """
+    정해진 순서대로 응답하는 스트리밍 백엔드
+
+    scripts 항목마다 stream() 1회: 예외면 stream() 호출에서 발생,
+    리스트면 항목을 조각으로 보내고 예외 항목에서 발생
+    """
+
+    name = "scripted"
+    model_name = "scripted-llm"
+
+    def __init__(self, scripts):
+        self.scripts = list(scripts)
+        self.calls = 0
+
+    def stream(self, prompt, encoded_images, generation_config=None, context=None):
+        self.calls += 1
+        script = self.scripts.pop(0)
+        if isinstance(script, Exception):
+            raise script
+
+        def chunks():
+            for item in script:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+
+        return LLMStream(chunks(), lambda: {"prompt_tokens": 10})
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """재시도 대기 없이 (시도 번호, Retry-After) 기록"""
+    recorded = []
+
+    def fake_backoff(attempt, retry_after=None):
+        recorded.append((attempt, retry_after))
+        return 0.0
+
+    monkeypatch.setattr(llm_retry, "backoff_delay", fake_backoff)
+    return recorded
+
+
+def resilient(scripts, max_attempts=3):
+    inner = ScriptedBackend(scripts)
+    return inner, ResilientBackend(inner, max_attempts=max_attempts, breaker=CircuitBreaker(), metrics=MetricsLog(None))
+
+
+def trip(breaker, calls=4):
+    """실패만 기록해 차단기를 연다"""
+    for _ in range(calls):
+        breaker.record(False)
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(window=10, min_calls=4, error_rate=0.5, cooldown_sec=30, clock=clock)
+
+    # 최소 호출 수 전에는 실패가 많아도 닫힌 상태
+    breaker.record(True)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == "closed"
+    breaker.record(True)
+    assert (breaker.state, breaker.trips, breaker.opened_at) == ("open", 1, 0.0)
+
+    # 대기 시간이 지나면 시험 호출 1건만 통과
+    clock.now = 30.0
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    assert breaker.probe_in_flight
+
+    waiter = threading.Thread(target=breaker.before_call)
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()
+
+    # 시험 호출이 성공하면 닫히고 기다리던 호출도 진행
+    breaker.record(True)
+    waiter.join(1.0)
+    assert not waiter.is_alive()
+    assert breaker.state == "closed"
+    assert not breaker.probe_in_flight
+    assert len(breaker.outcomes) == 0
+
+
+def test_failed_probe_reopens_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(window=10, min_calls=4, error_rate=0.5, cooldown_sec=30, clock=clock)
+    trip(breaker)
+
+    clock.now = 45.0
+    breaker.before_call()
+    breaker.record(False)
+
+    assert (breaker.state, breaker.trips, breaker.opened_at) == ("open", 2, 45.0)
+    assert not breaker.probe_in_flight
+
+    # 다시 대기 시간이 지나야 다음 시험 호출
+    clock.now = 75.0
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+def test_stream_retries_failures_before_first_chunk(delays):
+    inner, backend = resilient([
+        LLMBackendError("연결 실패", 503),
+        [LLMBackendError("한도 초과", 429, retry_after=2.0)],
+        ["첫 문장이다. ", "둘째 문장이다."],
+    ])
+
+    stream = backend.stream("총 2장", [])
+    assert "".join(stream) == "첫 문장이다. 둘째 문장이다."
+    assert stream.usage == {"prompt_tokens": 10}
+
+    assert inner.calls == 3
+    assert delays == [(1, None), (2, 2.0)]
+    assert backend.stats == {"calls": 1, "retries": 2, "failures": 0}
+    assert backend.breaker.state == "closed"
+
+
+def test_stream_does_not_retry_after_first_chunk(delays):
+    inner, backend = resilient([
+        ["첫 문장이다. ", "둘째", LLMBackendError("연결 끊김", 503)],
+        ["다시 보내면 안 되는 응답."],
+    ])
+
+    received = []
+    with pytest.raises(LLMBackendError) as excinfo:
+        for chunk in backend.stream("총 2장", []):
+            received.append(chunk)
+
+    assert excinfo.value.status == 503
+    assert received == ["첫 문장이다. ", "둘째"]
+    assert inner.calls == 1
+    assert delays == []
+    assert backend.stats == {"calls": 1, "retries": 0, "failures": 1}
+
+
+def test_stream_raises_non_retryable_error_immediately(delays):
+    inner, backend = resilient([LLMBackendError("잘못된 요청", 400), ["응답."]])
+    with pytest.raises(LLMBackendError):
+        backend.stream("총 1장", [])
+    assert inner.calls == 1
+    assert delays == []
+    # 요청 오류는 서비스 상태와 무관하므로 차단기에는 성공으로 기록
+    assert list(backend.breaker.outcomes) == [True]
+
+
+def test_stream_gives_up_after_max_attempts(delays):
+    inner, backend = resilient([LLMBackendError("서버 오류", 500)] * 3, max_attempts=3)
+    with pytest.raises(LLMBackendError):
+        backend.stream("총 1장", [])
+    assert inner.calls == 3
+    assert [attempt for attempt, _ in delays] == [1, 2]
+    assert backend.stats == {"calls": 1, "retries": 2, "failures": 1}
+
+
+@pytest.mark.parametrize("attempt", [1, 2, 3, 5, 8, 12])
+def test_backoff_delay_within_exponential_bound(attempt):
+    random.seed(attempt)
+    bound = min(60.0, 1.0 * 2 ** (attempt - 1))
+    samples = [backoff_delay(attempt, base_sec=1.0, max_sec=60.0) for _ in range(500)]
+    assert all(0 <= delay <= bound for delay in samples)
+    # full jitter: 구간 전체에 퍼짐
+    assert max(samples) > bound * 0.9
+    assert min(samples) < bound * 0.1
+
+
+def test_backoff_delay_follows_retry_after():
+    random.seed(0)
+    samples = [backoff_delay(1, retry_after=120.0, max_sec=60.0) for _ in range(500)]
+    # Retry-After 에는 상한을 적용하지 않고 최대 10% 만 늦춤
+    assert all(120.0 <= delay <= 132.0 for delay in samples)
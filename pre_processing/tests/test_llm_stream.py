@@ -0,0 +1,70 @@
+import time
+
+from llm_stream import LINE_BOUNDARY, SentenceSplitter, StubStreamingModel, validate_sentence
+from video_llm_RnD import analyze_images_with_gemini
+
+
+def feed_all(splitter, chunks):
+    """조각을 차례로 넣고 (조각 번호, 완성된 문장) 목록 반환"""
+    return [(i, sentence) for i, chunk in enumerate(chunks) for sentence in splitter.feed(chunk)]
+
+
+def test_on_sentence_fires_before_stream_finishes():
+    backend = StubStreamingModel(delay=0.05, first_delay=0.05, chunk_chars=16)
+    started = time.perf_counter()
+    arrivals = []
+
+    def on_sentence(index, sentence):
+        arrivals.append((index, time.perf_counter() - started, sentence))
+
+    text = analyze_images_with_gemini([""] * 9, 9, on_sentence=on_sentence, backend=backend)
+    total = time.perf_counter() - started
+
+    assert [index for index, _, _ in arrivals] == list(range(9))
+    assert arrivals[0][1] < total / 2
+    # 문장을 모두 이어 붙이면 전체 응답
+    assert " ".join(sentence for _, _, sentence in arrivals) == text
+
+
+def test_period_at_chunk_boundary_waits_for_next_chunk():
+    splitter = SentenceSplitter()
+    # 마침표로 조각이 끝나면 다음 조각이 공백으로 시작해야 문장 끝
+    assert feed_all(splitter, ["첫 문장이다.", " 둘째는 1.", "5초 뒤 끝난다.", " "]) == [
+        (1, "첫 문장이다."),
+        (3, "둘째는 1.5초 뒤 끝난다."),
+    ]
+    assert splitter.flush() == []
+
+
+def test_newline_is_a_boundary():
+    splitter = SentenceSplitter()
+    assert feed_all(splitter, ["제목 없는 줄\n둘째 줄", "이다\n"]) == [(0, "제목 없는 줄"), (1, "둘째 줄이다")]
+
+    # 격자 응답은 줄 단위 ("2. 문장." 의 번호 마침표에서 나누지 않음)
+    splitter = SentenceSplitter(LINE_BOUNDARY)
+    assert feed_all(splitter, ["[1] 2. 사람이 걷는다.", " 개가 뛴다.\n[2] 차가"]) == [
+        (1, "[1] 2. 사람이 걷는다. 개가 뛴다."),
+    ]
+    assert splitter.flush() == ["[2] 차가"]
+
+
+def test_flush_returns_trailing_text():
+    splitter = SentenceSplitter()
+    assert feed_all(splitter, ["마지막 문장은 마침표가", " 없다"]) == []
+    assert splitter.flush() == ["마지막 문장은 마침표가 없다"]
+    assert splitter.flush() == []
+
+
+def test_stream_flushes_sentence_without_period():
+    backend = StubStreamingModel(delay=0, first_delay=0, chunk_chars=5, text="사람이 걷는다. 끝맺지 않은 문장")
+    sentences = []
+    analyze_images_with_gemini([""], 1, on_sentence=lambda index, sentence: sentences.append(sentence), backend=backend)
+    assert sentences == ["사람이 걷는다.", "끝맺지 않은 문장"]
+
+
+def test_validate_sentence_reports_violations():
+    assert validate_sentence("사람이 길을 걷고 있다.") == []
+    assert validate_sentence("사람이 길을 걷고 있다") == ["마침표 없음"]
+    assert validate_sentence("사람이 길을 걷고 있습니다.") == ["경어"]
+    assert validate_sentence("사람이 뛰어가는 듯하다.") == ["금지 표현 '듯하다'"]
+    assert validate_sentence("문이 열려 있는 하는 상태이다") == ["마침표 없음", "금지 표현 '하는 상태이다'"]
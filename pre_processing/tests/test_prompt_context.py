@@ -0,0 +1,138 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import prompt_context
+from llm_backend import FakeHTTPBackend, gemini_context_min_tokens
+from prompt_context import PromptContextCache
+from video_llm_RnD import (
+    SCENE_SUMMARY_CONTEXT,
+    SCENE_SUMMARY_RULES,
+    analyze_images_with_gemini,
+    combined_prompt,
+    create_analysis_instruction,
+    create_analysis_prompt,
+    create_analysis_request,
+    create_combined_analysis_prompt,
+    create_get_object_prompt,
+    create_grid_analysis_prompt,
+    full_prompt,
+    prompt_block,
+)
+
+INSTRUCTION = create_analysis_instruction()
+
+# 기존 프롬프트 문자열 해시 (이미지 9장) - 바뀌면 모델 응답과 llm_cache 키가 모두 달라짐
+PROMPT_SHA256 = {
+    create_analysis_prompt: "22848d0906b3677eae605455f518769f65ceddfa3bc811559f8fe553e674d867",
+    create_get_object_prompt: "db482575a2523573449888227ad3e6e0393def6d26f889c64826cef532158f52",
+    combined_prompt: "29c1347fa988c7cd63b9aa79b914bfd24879e76f84fa816b36fe718e9c855aab",
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_process_state(monkeypatch):
+    """테스트마다 프로세스 단위 기록을 비움"""
+    monkeypatch.setattr(prompt_context, "_PROCESS_CONTEXTS", {})
+    monkeypatch.setattr(prompt_context, "_REPORTED_BELOW_MINIMUM", set())
+
+
+def get_context_name(url, registry_path):
+    """다른 프로세스에서 컨텍스트 조회 (ProcessPoolExecutor 작업자)"""
+    contexts = PromptContextCache(registry_path)
+    try:
+        return contexts.get(FakeHTTPBackend(url), INSTRUCTION).name
+    finally:
+        contexts.close()
+
+
+def test_default_prompts_unchanged():
+    for create_prompt, digest in PROMPT_SHA256.items():
+        assert hashlib.sha256(create_prompt(9).encode("utf-8")).hexdigest() == digest, create_prompt.__name__
+
+
+def test_prompts_share_scene_rules():
+    prompts = [
+        create_analysis_prompt(4), INSTRUCTION, combined_prompt(4),
+        create_combined_analysis_prompt(4), create_grid_analysis_prompt(4),
+    ]
+    for prompt in prompts:
+        assert prompt_block(SCENE_SUMMARY_CONTEXT) in prompt
+        assert prompt_block(SCENE_SUMMARY_RULES) in prompt
+
+
+def test_context_request_carries_image_count():
+    # 컨텍스트 캐시 경로만 지시문 / 이미지 수 부분으로 나눔
+    prompt = full_prompt(create_analysis_request(9), INSTRUCTION)
+    assert prompt.startswith(INSTRUCTION)
+    assert prompt.endswith("총 9장이며, 각 이미지당 정확히 한 문장씩 작성해 총 9문장을 출력한다.")
+    assert "9" not in INSTRUCTION
+
+
+def test_gemini_min_tokens_by_model():
+    assert gemini_context_min_tokens("gemini-2.5-pro") == 4096
+    assert gemini_context_min_tokens("models/gemini-2.5-flash-lite") == 1024
+    assert gemini_context_min_tokens("unknown-model") == 0
+
+
+def test_below_minimum_skips_create(fake_llm_server, tmp_path, capsys):
+    _, url = fake_llm_server()
+    backend = FakeHTTPBackend(url)
+    backend.min_context_tokens = 4096
+    contexts = PromptContextCache(tmp_path / "contexts.sqlite3")
+
+    assert contexts.get(backend, INSTRUCTION) is None
+    assert contexts.get(backend, INSTRUCTION) is None
+
+    assert backend.stats()["contexts"] == 0
+    assert contexts.entries() == []
+    assert capsys.readouterr().out.count("최소 토큰 수 미달") == 1
+
+
+@pytest.mark.parametrize("model_name, saves_tokens", [("gemini-2.5-pro", False), ("fake-llm", True)])
+def test_saved_tokens_report_by_model_minimum(fake_llm_server, tmp_path, model_name, saves_tokens):
+    # 현재 지시문은 기본 Gemini 모델의 최소 토큰 수에 못 미쳐 절감 토큰이 항상 0
+    server, url = fake_llm_server()
+    backend = FakeHTTPBackend(url)
+    backend.min_context_tokens = gemini_context_min_tokens(model_name)
+    contexts = PromptContextCache(tmp_path / "contexts.sqlite3")
+
+    for _ in range(2):
+        text = analyze_images_with_gemini(["aGVsbG8="] * 3, 3, backend=backend, context_cache=contexts)
+        assert text.count("장면에서") == 3
+
+    if saves_tokens:
+        assert contexts.stats["cached_requests"] == 2
+        assert contexts.stats["tokens_saved"] > 0
+        assert server.state.stats["requests"] == 2
+    else:
+        assert contexts.stats == {"cached_requests": 0, "inline_requests": 2, "created": 0, "tokens_saved": 0}
+        assert backend.stats()["contexts"] == 0
+
+
+def test_context_reused_and_recreated_after_invalidate(fake_llm_server, tmp_path):
+    _, url = fake_llm_server()
+    backend = FakeHTTPBackend(url)
+    contexts = PromptContextCache(tmp_path / "contexts.sqlite3")
+
+    first = contexts.get(backend, INSTRUCTION)
+    assert contexts.get(backend, INSTRUCTION).name == first.name
+    assert contexts.stats["created"] == 1
+
+    contexts.invalidate(backend, INSTRUCTION)
+    assert contexts.get(backend, INSTRUCTION).name != first.name
+    assert contexts.stats["created"] == 2
+
+
+def test_processes_share_one_context(fake_llm_server, tmp_path):
+    _, url = fake_llm_server()
+    registry_path = str(tmp_path / "contexts.sqlite3")
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        names = list(executor.map(get_context_name, [url] * 8, [registry_path] * 8))
+
+    # 동시에 시작해도 한 번만 등록하고 모두 같은 컨텍스트 사용
+    assert len(set(names)) == 1
+    assert FakeHTTPBackend(url).stats()["contexts"] == 1
+    assert [entry["name"] for _, entry in PromptContextCache(registry_path).entries()] == names[:1]
@@ -0,0 +1,101 @@
+import os
+
+from run_manifest import RunManifest, VideoRun, video_status
+
+OPTIONS = {"sampling": "interval", "dedup_distance": 4, "scene_summary": "off"}
+
+
+def start_run(tmp_path, options=OPTIONS, video_path=None):
+    """tmp_path/manifest 에 기록하는 a.mp4 실행 (출력 기준 폴더 tmp_path/out)"""
+    return VideoRun(tmp_path / "manifest", "cat", "a.mp4", tmp_path / "out", dict(options), video_path)
+
+
+def write_source(tmp_path, data=b"video"):
+    path = tmp_path / "a.mp4"
+    path.write_bytes(data)
+    return path
+
+
+def complete_all(run, output):
+    run.complete("probed", data={"duration": 10.0})
+    run.complete("extracted", outputs=[output], data={"frames": 3})
+    run.complete("selected", data={"images": ["a_V_1.jpg"]})
+
+
+def test_resume_restores_completed_stages(tmp_path):
+    output = tmp_path / "out" / "frames.txt"
+    output.parent.mkdir()
+    output.write_text("frames")
+    complete_all(start_run(tmp_path), output)
+
+    run = start_run(tmp_path)
+    assert run.done("probed") == {"duration": 10.0}
+    assert run.done("extracted") == {"frames": 3}
+    assert run.done("selected") == {"images": ["a_V_1.jpg"]}
+    assert run.done("summarized") is None
+
+
+def test_changed_option_or_output_invalidates_stage(tmp_path):
+    output = tmp_path / "out" / "frames.txt"
+    output.parent.mkdir()
+    output.write_text("frames")
+    complete_all(start_run(tmp_path), output)
+
+    # 선택 단계 옵션만 바뀌면 추출 단계는 그대로 사용
+    run = start_run(tmp_path, {**OPTIONS, "dedup_distance": 8})
+    assert run.done("extracted") == {"frames": 3}
+    assert run.done("selected") is None
+
+    # 출력 파일 내용이 바뀌면 해당 단계 다시 실행
+    output.write_text("changed")
+    assert start_run(tmp_path).done("extracted") is None
+
+
+def test_completing_a_stage_drops_later_stages(tmp_path):
+    output = tmp_path / "out" / "frames.txt"
+    output.parent.mkdir()
+    output.write_text("frames")
+    complete_all(start_run(tmp_path), output)
+
+    run = start_run(tmp_path)
+    run.complete("extracted", outputs=[output], data={"frames": 5})
+    run = start_run(tmp_path)
+    assert run.done("extracted") == {"frames": 5}
+    assert run.done("selected") is None
+
+
+def test_replaced_source_video_invalidates_every_stage(tmp_path, capsys):
+    source = write_source(tmp_path)
+    output = tmp_path / "out" / "frames.txt"
+    output.parent.mkdir()
+    output.write_text("frames")
+    complete_all(start_run(tmp_path, video_path=source), output)
+    assert start_run(tmp_path, video_path=source).done("selected") is not None
+
+    # 같은 이름의 다른 영상 (크기/수정 시각 변경)
+    write_source(tmp_path, b"another video")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    run = start_run(tmp_path, video_path=source)
+    assert "원본 영상이 바뀌어" in capsys.readouterr().out
+    assert all(run.done(stage) is None for stage in ("probed", "extracted", "selected"))
+
+    # 새 영상으로 다시 완료하면 이후 실행은 그대로 복원
+    complete_all(run, output)
+    assert start_run(tmp_path, video_path=source).done("selected") == {"images": ["a_V_1.jpg"]}
+
+
+def test_failure_recorded_on_first_unfinished_stage(tmp_path):
+    run = start_run(tmp_path)
+    run.complete("probed", data={"duration": 10.0})
+    run.start("extracted")
+
+    manifest = RunManifest(tmp_path / "manifest")
+    assert video_status(manifest.load("cat", "a.mp4")) == "running"
+
+    manifest.record_failure("cat", "a.mp4", "디코딩 실패")
+    state = manifest.load("cat", "a.mp4")
+    assert state["stages"]["extracted"] == {"status": "failed", "error": "디코딩 실패"}
+    assert video_status(state) == "failed"
+    assert [s["video"] for s in manifest.entries("cat")] == ["a.mp4"]
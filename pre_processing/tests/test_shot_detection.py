@@ -0,0 +1,37 @@
+from shot_detection import spread_picks_across_shots
+
+
+def picks_per_shot(shots, picks):
+    return [sum(start <= p < end for p in picks) for start, end in shots]
+
+
+def test_more_shots_than_count_picks_shot_middles():
+    shots = [(0, 10), (10, 20), (20, 30), (30, 40)]
+    assert spread_picks_across_shots(shots, 2) == [4, 24]
+    assert spread_picks_across_shots(shots, 4) == [4, 14, 24, 34]
+
+
+def test_remaining_picks_follow_shot_length():
+    shots = [(0, 30), (30, 40), (40, 100)]
+    picks = spread_picks_across_shots(shots, 6)
+    # 샷마다 1개 + 나머지 3개는 길이 비례 (최대 나머지 방식)
+    assert picks_per_shot(shots, picks) == [2, 1, 3]
+    assert picks == sorted(set(picks))
+
+
+def test_short_shot_capacity_moves_to_other_shots():
+    # 1프레임짜리 샷에 2개가 배정되지만 1개만 가능하므로 남는 1개는 긴 샷으로 넘어감
+    shots = [(0, 1), (1, 10)]
+    picks = spread_picks_across_shots(shots, 9)
+    assert len(picks) == 9
+    assert len(set(picks)) == 9
+    assert picks_per_shot(shots, picks) == [1, 8]
+
+
+def test_fewer_frames_than_count_returns_every_frame():
+    assert spread_picks_across_shots([(0, 2), (2, 4)], 5) == [0, 1, 2, 3]
+
+
+def test_empty_input():
+    assert spread_picks_across_shots([], 5) == []
+    assert spread_picks_across_shots([(0, 10)], 0) == []
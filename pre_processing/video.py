@@ -1,46 +1,61 @@
-import cv2
-import os
 from pathlib import Path
 from tqdm import tqdm
 
+from frame_pipeline import run_pipeline
+from frame_segments import extract_segments
+from decoders import DECODER_NAMES, get_decoder
+
 def extract_frames(
     video_path: str,
     out_dir: str = "frames_2s",
     interval_sec: float = 2.0,
+    workers: int = None,
+    segments: int = None,
+    decoder: str = "opencv",
 ):
-    """영상에서 interval_sec 초마다 프레임 저장."""
+    """
+    영상에서 interval_sec 초마다 프레임 저장.
+    디코딩/JPEG 인코딩/저장은 파이프라인으로 동시에 처리 (workers: 인코딩 스레드 수)
+    segments 를 지정하면 영상을 N개 구간으로 나누어 프로세스별로 동시에 디코딩
+    (파일명은 구간과 상관없이 전체 기준 번호)
+    decoder: "opencv", "ffmpeg", "pyav", "auto" (설치되지 않았으면 opencv)
+    """
     video_path = Path(video_path)
-    cap = cv2.VideoCapture(str(video_path))
-
-    if not cap.isOpened():
-        raise IOError(f"❌  영상 열기 실패: {video_path}")
+    video_decoder = get_decoder(decoder, video_path, "sequential")
 
-    fps = cap.get(cv2.CAP_PROP_FPS)          # 초당 프레임 수
-    step = int(fps * interval_sec)           # 건너뛸 프레임 수
-    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = video_decoder.fps                  # 초당 프레임 수
+    step = max(1, int(fps * interval_sec))   # 건너뛸 프레임 수
+    total = video_decoder.frame_count
 
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    frame_idx = 0
-    saved_idx = 0
+    if segments and segments > 1:
+        # 긴 영상: 구간 병렬 추출 (프레임 수는 컨테이너 메타데이터 기준)
+        video_decoder.close()
+        frame_indices = list(range(0, total, step))
+        file_names = [f"frame_{saved_idx:05d}.jpg" for saved_idx in range(len(frame_indices))]
+        with tqdm(total=len(frame_indices), desc="Extracting") as pbar:
+            results = extract_segments(video_path, frame_indices, file_names, out_dir, segments, pbar, decoder)
+        saved = sum(1 for _, _, success in results if success)
+        print(f"🎉  {saved}장 저장 완료 → {out_dir.resolve()}")
+        return
 
-    with tqdm(total=total, desc="Extracting") as pbar:
-        while True:
-            ret, frame = cap.read()
+    def decode(pbar):
+        # 저장할 프레임만 디코더에서 받음 (건너뛸 프레임 처리는 디코더가 담당)
+        # 컨테이너 프레임 수가 실제와 달라도 디코더가 영상 끝을 알릴 때까지 읽음
+        for saved_idx, (frame_idx, ret, frame) in enumerate(video_decoder.read_every(step)):
             if not ret:
                 break
+            # 파일명은 디코딩 순서대로 결정
+            yield saved_idx, frame, [out_dir / f"frame_{saved_idx:05d}.jpg"]
+            pbar.update(max(0, min(step, total - pbar.n)))
 
-            if frame_idx % step == 0:
-                fname = out_dir / f"frame_{saved_idx:05d}.jpg"
-                cv2.imwrite(str(fname), frame)
-                saved_idx += 1
-
-            frame_idx += 1
-            pbar.update(1)
+    with tqdm(total=total, desc="Extracting") as pbar:
+        stats = run_pipeline(decode(pbar), workers=workers, pbar=pbar)
 
-    cap.release()
-    print(f"🎉  {saved_idx}장 저장 완료 → {out_dir.resolve()}")
+    video_decoder.close()
+    print(f"🎉  {stats['written']}장 저장 완료 → {out_dir.resolve()}")
 
 if __name__ == "__main__":
     # ▶ 예시 실행: python save_frames.py D_옷소매_붉은_끝동.mp4
@@ -54,6 +69,15 @@ if __name__ == "__main__":
     parser.add_argument(
         "-t", "--interval", type=float, default=2.0, help="추출 간격(초)"
     )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="JPEG 인코딩 스레드 수"
+    )
+    parser.add_argument(
+        "-n", "--segments", type=int, default=None, help="구간 병렬 추출 프로세스 수 (긴 영상용)"
+    )
+    parser.add_argument(
+        "-d", "--decoder", default="opencv", choices=DECODER_NAMES, help="디코더 백엔드"
+    )
     args = parser.parse_args()
 
-    extract_frames(args.video, args.out, args.interval)
\ No newline at end of file
+    extract_frames(args.video, args.out, args.interval, args.workers, args.segments, args.decoder)
\ No newline at end of file
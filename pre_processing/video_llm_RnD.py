@@ -6,25 +6,88 @@ Video LLM Analysis Script
 
 import os
 import base64
-import google.generativeai as genai
 import json
 import re
 import glob
+import time
+import textwrap
+
+from frame_profiles import choose_profile, estimate_image_tokens, jpeg_size
+from llm_dispatcher import Dispatcher, print_dispatch_summary
+from llm_cache import make_cache_key
+from llm_stream import LINE_BOUNDARY, SentenceSplitter
+from llm_backend import get_backend
+from llm_retry import ResilientBackend, is_retryable, print_resilience_stats
+from llm_metrics import CALL_LABEL, call_label
+from image_grid import GRID_COLUMNS, GRID_ROWS, GRID_SHEET_SIZE, pack_contact_sheets, sheet_count
+
+# 분석 방식
+# - summary : 장면 요약 문장만 (create_analysis_prompt, 텍스트 응답)
+# - combined: 장면 요약 + 이미지별 객체를 한 번의 호출로 (create_combined_analysis_prompt, JSON 응답)
+ANALYSIS_MODES = ("summary", "combined")
+
+# 통합 분석 응답 형식 (Gemini 구조화 출력)
+COMBINED_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "array", "items": {"type": "string"}},
+        "objects": {"type": "array", "items": {"type": "array", "items": {"type": "string"}}},
+    },
+    "required": ["summary", "objects"],
+}
+COMBINED_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": COMBINED_RESPONSE_SCHEMA,
+}
+
+# 이미지 전송 방식
+# - separate: 이미지마다 inline_data 하나씩
+# - grid    : 번호를 붙인 격자 이미지(contact sheet)로 합쳐 전송 (image_grid.py, 이미지당 토큰/헤더 절감)
+IMAGE_PACKING_MODES = ("separate", "grid")
+
+# 프롬프트 토큰 수 추정 기준 (한국어 기준 약 2글자당 1토큰)
+PROMPT_CHARS_PER_TOKEN = 2
+
+# 장면 요약에 사용할 LLM 백엔드 (setup_llm_backend 로 설정, llm_backend.py)
+_active_backend = None
+
+def setup_llm_backend(backend=None):
+    """
+    LLM 백엔드 설정 (이후 분석 함수들이 이 백엔드로 요청)
+    재시도 / 회로 차단 / 호출 지표 기록을 위해 ResilientBackend 로 감싼다 (llm_retry.py)
+    
+    Args:
+        backend (str | LLMBackend): 백엔드 이름 ("gemini", "fake") 또는 백엔드 객체 (None 이면 LLM_BACKEND 환경변수)
+        
+    Returns:
+        LLMBackend: 설정한 백엔드
+    """
+    global _active_backend
+    backend = get_backend(backend)
+    if not isinstance(backend, ResilientBackend):
+        backend = ResilientBackend(backend)
+    backend.configure()
+    _active_backend = backend
+    print(f"✅ LLM 백엔드: {backend.name} ({backend.model_name})")
+    return backend
+
+def current_backend():
+    """설정된 LLM 백엔드 (설정 전이면 LLM_BACKEND 환경변수로 설정)"""
+    return _active_backend if _active_backend is not None else setup_llm_backend()
 
 def setup_gemini_api():
     """Gemini API 설정"""
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    if not GEMINI_API_KEY:
-        raise ValueError("GEMINI_API_KEY 환경변수가 설정되지 않았습니다.")
-    
-    genai.configure(api_key=GEMINI_API_KEY)
-    print("✅ Gemini API 설정 완료!")
+    setup_llm_backend("gemini")
     return True
 
 def encode_image(file_path):
     """이미지 파일을 Base64로 인코딩"""
     with open(file_path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
+        return encode_image_bytes(f.read())
+
+def encode_image_bytes(data):
+    """메모리의 JPEG 바이트를 Base64로 인코딩"""
+    return base64.b64encode(data).decode("utf-8")
 
 def get_images_from_folder(folder_path):
     """
@@ -81,17 +144,69 @@ def get_images_from_folder(folder_path):
     
     return unique_files
 
+def prompt_block(text):
+    """
+    프롬프트 공통 조각을 들여쓴 프롬프트 문자열 안에 넣을 수 있도록 둘째 줄부터 4칸 들여쓰기
+    (프롬프트 함수의 f-string 이 4칸 들여쓴 뒤 strip() 하므로, 넣은 결과는 직접 적은 것과 같은 문자열)
+    """
+    return textwrap.indent(text, "    ").lstrip()
+
+# 장면 요약 공통 [Goal]/[Role]/[Context]
+# (요약 / 컨텍스트 캐시 지시문 / 예시 통합 / 통합 / 격자 프롬프트가 함께 사용, 규칙은 여기서만 수정)
+# 프롬프트 문자열이 바뀌면 llm_cache 응답 캐시 키가 모두 바뀌므로 문구 변경은 별도 작업으로 진행
+SCENE_SUMMARY_CONTEXT = """[Goal]
+{미디어 장면 이미지에 대해 배경, 행동, 분위기, 장소 등 구체적으로 묘사하되 요약문 형태로 작성}
+
+[Role]
+{너는 영상 내 장면 정보를 소개하는 크리에이터이자 검색 기반으로 영상을 편집해야하는 편집자이다. 경어를 사용하지 않고 -이다. 또는 -중이다.와 같은 현재형 형태로만 작성한다.}
+
+[Context]
+{프로젝트는 방송 미디어로 보도, 시사교양, 드라마, 예능 등으로 구성되어 있으며 민감정보인 이목구비를 포함한 얼굴, 번호판 등 비식별되므로 표현해서는 안된다.}"""
+
+# 장면 요약 공통 [Constraints] 항목 (마침표 / 메타 정보 항목은 출력 형식에 따라 프롬프트별로 추가)
+SCENE_SUMMARY_RULES = """- 한국어로만.
+- 경어 금지.
+- 종결어미 규칙
+1) 동작·행위 → "-고 있다" 또는 "-중이다" (한 문장 안에서는 하나만 사용).
+2) 정적 속성·형태 → "-이다".
+3) 위치·존재 → "-에 있다".
+4) 추측·번역체 금지: "-하는 상태이다", "-듯하다" 등 사용 금지.
+5) 사물 표현 이중 피동·사동 금지 : "-되어지고 있다." 등 사용 금지.
+- 이목구비로 나타낼 수 있는 행동 묘사 금지.
+- 얼굴·번호판·표정 등 비식별·추론·유추 표현 금지."""
+
+# 객체 추출 공통 규칙 (객체 추출 / 예시 통합 프롬프트)
+OBJECT_EXTRACTION_RULES = """**명명 규칙:**
+- 특정 브랜드명이나 모델명 사용 금지 (예: "아이폰" → "스마트폰")
+- 일반적인 카테고리명 사용 (예: "노트북", "커피잔", "책")
+- 한국어 명사로 표현
+- 같은 종류의 여러 객체가 있으면 개수 포함 (예: "사과 3개")
+
+**포함 기준:**
+- 명확하게 식별되는 사물, 음식, 물건만 포함
+- 배경, 벽, 바닥 등은 제외
+- 확신도가 높은 객체만 포함
+- 부분적으로 보이더라도 명확히 식별되면 포함
+
+**크기 기준:**
+- 이미지에서 차지하는 비율이 1% 이상인 객체만 포함
+- 너무 작아서 정확히 식별하기 어려운 객체는 제외
+
+**판단 기준:**
+- 두 개 이상의 해석이 가능한 경우, 더 일반적인 명칭 사용
+- 용도가 불분명한 객체는 외관 기반으로 명명 (예: "원형 그릇", "긴 막대")
+- 확신도가 낮으면 상위 카테고리로 분류 (예: "전자기기", "용기")
+
+**제외 대상:**
+- 텍스트나 글자 (간판, 라벨 등)
+- 그림자, 반사, 빛
+- 로고, 패턴, 장식
+- 건축 구조물 (문, 창문, 계단 등)"""
+
 def create_analysis_prompt(image_count):
     """이미지 분석을 위한 프롬프트 생성"""
     prompt = f"""
-    [Goal]
-    {{미디어 장면 이미지에 대해 배경, 행동, 분위기, 장소 등 구체적으로 묘사하되 요약문 형태로 작성}}
-
-    [Role]
-    {{너는 영상 내 장면 정보를 소개하는 크리에이터이자 검색 기반으로 영상을 편집해야하는 편집자이다. 경어를 사용하지 않고 -이다. 또는 -중이다.와 같은 현재형 형태로만 작성한다.}}
-
-    [Context]
-    {{프로젝트는 방송 미디어로 보도, 시사교양, 드라마, 예능 등으로 구성되어 있으며 민감정보인 이목구비를 포함한 얼굴, 번호판 등 비식별되므로 표현해서는 안된다.}}
+    {prompt_block(SCENE_SUMMARY_CONTEXT)}
 
     [Task]
     1. 이미지 번호 순서대로 식별.
@@ -101,16 +216,7 @@ def create_analysis_prompt(image_count):
 
     [Constraints]
     - 이미지 세트 전체 {image_count}문장 (입력 이미지 수와 동일).
-    - 한국어로만.
-    - 경어 금지.
-    - 종결어미 규칙
-    1) 동작·행위 → "-고 있다" 또는 "-중이다" (한 문장 안에서는 하나만 사용).
-    2) 정적 속성·형태 → "-이다".
-    3) 위치·존재 → "-에 있다".
-    4) 추측·번역체 금지: "-하는 상태이다", "-듯하다" 등 사용 금지.
-    5) 사물 표현 이중 피동·사동 금지 : "-되어지고 있다." 등 사용 금지.
-    - 이목구비로 나타낼 수 있는 행동 묘사 금지.
-    - 얼굴·번호판·표정 등 비식별·추론·유추 표현 금지.
+    {prompt_block(SCENE_SUMMARY_RULES)}
     - 출력 문장은 각 문장 끝에 반드시 마침표('.').
     - '있고 있으며·하고 있으며' 등 이어말하기 접속 구조 금지 (문장 단위로 끊기).
     - 출력에 파일명·번호·범위 등 메타 정보 표기 금지.
@@ -120,6 +226,37 @@ def create_analysis_prompt(image_count):
     """
     return prompt.strip()
 
+def create_analysis_instruction():
+    """
+    장면 요약 고정 지시문 (이미지 수와 무관한 부분, 프롬프트 컨텍스트 캐시에 등록)
+    create_analysis_prompt 와 같은 규칙이며 이미지 수는 create_analysis_request 로 전달
+    (컨텍스트 캐시를 사용할 때만 쓰며, 기본 요약 요청은 create_analysis_prompt 그대로)
+    """
+    prompt = f"""
+    {prompt_block(SCENE_SUMMARY_CONTEXT)}
+
+    [Task]
+    1. 이미지 번호 순서대로 식별.
+    2. 각 이미지마다 인물의 행동, 주변 배경, 장소 분위기 등 다양한 형용사적 표현을 포함해 묘사.
+    3. 이미지를 순서대로 묘사하되, 최종 출력은 모든 문장을 하나의 단락으로 병합해 제시.
+    4. 각 이미지당 정확히 한 문장씩 작성해 입력 이미지 수와 같은 수의 문장을 출력한다. 누락·합병 금지.
+
+    [Constraints]
+    - 이미지 세트 전체 문장 수는 입력 이미지 수와 동일.
+    {prompt_block(SCENE_SUMMARY_RULES)}
+    - 출력 문장은 각 문장 끝에 반드시 마침표('.').
+    - '있고 있으며·하고 있으며' 등 이어말하기 접속 구조 금지 (문장 단위로 끊기).
+    - 출력에 파일명·번호·범위 등 메타 정보 표기 금지.
+
+    [Output]
+    <한 문장당 하나의 행동·배경·분위기 기술 후 마침표로 구분>
+    """
+    return prompt.strip()
+
+def create_analysis_request(image_count):
+    """장면 요약 요청별 부분 (create_analysis_instruction 과 함께 사용)"""
+    return f"입력된 이미지는 총 {image_count}장이며, 각 이미지당 정확히 한 문장씩 작성해 총 {image_count}문장을 출력한다."
+
 def create_get_object_prompt(image_count):
     """
     이미지 분석을 위한 프롬프트 생성
@@ -139,32 +276,7 @@ def create_get_object_prompt(image_count):
 
     ...
 
-    **명명 규칙:**
-    - 특정 브랜드명이나 모델명 사용 금지 (예: "아이폰" → "스마트폰")
-    - 일반적인 카테고리명 사용 (예: "노트북", "커피잔", "책")
-    - 한국어 명사로 표현
-    - 같은 종류의 여러 객체가 있으면 개수 포함 (예: "사과 3개")
-
-    **포함 기준:**
-    - 명확하게 식별되는 사물, 음식, 물건만 포함
-    - 배경, 벽, 바닥 등은 제외
-    - 확신도가 높은 객체만 포함
-    - 부분적으로 보이더라도 명확히 식별되면 포함
-
-    **크기 기준:**
-    - 이미지에서 차지하는 비율이 1% 이상인 객체만 포함
-    - 너무 작아서 정확히 식별하기 어려운 객체는 제외
-
-    **판단 기준:**
-    - 두 개 이상의 해석이 가능한 경우, 더 일반적인 명칭 사용
-    - 용도가 불분명한 객체는 외관 기반으로 명명 (예: "원형 그릇", "긴 막대")
-    - 확신도가 낮으면 상위 카테고리로 분류 (예: "전자기기", "용기")
-
-    **제외 대상:**
-    - 텍스트나 글자 (간판, 라벨 등)
-    - 그림자, 반사, 빛
-    - 로고, 패턴, 장식
-    - 건축 구조물 (문, 창문, 계단 등)
+    {prompt_block(OBJECT_EXTRACTION_RULES)}
     """
     return prompt.strip()
 
@@ -176,14 +288,7 @@ def combined_prompt(image_count):
     2. 객체 추출을 위한 프롬프트
 
     1. 이미지 분석을 위한 프롬프트
-    [Goal]
-    {{미디어 장면 이미지에 대해 배경, 행동, 분위기, 장소 등 구체적으로 묘사하되 요약문 형태로 작성}}
-
-    [Role]
-    {{너는 영상 내 장면 정보를 소개하는 크리에이터이자 검색 기반으로 영상을 편집해야하는 편집자이다. 경어를 사용하지 않고 -이다. 또는 -중이다.와 같은 현재형 형태로만 작성한다.}}
-
-    [Context]
-    {{프로젝트는 방송 미디어로 보도, 시사교양, 드라마, 예능 등으로 구성되어 있으며 민감정보인 이목구비를 포함한 얼굴, 번호판 등 비식별되므로 표현해서는 안된다.}}
+    {prompt_block(SCENE_SUMMARY_CONTEXT)}
 
     [Task]
     1. 이미지 번호 순서대로 식별.
@@ -193,16 +298,7 @@ def combined_prompt(image_count):
 
     [Constraints]
     - 이미지 세트 전체 {image_count}문장 (입력 이미지 수와 동일).
-    - 한국어로만.
-    - 경어 금지.
-    - 종결어미 규칙
-    1) 동작·행위 → "-고 있다" 또는 "-중이다" (한 문장 안에서는 하나만 사용).
-    2) 정적 속성·형태 → "-이다".
-    3) 위치·존재 → "-에 있다".
-    4) 추측·번역체 금지: "-하는 상태이다", "-듯하다" 등 사용 금지.
-    5) 사물 표현 이중 피동·사동 금지 : "-되어지고 있다." 등 사용 금지.
-    - 이목구비로 나타낼 수 있는 행동 묘사 금지.
-    - 얼굴·번호판·표정 등 비식별·추론·유추 표현 금지.
+    {prompt_block(SCENE_SUMMARY_RULES)}
     - 출력 문장은 각 문장 끝에 반드시 마침표('.').
     - '있고 있으며·하고 있으며' 등 이어말하기 접속 구조 금지 (문장 단위로 끊기).
     - 출력에 파일명·번호·범위 등 메타 정보 표기 금지.
@@ -227,6 +323,40 @@ def combined_prompt(image_count):
 
     ...
 
+    {prompt_block(OBJECT_EXTRACTION_RULES)}
+    """
+    return prompt.strip()
+
+def create_combined_analysis_prompt(image_count):
+    """
+    장면 요약 + 이미지별 객체 추출을 한 번에 요청하는 프롬프트 생성 (JSON 출력)
+    combined_prompt 와 달리 예시 요약문 없이 실제 이미지 수로 작성
+    """
+    prompt = f"""
+    입력된 이미지는 총 {image_count}장이며, 이미지 번호 순서대로 아래 두 작업을 한 번에 수행한다.
+    1. 장면 요약: 이미지마다 정확히 한 문장 (summary 배열, {image_count}개)
+    2. 객체 추출: 이미지마다 객체 목록 (objects 배열, {image_count}개)
+
+    1. 장면 요약
+    {prompt_block(SCENE_SUMMARY_CONTEXT)}
+
+    [Task]
+    1. 이미지 번호 순서대로 식별.
+    2. 각 이미지마다 인물의 행동, 주변 배경, 장소 분위기 등 다양한 형용사적 표현을 포함해 묘사.
+    3. 각 이미지당 정확히 한 문장씩 작성해 summary 배열에 이미지 순서대로 {image_count}개를 넣는다. 누락·합병 금지.
+
+    [Constraints]
+    {prompt_block(SCENE_SUMMARY_RULES)}
+    - 각 문장 끝에 반드시 마침표('.').
+    - '있고 있으며·하고 있으며' 등 이어말하기 접속 구조 금지 (문장 단위로 끊기).
+    - 문장에 파일명·번호·범위 등 메타 정보 표기 금지.
+
+    2. 객체 추출
+    **분석 절차:**
+    1단계: 이미지 전체를 스캔하며 식별 가능한 모든 객체 파악
+    2단계: 1번 작업의 해당 이미지 요약 문장을 참고해 객체 추출
+    3단계: 각 객체를 적절한 일반명사로 분류
+
     **명명 규칙:**
     - 특정 브랜드명이나 모델명 사용 금지 (예: "아이폰" → "스마트폰")
     - 일반적인 카테고리명 사용 (예: "노트북", "커피잔", "책")
@@ -238,10 +368,7 @@ def combined_prompt(image_count):
     - 배경, 벽, 바닥 등은 제외
     - 확신도가 높은 객체만 포함
     - 부분적으로 보이더라도 명확히 식별되면 포함
-
-    **크기 기준:**
     - 이미지에서 차지하는 비율이 1% 이상인 객체만 포함
-    - 너무 작아서 정확히 식별하기 어려운 객체는 제외
 
     **판단 기준:**
     - 두 개 이상의 해석이 가능한 경우, 더 일반적인 명칭 사용
@@ -253,61 +380,581 @@ def combined_prompt(image_count):
     - 그림자, 반사, 빛
     - 로고, 패턴, 장식
     - 건축 구조물 (문, 창문, 계단 등)
+
+    [Output]
+    JSON 객체 하나만 출력한다. summary 와 objects 는 모두 길이 {image_count} 이며 i번째 항목이 i번째 이미지이다.
+    {{"summary": ["1번 이미지 문장.", ...], "objects": [["객체명1", "객체명2"], ...]}}
+    """
+    return prompt.strip()
+
+def grid_prompt_preface(image_count, columns=GRID_COLUMNS, rows=GRID_ROWS):
+    """격자 이미지로 전송할 때 프롬프트 앞에 붙이는 칸 번호 설명"""
+    sheets = sheet_count(image_count, columns, rows)
+    prompt = f"""
+    [Input]
+    원본 이미지 {image_count}장을 {columns}x{rows} 격자 이미지 {sheets}장으로 합쳐 전달한다.
+    격자의 각 칸이 원본 이미지 1장이며, 칸 왼쪽 위에 적힌 숫자가 이미지 번호이다.
+    칸 번호는 왼쪽에서 오른쪽, 위에서 아래 순서이고 다음 격자 이미지로 이어진다 (1 ~ {image_count}).
+    아래에서 '이미지'는 격자 이미지 전체가 아니라 각 칸을 뜻한다. 칸 사이 경계를 넘어 내용을 섞지 않는다.
+    칸 번호 숫자 자체는 장면 내용이 아니므로 묘사하지 않는다.
     """
     return prompt.strip()
 
-def analyze_images_with_gemini(encoded_images, image_count):
+def create_grid_analysis_prompt(image_count, columns=GRID_COLUMNS, rows=GRID_ROWS):
+    """
+    격자 이미지 장면 요약 프롬프트 생성
+    create_analysis_prompt 와 같은 규칙이며, 이미지별 문장을 되찾을 수 있도록 칸 번호를 붙여 출력
     """
-    Gemini API를 사용하여 이미지들을 분석
+    prompt = f"""
+    {grid_prompt_preface(image_count, columns, rows)}
+
+    {prompt_block(SCENE_SUMMARY_CONTEXT)}
+
+    [Task]
+    1. 칸 번호 순서대로 식별.
+    2. 각 칸마다 인물의 행동, 주변 배경, 장소 분위기 등 다양한 형용사적 표현을 포함해 묘사.
+    3. 칸은 총 {image_count}개이며, 각 칸당 정확히 한 문장씩 작성해 총 {image_count}줄을 출력한다. 누락·합병 금지.
+
+    [Constraints]
+    {prompt_block(SCENE_SUMMARY_RULES)}
+    - 각 문장 끝에 반드시 마침표('.').
+    - '있고 있으며·하고 있으며' 등 이어말하기 접속 구조 금지 (문장 단위로 끊기).
+    - 문장 안에 파일명·번호·범위 등 메타 정보 표기 금지 (줄 앞의 칸 번호 표기만 허용).
+
+    [Output]
+    한 줄에 한 칸씩, 줄 앞에 칸 번호를 대괄호로 표기한다. 다른 설명은 출력하지 않는다.
+    [1] 첫 번째 칸 문장.
+    [2] 두 번째 칸 문장.
+    ...
+    [{image_count}] 마지막 칸 문장.
+    """
+    return prompt.strip()
+
+def split_sentences(text):
+    """장면 요약 단락을 문장 단위로 분리 (마침표 + 공백/줄바꿈 기준, 스트리밍과 같은 규칙)"""
+    splitter = SentenceSplitter()
+    return splitter.feed(text) + splitter.flush()
+
+def parse_numbered_line(line, image_count):
+    """
+    "[번호] 문장." 한 줄 파싱
+    
+    Returns:
+        tuple | None: (0부터 시작하는 이미지 위치, 마침표로 끝나는 문장), 형식이 다르거나 범위 밖이면 None
+    """
+    match = re.match(r"^\s*[\[(]?\s*(\d+)\s*[\])]?[.:)]?\s+(.+?)\s*$", line)
+    if not match or not 1 <= int(match.group(1)) <= image_count:
+        return None
+    sentence = match.group(2)
+    return int(match.group(1)) - 1, sentence if sentence.endswith(".") else sentence + "."
+
+def parse_numbered_sentences(text, image_count):
+    """
+    "[번호] 문장." 형식 응답에서 이미지별 문장 복원
     
     Args:
-        encoded_images (list): Base64로 인코딩된 이미지 데이터 리스트
+        text (str): Gemini 응답 텍스트
         image_count (int): 이미지 개수
         
     Returns:
-        str: Gemini API 응답 텍스트
+        list: 이미지 번호 순서의 문장 리스트 (응답에 없는 번호는 None)
+    """
+    sentences = [None] * image_count
+    for line in text.splitlines():
+        parsed = parse_numbered_line(line, image_count)
+        # 범위를 벗어난 번호, 같은 번호가 반복되면 첫 문장만 사용
+        if parsed and sentences[parsed[0]] is None:
+            sentences[parsed[0]] = parsed[1]
+    return sentences
+
+def parse_combined_response(text, image_count):
     """
-    # 모델 생성
-    model = genai.GenerativeModel("gemini-2.5-pro")
-    print(f"사용할 모델: {model.model_name}")
+    통합 분석 JSON 응답 파싱 및 검증
     
-    # 프롬프트 생성
-    prompt = create_analysis_prompt(image_count)
-    print(f"프롬프트에 전달된 이미지 개수: {image_count}")
+    Args:
+        text (str): Gemini 응답 텍스트
+        image_count (int): 이미지 개수
+        
+    Returns:
+        dict: {"summary": [이미지별 문장], "objects": [이미지별 객체명 리스트]}
+        
+    Raises:
+        ValueError: JSON 형식이 아니거나 항목 수/타입이 맞지 않는 경우
+    """
+    # ```json ... ``` 코드 블록으로 감싼 응답 허용
+    text = re.sub(r"^\s*```(?:json)?\s*|\s*```\s*$", "", text.strip())
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"통합 분석 응답이 JSON 이 아닙니다: {e}")
+    if not isinstance(data, dict):
+        raise ValueError("통합 분석 응답이 JSON 객체가 아닙니다")
+
+    summary = data.get("summary")
+    objects = data.get("objects")
+    if not isinstance(summary, list) or not all(isinstance(s, str) and s.strip() for s in summary):
+        raise ValueError("summary 는 빈 문자열이 없는 문자열 배열이어야 합니다")
+    if not isinstance(objects, list) or not all(
+        isinstance(items, list) and all(isinstance(item, str) for item in items) for items in objects
+    ):
+        raise ValueError("objects 는 문자열 배열의 배열이어야 합니다")
+    if len(summary) != image_count or len(objects) != image_count:
+        raise ValueError(
+            f"이미지 {image_count}장과 항목 수가 다릅니다 (summary {len(summary)}개, objects {len(objects)}개)"
+        )
+
+    # 문장 끝 마침표 보정, 빈 객체명/중복 제거
+    sentences = [s.strip() if s.strip().endswith(".") else s.strip() + "." for s in summary]
+    object_lists = [list(dict.fromkeys(item.strip() for item in items if item.strip())) for items in objects]
+    return {"summary": sentences, "objects": object_lists}
+
+def full_prompt(prompt, instruction=None):
+    """고정 지시문을 직접 포함한 프롬프트 (컨텍스트 캐시를 쓰지 않을 때, 응답 캐시 키)"""
+    return f"{instruction}\n\n{prompt}" if instruction else prompt
+
+def resolve_context(prompt, backend, instruction=None, context_cache=None):
+    """
+    요청에 사용할 컨텍스트와 프롬프트 결정
+    고정 지시문(instruction)이 있고 백엔드가 컨텍스트 캐시를 지원하면 등록된 컨텍스트와
+    요청별 프롬프트만, 아니면 지시문을 붙인 전체 프롬프트를 사용
     
-    # 입력 데이터 구성
-    parts = [{"text": prompt}]
-    parts.extend([
-        {"inline_data": {"mime_type": "image/jpeg", "data": img}} 
-        for img in encoded_images
-    ])
+    Returns:
+        tuple: (보낼 프롬프트, 사용할 컨텍스트 또는 None)
+    """
+    if instruction and context_cache is not None:
+        context = context_cache.get(backend, instruction)
+        if context is not None:
+            return prompt, context
+    return full_prompt(prompt, instruction), None
+
+def generate_with_images(
+    prompt, encoded_images, generation_config=None, cache=None, backend=None, instruction=None, context_cache=None
+):
+    """
+    프롬프트 + 이미지로 LLM 호출
+    
+    Args:
+        prompt (str): 프롬프트 (instruction 이 있으면 요청별 부분만)
+        encoded_images (list): Base64로 인코딩된 이미지 데이터 리스트
+        generation_config (dict): 생성 설정 (예: COMBINED_GENERATION_CONFIG)
+        cache (LLMResponseCache): 응답 캐시, 같은 모델/프롬프트/이미지/설정이면 API 호출 없이 저장된 응답 반환
+        backend (LLMBackend): 사용할 백엔드 (None 이면 setup_llm_backend 로 설정한 백엔드)
+        instruction (str): 고정 지시문 (context_cache 가 있으면 컨텍스트로 한 번만 등록, 없으면 프롬프트 앞에 포함)
+        context_cache (PromptContextCache): 프롬프트 컨텍스트 캐시 (prompt_context.py)
+        
+    Returns:
+        str: 응답 텍스트
+    """
+    backend = backend or current_backend()
+    if cache is not None:
+        cache_key = make_cache_key(backend.model_name, full_prompt(prompt, instruction), encoded_images, generation_config)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ LLM 응답 캐시 적중 ({cache_key[:12]})")
+            return cached
+
+    request_prompt, context = resolve_context(prompt, backend, instruction, context_cache)
+    print(f"사용할 모델: {backend.model_name}" + (f" (컨텍스트 {context.name})" if context else ""))
     
     # API 호출
     print("API 호출 중...")
-    response = model.generate_content(parts)
+    try:
+        response = backend.generate(request_prompt, encoded_images, generation_config, context)
+    except Exception as e:
+        if context is None or is_retryable(e):
+            raise
+        # 컨텍스트가 만료/삭제된 경우 기록을 지우고 지시문을 직접 포함해 다시 요청
+        print(f"⚠️ 프롬프트 컨텍스트 요청 실패, 지시문 직접 전송: {type(e).__name__}: {e}")
+        context_cache.invalidate(backend, instruction)
+        context = None
+        response = backend.generate(full_prompt(prompt, instruction), encoded_images, generation_config)
+    if instruction and context_cache is not None:
+        context_cache.record(instruction, response, cached=context is not None)
     
-    print("=== Gemini 응답 ===")
-    print("원본 응답:")
-    print(response.text)
-    print(response)
+    usage = response.usage
+    print(f"✅ {backend.name} 응답 {len(response.text)}자 (입력 토큰 {usage['prompt_tokens']}, "
+          f"출력 토큰 {usage['candidate_tokens']}, 컨텍스트 캐시 토큰 {usage['cached_tokens']})")
+
+    if cache is not None:
+        cache.put(cache_key, backend.model_name, response.text)
     
     return response.text
 
-def transform2(folder_path):
+def generate_with_images_stream(
+    prompt, encoded_images, on_sentence, generation_config=None, cache=None, backend=None, boundary=None,
+    instruction=None, context_cache=None,
+):
+    """
+    프롬프트 + 이미지로 LLM 스트리밍 호출
+    응답 조각이 도착할 때마다 완성된 문장을 on_sentence 로 넘겨, 생성이 끝나기 전에
+    문장 검사 등 다음 처리를 시작할 수 있다.
+    
+    Args:
+        prompt (str): 프롬프트
+        encoded_images (list): Base64로 인코딩된 이미지 데이터 리스트
+        on_sentence (callable): on_sentence(sentence), 문장이 완성될 때마다 도착 순서대로 호출
+        generation_config (dict): 생성 설정
+        cache (LLMResponseCache): 응답 캐시 (적중 시 저장된 응답을 문장 단위로 바로 전달)
+        backend (LLMBackend): 사용할 백엔드 (None 이면 setup_llm_backend 로 설정한 백엔드)
+        boundary (re.Pattern): 문장 경계 (None 이면 llm_stream.SENTENCE_BOUNDARY)
+        instruction (str): 고정 지시문 (generate_with_images 참고)
+        context_cache (PromptContextCache): 프롬프트 컨텍스트 캐시
+        
+    Returns:
+        str: 전체 응답 텍스트
+    """
+    backend = backend or current_backend()
+    splitter = SentenceSplitter(boundary) if boundary else SentenceSplitter()
+
+    if cache is not None:
+        cache_key = make_cache_key(backend.model_name, full_prompt(prompt, instruction), encoded_images, generation_config)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ LLM 응답 캐시 적중 ({cache_key[:12]})")
+            for sentence in splitter.feed(cached) + splitter.flush():
+                on_sentence(sentence)
+            return cached
 
-    # 1단계: Gemini API 설정
-    setup_gemini_api()
+    request_prompt, context = resolve_context(prompt, backend, instruction, context_cache)
+    print(f"사용할 모델: {backend.model_name} (스트리밍" + (f", 컨텍스트 {context.name})" if context else ")"))
+
+    print("API 호출 중...")
+    started = time.perf_counter()
+    first_sentence_sec = None
+    sentence_count = 0
+    response = backend.stream(request_prompt, encoded_images, generation_config, context)
+    for text in response:
+        for sentence in splitter.feed(text):
+            if first_sentence_sec is None:
+                first_sentence_sec = time.perf_counter() - started
+            sentence_count += 1
+            on_sentence(sentence)
+    for sentence in splitter.flush():
+        if first_sentence_sec is None:
+            first_sentence_sec = time.perf_counter() - started
+        sentence_count += 1
+        on_sentence(sentence)
+
+    full_text = response.text
+    elapsed = time.perf_counter() - started
+    if instruction and context_cache is not None:
+        context_cache.record(instruction, response, cached=context is not None)
+    first = f"{first_sentence_sec:.2f}초" if first_sentence_sec is not None else "-"
+    print(f"✅ 스트리밍 완료: 문장 {sentence_count}개, 첫 문장 {first}, 전체 {elapsed:.2f}초")
+
+    if cache is not None:
+        cache.put(cache_key, backend.model_name, full_text)
+    return full_text
+
+def analyze_images_with_gemini(
+    encoded_images, image_count, cache=None, on_sentence=None, backend=None, context_cache=None
+):
+    """
+    LLM 백엔드(기본 Gemini)를 사용하여 이미지들을 분석
+    
+    Args:
+        encoded_images (list): Base64로 인코딩된 이미지 데이터 리스트
+        image_count (int): 이미지 개수
+        cache (LLMResponseCache): 응답 캐시, 같은 모델/프롬프트/이미지면 API 호출 없이 저장된 응답 반환
+        on_sentence (callable): on_sentence(index, sentence), 지정하면 스트리밍으로 받으며
+            문장이 완성될 때마다 호출 (index 는 도착 순서 = 이미지 순서)
+        backend (LLMBackend): 사용할 백엔드 (None 이면 setup_llm_backend 로 설정한 백엔드)
+        context_cache (PromptContextCache): 지정하면 고정 지시문을 컨텍스트로 등록해 두고
+            요청마다 이미지 수 부분만 전송 (미지원 시 지시문 직접 포함)
         
+    Returns:
+        str: Gemini API 응답 텍스트
+    """
+    # 프롬프트 생성
+    instruction = None
+    if context_cache is not None:
+        instruction = create_analysis_instruction()
+        prompt = create_analysis_request(image_count)
+    else:
+        prompt = create_analysis_prompt(image_count)
+    print(f"프롬프트에 전달된 이미지 개수: {image_count}")
+
+    if on_sentence is None:
+        return generate_with_images(
+            prompt, encoded_images, cache=cache, backend=backend, instruction=instruction, context_cache=context_cache
+        )
+
+    count = [0]
+    def on_stream_sentence(sentence):
+        on_sentence(count[0], sentence)
+        count[0] += 1
+
+    return generate_with_images_stream(
+        prompt, encoded_images, on_stream_sentence, cache=cache, backend=backend,
+        instruction=instruction, context_cache=context_cache,
+    )
+
+def analyze_images_combined(encoded_images, cache=None):
+    """
+    장면 요약과 이미지별 객체 목록을 한 번의 호출로 분석 (JSON 구조화 출력)
+    이미지를 한 번만 전송하므로 요약/객체를 따로 요청할 때보다 업로드와 요청 수가 절반
+    
+    Args:
+        encoded_images (list): Base64로 인코딩된 이미지 데이터 리스트
+        cache (LLMResponseCache): 응답 캐시
+        
+    Returns:
+        dict: {"summary": [이미지별 문장], "objects": [이미지별 객체명 리스트]}
+    """
+    image_count = len(encoded_images)
+    prompt = create_combined_analysis_prompt(image_count)
+    print(f"통합 분석 프롬프트에 전달된 이미지 개수: {image_count}")
+
+    text = generate_with_images(prompt, encoded_images, COMBINED_GENERATION_CONFIG, cache)
+    return parse_combined_response(text, image_count)
+
+def pack_encoded_images(encoded_images, columns=GRID_COLUMNS, rows=GRID_ROWS):
+    """Base64 이미지들을 격자 이미지로 합쳐 다시 Base64 로 인코딩"""
+    jpeg_images = [base64.b64decode(img) for img in encoded_images]
+    sheets = [encode_image_bytes(data) for data in pack_contact_sheets(jpeg_images, columns, rows)]
+    print(f"✅ 이미지 {len(encoded_images)}장 → 격자 이미지 {len(sheets)}장 ({columns}x{rows})")
+    return sheets
+
+def analyze_images_grid(encoded_images, cache=None, columns=GRID_COLUMNS, rows=GRID_ROWS, on_sentence=None):
+    """
+    이미지를 격자 이미지로 합쳐 장면 요약 요청 후 이미지별 문장 복원
+    
+    Args:
+        encoded_images (list): Base64로 인코딩된 이미지 데이터 리스트
+        cache (LLMResponseCache): 응답 캐시
+        columns (int): 격자 1장의 가로 칸 수
+        rows (int): 격자 1장의 세로 칸 수
+        on_sentence (callable): on_sentence(index, sentence), 지정하면 스트리밍으로 받으며
+            칸 한 줄이 완성될 때마다 칸 번호(0부터)와 문장으로 호출
+        
+    Returns:
+        list: 이미지 번호 순서의 문장 리스트 (응답에서 빠진 번호는 None)
+    """
+    image_count = len(encoded_images)
+    prompt = create_grid_analysis_prompt(image_count, columns, rows)
+    print(f"격자 프롬프트에 전달된 이미지 개수: {image_count}")
+
+    sheets = pack_encoded_images(encoded_images, columns, rows)
+    if on_sentence is None:
+        text = generate_with_images(prompt, sheets, cache=cache)
+    else:
+        def on_line(line):
+            parsed = parse_numbered_line(line, image_count)
+            if parsed:
+                on_sentence(*parsed)
+        text = generate_with_images_stream(prompt, sheets, on_line, cache=cache, boundary=LINE_BOUNDARY)
+    sentences = parse_numbered_sentences(text, image_count)
+    missing = [i + 1 for i, sentence in enumerate(sentences) if sentence is None]
+    if missing:
+        print(f"⚠️ 응답에 없는 칸 번호: {missing}")
+    return sentences
+
+def analyze_images_combined_grid(encoded_images, cache=None, columns=GRID_COLUMNS, rows=GRID_ROWS):
+    """
+    격자 이미지로 장면 요약 + 이미지별 객체 요청 (analyze_images_combined 참고)
+    JSON 배열의 i번째 항목이 i번 칸이므로 이미지별 결과는 그대로 복원된다
+    """
+    image_count = len(encoded_images)
+    prompt = grid_prompt_preface(image_count, columns, rows) + "\n\n" + create_combined_analysis_prompt(image_count)
+    print(f"격자 통합 분석 프롬프트에 전달된 이미지 개수: {image_count}")
+
+    sheets = pack_encoded_images(encoded_images, columns, rows)
+    text = generate_with_images(prompt, sheets, COMBINED_GENERATION_CONFIG, cache)
+    return parse_combined_response(text, image_count)
+
+def analyze_images(
+    encoded_images, mode="summary", cache=None, packing="separate", on_sentence=None, context_cache=None
+):
+    """
+    분석 방식(ANALYSIS_MODES)과 전송 방식(IMAGE_PACKING_MODES)에 따라 이미지 분석
+    on_sentence 를 지정하면 스트리밍으로 받으며 문장이 완성될 때마다 호출 (summary 만 지원)
+    context_cache 를 지정하면 고정 지시문을 컨텍스트 캐시로 재사용 (summary + separate 만 지원)
+    
+    Returns:
+        str | dict: summary 는 응답 텍스트 (grid 는 복원한 문장을 하나의 단락으로),
+            combined 는 parse_combined_response 결과
+    """
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"지원하지 않는 분석 방식입니다: {mode}")
+    if packing not in IMAGE_PACKING_MODES:
+        raise ValueError(f"지원하지 않는 이미지 전송 방식입니다: {packing}")
+    if on_sentence is not None and mode == "combined":
+        # JSON 응답은 끝까지 받아야 파싱할 수 있음
+        raise ValueError("스트리밍은 summary 분석에서만 지원합니다")
+    if context_cache is not None and (mode != "summary" or packing != "separate"):
+        raise ValueError("프롬프트 컨텍스트 캐시는 summary 분석 + separate 전송에서만 지원합니다")
+    if packing == "grid":
+        if mode == "combined":
+            return analyze_images_combined_grid(encoded_images, cache)
+        sentences = analyze_images_grid(encoded_images, cache, on_sentence=on_sentence)
+        return " ".join(s for s in sentences if s)
+    if mode == "combined":
+        return analyze_images_combined(encoded_images, cache)
+    return analyze_images_with_gemini(
+        encoded_images, len(encoded_images), cache, on_sentence, context_cache=context_cache
+    )
+
+def estimate_request_tokens(encoded_images, prompt):
+    """
+    요청 1건의 입력 토큰 수 추정 (프롬프트 + 이미지, TPM 제한용)
+    
+    Args:
+        encoded_images (list): Base64로 인코딩된 이미지 데이터 리스트
+        prompt (str): 프롬프트
+        
+    Returns:
+        int: 예상 입력 토큰 수
+    """
+    tokens = len(prompt) // PROMPT_CHARS_PER_TOKEN
+    for img in encoded_images:
+        # JPEG 헤더만 디코딩해서 크기 확인
+        size = jpeg_size(base64.b64decode(img[:4096]))
+        tokens += estimate_image_tokens(*size) if size else estimate_image_tokens(768, 768)
+    return tokens
+
+def estimate_grid_request_tokens(image_count, prompt, columns=GRID_COLUMNS, rows=GRID_ROWS):
+    """격자 이미지로 보낼 때의 입력 토큰 수 추정 (격자 이미지 수 × 최대 크기 격자 1장 토큰)"""
+    sheets = sheet_count(image_count, columns, rows)
+    return len(prompt) // PROMPT_CHARS_PER_TOKEN + sheets * estimate_image_tokens(*GRID_SHEET_SIZE)
+
+def load_folder_images(folder_path, token_budget=None):
+    """
+    폴더의 _V_ 이미지를 찾아 Base64로 인코딩 (transform2 의 2~3단계)
+    
+    Args:
+        folder_path (str): 이미지가 있는 폴더 경로
+        token_budget (int): 이미지 전체 토큰 예산 (추출 프로파일 선택용)
+        
+    Returns:
+        list: Base64로 인코딩된 이미지 데이터 리스트 (이미지 번호 순서)
+    """
     # 2단계: 이미지 파일 수집
     image_paths = get_images_from_folder(folder_path)
     print(f"✅ {len(image_paths)}개 이미지 파일 발견")
+
+    # 추출 프로파일이 있으면 토큰 예산 안에서 가장 큰 프로파일 이미지 사용
+    profile_name, profile_folder, estimated_tokens = choose_profile(folder_path, len(image_paths), token_budget)
+    if os.path.normpath(profile_folder) != os.path.normpath(folder_path):
+        profile_paths = get_images_from_folder(profile_folder)
+        if len(profile_paths) == len(image_paths):
+            image_paths = profile_paths
+            print(f"✅ 추출 프로파일 '{profile_name}' 사용 (예상 이미지 토큰: {estimated_tokens})")
+        else:
+            print(f"⚠️ 프로파일 '{profile_name}' 이미지 수가 달라 원본 이미지 사용")
         
     # 3단계: 이미지 Base64 인코딩
     encoded_images = [encode_image(path) for path in image_paths]
     print(f"✅ {len(encoded_images)}개 이미지 인코딩 완료")
+    return encoded_images
+
+def transform2(
+    folder_path, token_budget=None, cache=None, mode="summary", packing="separate", on_sentence=None,
+    context_cache=None, backend=None,
+):
+
+    # 1단계: LLM 백엔드 설정 (backend: "gemini", "fake" 또는 백엔드 객체, None 이면 LLM_BACKEND)
+    setup_llm_backend(backend)
         
-    # 4단계: Gemini API로 이미지 분석
-    gemini_response = analyze_images_with_gemini(encoded_images, len(image_paths))
+    # 2~3단계: 이미지 파일 수집 및 Base64 인코딩
+    encoded_images = load_folder_images(folder_path, token_budget)
+        
+    # 4단계: Gemini API로 이미지 분석 (combined 이면 요약 + 객체 dict, 호출 지표는 폴더별로 기록)
+    with call_label(CALL_LABEL.get() or folder_path):
+        gemini_response = analyze_images(encoded_images, mode, cache, packing, on_sentence, context_cache)
+    print("✅ Gemini API 분석 완료")
+
+    return gemini_response
+
+def print_context_cache_stats(context_cache):
+    """프롬프트 컨텍스트 캐시 사용 결과 출력 (절감 입력 토큰)"""
+    stats = context_cache.stats
+    print(f"프롬프트 컨텍스트: 참조 요청 {stats['cached_requests']}건, 직접 전송 {stats['inline_requests']}건, "
+          f"새로 등록 {stats['created']}건, 절감 입력 토큰 약 {stats['tokens_saved']}")
+
+def transform2_many(
+    folder_paths, concurrency=None, rpm=None, tpm=None, token_budget=None, call_fn=None, cache=None,
+    packing="separate", context_cache=None, backend=None,
+):
+    """
+    여러 폴더의 장면 요약을 동시에 요청 (llm_dispatcher.Dispatcher)
+    동시 요청 수와 분당 요청/토큰 한도를 지키며, 결과는 입력 폴더 순서로 반환
+    
+    Args:
+        folder_paths (list): _V_ 이미지가 있는 폴더 경로 리스트
+        concurrency (int): 동시 요청 수 (None 이면 LLM_CONCURRENCY)
+        rpm (int): 분당 요청 수 한도 (None 이면 LLM_RPM)
+        tpm (int): 분당 입력 토큰 수 한도 (None 이면 LLM_TPM)
+        token_budget (int): 폴더별 이미지 전체 토큰 예산 (추출 프로파일 선택용)
+        call_fn (callable): call_fn(encoded_images) -> 응답 텍스트 (None 이면 analyze_images_with_gemini)
+        cache (LLMResponseCache): 응답 캐시 (call_fn 이 None 일 때 사용)
+        packing (str): 이미지 전송 방식 ("separate", "grid", call_fn 이 None 일 때 사용)
+        context_cache (PromptContextCache): 고정 지시문 컨텍스트 캐시 (call_fn 이 None 일 때 사용)
+        backend (str | LLMBackend): LLM 백엔드 (call_fn 이 None 일 때 사용, setup_llm_backend 참고)
+        
+    Returns:
+        list: 폴더별 Gemini API 응답 텍스트 (실패한 폴더는 None)
+    """
+    active_backend = None
+    if call_fn is None:
+        active_backend = setup_llm_backend(backend)
+        call_fn = lambda encoded_images: analyze_images(
+            encoded_images, "summary", cache, packing, context_cache=context_cache
+        )
+
+    def prepare(folder_path):
+        # 요청 직전에 이미지 로드 (동시 요청 수만큼만 메모리에 올라감)
+        encoded_images = load_folder_images(folder_path, token_budget)
+        if packing == "grid":
+            prompt = create_grid_analysis_prompt(len(encoded_images))
+            return (folder_path, encoded_images), estimate_grid_request_tokens(len(encoded_images), prompt)
+        prompt = create_analysis_prompt(len(encoded_images))
+        return (folder_path, encoded_images), estimate_request_tokens(encoded_images, prompt)
+
+    def call(payload):
+        # 호출 지표를 폴더별로 기록
+        folder_path, encoded_images = payload
+        with call_label(folder_path):
+            return call_fn(encoded_images)
+
+    dispatcher = Dispatcher(call, prepare, concurrency, rpm, tpm)
+    print(f"장면 요약 요청: {len(folder_paths)}개 폴더, 동시 {dispatcher.concurrency}개, "
+          f"RPM {dispatcher.rpm}, TPM {dispatcher.tpm}")
+    results = dispatcher.run(folder_paths)
+    print_dispatch_summary(results, dispatcher.elapsed_sec, dispatcher.rate_wait_sec)
+    print_resilience_stats(active_backend)
+    if context_cache is not None:
+        print_context_cache_stats(context_cache)
+    return [r["response"] if r["ok"] else None for r in results]
+
+def transform2_from_memory(
+    jpeg_images, cache=None, mode="summary", packing="separate", on_sentence=None, context_cache=None,
+    backend=None,
+):
+    """
+    추출 단계에서 메모리로 넘겨받은 JPEG 바이트로 장면 요약
+    (폴더 검색/파일 재로드 없이 transform2 의 3~4단계만 수행)
+
+    Args:
+        jpeg_images (list): JPEG 바이트 리스트 (이미지 번호 순서)
+        cache (LLMResponseCache): 응답 캐시
+        mode (str): 분석 방식 ("summary", "combined")
+        packing (str): 이미지 전송 방식 ("separate", "grid")
+        on_sentence (callable): on_sentence(index, sentence), 지정하면 스트리밍 (analyze_images 참고)
+        context_cache (PromptContextCache): 고정 지시문 컨텍스트 캐시 (analyze_images 참고)
+        backend (str | LLMBackend): LLM 백엔드 (setup_llm_backend 참고)
+
+    Returns:
+        str | dict: Gemini API 응답 텍스트 (combined 이면 요약 + 객체 dict)
+    """
+    # 1단계: LLM 백엔드 설정
+    setup_llm_backend(backend)
+
+    # 2단계: 메모리의 이미지 Base64 인코딩
+    encoded_images = [encode_image_bytes(data) for data in jpeg_images]
+    print(f"✅ {len(encoded_images)}개 이미지 인코딩 완료 (메모리)")
+
+    # 3단계: Gemini API로 이미지 분석
+    gemini_response = analyze_images(encoded_images, mode, cache, packing, on_sentence, context_cache)
     print("✅ Gemini API 분석 완료")
 
     return gemini_response
@@ -0,0 +1,251 @@
+import os
+import math
+import time
+import sqlite3
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# 인덱스 저장 위치 (환경변수로 변경 가능)
+DEFAULT_INDEX_PATH = os.getenv(
+    "VIDEO_INDEX_PATH", str(Path.home() / ".cache" / "cw_modules" / "video_index.sqlite3")
+)
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".mkv", ".avi", ".ts")
+
+_COLUMNS = ("path", "name", "size", "mtime_ns", "width", "height", "fps", "frame_count", "duration", "codec", "probed_at")
+
+
+def probe_video(video_path):
+    """
+    비디오 컨테이너 메타데이터 읽기 (프레임 디코딩 없음)
+
+    Args:
+        video_path (str): 비디오 파일 경로
+
+    Returns:
+        dict: path, name, size, mtime_ns, width, height, fps, frame_count, duration, codec, probed_at
+    """
+    # 인덱스 조회만 하는 후처리 쪽에서는 OpenCV 가 없어도 되도록 여기서 import
+    import cv2
+
+    video_path = os.path.abspath(video_path)
+    stat = os.stat(video_path)
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"❌ 영상 열기 실패: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    cap.release()
+
+    return {
+        "path": video_path,
+        "name": os.path.basename(video_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "width": width,
+        "height": height,
+        "fps": fps,
+        "frame_count": frame_count,
+        "duration": frame_count / fps if fps else 0.0,
+        "codec": "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00"),
+        "probed_at": time.time(),
+    }
+
+
+def format_time(seconds):
+    """초를 mm:ss 형식으로 변환"""
+    seconds = int(round(seconds))
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def template_fields(info):
+    """
+    프로브 결과를 데이터 포맷 템플릿 필드 형식으로 변환
+
+    Returns:
+        dict: width(int), height(int), fps(str), length("00:00 ~ 01:05"), ratio(float)
+    """
+    fps = round(info["fps"], 2)
+    return {
+        "width": info["width"],
+        "height": info["height"],
+        "fps": str(int(fps)) if fps == int(fps) else str(fps),
+        "length": f"00:00 ~ {format_time(info['duration'])}",
+        "ratio": round(info["width"] / info["height"], 2) if info["height"] else None,
+    }
+
+
+class VideoProbeIndex:
+    """
+    비디오 메타데이터 인덱스 (SQLite)
+
+    경로별로 저장하고, 파일 크기/수정시각이 바뀌면 다시 프로브한다.
+    여러 프로세스가 동시에 사용해도 되도록 WAL 모드로 연다.
+    """
+
+    def __init__(self, index_path=DEFAULT_INDEX_PATH):
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.index_path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS videos (
+                path TEXT PRIMARY KEY,
+                name TEXT,
+                size INTEGER,
+                mtime_ns INTEGER,
+                width INTEGER,
+                height INTEGER,
+                fps REAL,
+                frame_count INTEGER,
+                duration REAL,
+                codec TEXT,
+                probed_at REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_name ON videos(name)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def put(self, info):
+        """프로브 결과 저장"""
+        self.put_many([info])
+
+    def put_many(self, infos):
+        """프로브 결과 여러 개를 한 트랜잭션으로 저장"""
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO videos ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                [tuple(info[c] for c in _COLUMNS) for info in infos],
+            )
+
+    def get(self, video_path):
+        """
+        경로로 조회 (파일이 바뀌었으면 None)
+
+        Returns:
+            dict | None: 프로브 결과
+        """
+        video_path = os.path.abspath(video_path)
+        row = self.conn.execute("SELECT * FROM videos WHERE path = ?", (video_path,)).fetchone()
+        if row is None:
+            return None
+        stat = os.stat(video_path)
+        if row["size"] != stat.st_size or row["mtime_ns"] != stat.st_mtime_ns:
+            return None
+        return dict(row)
+
+    def get_or_probe(self, video_path):
+        """인덱스에 있으면 조회, 없으면 프로브 후 저장"""
+        info = self.get(video_path)
+        if info is None:
+            info = probe_video(video_path)
+            self.put(info)
+        return info
+
+    def lookup_by_name(self, file_name):
+        """
+        파일명으로 조회 (후처리 데이터에는 경로 없이 파일명만 있는 경우가 많음)
+        같은 이름이 여러 개면 가장 최근에 프로브한 항목
+
+        Returns:
+            dict | None: 프로브 결과
+        """
+        name = os.path.basename(file_name.replace("\\", "/"))
+        row = self.conn.execute(
+            "SELECT * FROM videos WHERE name = ? ORDER BY probed_at DESC LIMIT 1", (name,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+
+def _probe_safely(video_path):
+    """병렬 프로브용 (실패해도 예외를 넘기지 않음)"""
+    try:
+        return probe_video(video_path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def bulk_probe(root, index_path=DEFAULT_INDEX_PATH, workers=None, extensions=VIDEO_EXTENSIONS):
+    """
+    폴더 전체의 비디오를 병렬로 프로브하여 인덱스에 저장
+    이미 최신 상태로 인덱스에 있는 파일은 건너뜀
+
+    Args:
+        root (str): 검색할 최상위 폴더
+        index_path (str): 인덱스 파일 경로
+        workers (int): 프로세스 수 (None 이면 CPU 코어 수)
+        extensions (tuple): 비디오 확장자
+
+    Returns:
+        dict: scanned, probed, skipped, failed 개수
+    """
+    index = VideoProbeIndex(index_path)
+    video_paths = [
+        str(p) for p in sorted(Path(root).rglob("*")) if p.is_file() and p.suffix.lower() in extensions
+    ]
+    pending = [p for p in video_paths if index.get(p) is None]
+    print(f"비디오 {len(video_paths)}개 발견, 프로브 대상 {len(pending)}개")
+
+    probed = []
+    failed = 0
+    if pending:
+        # 프로브는 워커 프로세스에서, 인덱스 기록은 현재 프로세스에서만
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, math.ceil(len(pending) / ((workers or os.cpu_count() or 1) * 4)))
+            for path, (info, error) in zip(pending, executor.map(_probe_safely, pending, chunksize=chunksize)):
+                if info is None:
+                    failed += 1
+                    print(f"❌ 프로브 실패: {path} ({error})")
+                else:
+                    probed.append(info)
+        index.put_many(probed)
+
+    index.close()
+    result = {
+        "scanned": len(video_paths),
+        "probed": len(probed),
+        "skipped": len(video_paths) - len(pending),
+        "failed": failed,
+    }
+    print(f"✅ 프로브 완료: {result}")
+    return result
+
+
+if __name__ == "__main__":
+    # ▶ 예시 실행: python video_probe.py scan C:\guide\videos -w 8
+    #             python video_probe.py show I_Live_Alone_20250530_6.mp4
+    import argparse
+
+    parser = argparse.ArgumentParser(description="비디오 메타데이터 인덱스")
+    parser.add_argument("command", choices=["scan", "show"], help="scan: 폴더 일괄 프로브, show: 파일명 조회")
+    parser.add_argument("target", help="scan: 폴더 경로, show: 비디오 파일명")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="인덱스 파일 경로")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="프로세스 수")
+    args = parser.parse_args()
+
+    if args.command == "scan":
+        bulk_probe(args.target, args.index, args.workers)
+    else:
+        index = VideoProbeIndex(args.index)
+        info = index.lookup_by_name(args.target)
+        index.close()
+        if info is None:
+            print(f"❌ 인덱스에 없음: {args.target}")
+        else:
+            for key, value in info.items():
+                print(f"{key}: {value}")
+            print(f"템플릿 필드: {template_fields(info)}")